@@ -58,7 +58,10 @@ COLOURS_DARK = [m.BLUE_E, m.TEAL_E, m.GREEN_E, m.YELLOW_E, m.GOLD_E,
     PARSING_ERROR,
     SOUND_ERROR,
     AMBIGUOUS_ERROR,
-) = range(17)
+    WORKSPACE_NAME_ERROR,
+    HEALTH_ERROR,
+    BUDGET_ERROR,
+) = range(20)
 
 ERRORS = {
     DIR_ERROR: "config directory error",
@@ -72,5 +75,8 @@ ERRORS = {
     REGEX_WRITE_ERROR: "error writing regex file to dir",
     CFG_WRITE_ERROR: "error writing cfg file to dir",
     INPUT_TOO_LONG: "input too long",
-    SOUND_ERROR: "couldn't find sound or 'asset/sounds' folder"
+    SOUND_ERROR: "couldn't find sound or 'asset/sounds' folder",
+    WORKSPACE_NAME_ERROR: "no grammar of this name in the workspace",
+    HEALTH_ERROR: "cfg has undefined non-terminals or cycles",
+    BUDGET_ERROR: "render is predicted to take longer than the budget"
 }
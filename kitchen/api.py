@@ -0,0 +1,248 @@
+""" Analyses CFGs and parses inputs in-process, without the CLI.
+
+Kitchen can be used as a library. The calls of this module never read
+`config.ini`, and never print: every result is returned as an object.
+
+    from kitchen import api
+
+    grammar = api.load_grammar("S -> a S | b")
+    analysis = api.analyse(grammar)
+    if analysis.is_ll1:
+        result = api.parse(grammar, "a a b")
+
+A grammar is loaded from a Path to a CFG file, or from the contents of
+one. Parsing uses an immutable snapshot of the analysis which is built
+once per grammar, so many threads may parse with one grammar at a time.
+"""
+# kitchen/api.py
+
+from pathlib import Path
+
+from kitchen import (
+    ERROR,
+    HEALTH_ERROR,
+    SUCCESS
+)
+
+from kitchen.helpers import lang_spec
+
+from kitchen.backend import (
+    context_free_grammar as cofg,
+    snapshot as snap
+)
+
+class GrammarError(ValueError):
+    """Raised when a CFG or language specification cannot be loaded, or a
+       CFG cannot be parsed with.
+    """
+
+class TokenError(ValueError):
+    """Raised when a word of an input matches no token."""
+
+class Grammar:
+    def __init__(self, cfg, spec = None) -> None:
+        """Holds a loaded CFG and its optional language specification.
+
+        Args:
+            cfg (ContextFreeGrammar): Loaded CFG.
+            spec (Specification, optional): Language specification.
+            Defaults to None, in which case each word is a token.
+        """
+        self.cfg = cfg
+        self.spec = spec
+        self._snapshot = None
+
+    @property
+    def start_symbol(self) -> str:
+        """Obtains the start symbol of the CFG.
+
+        Returns:
+            str: Start symbol of the CFG.
+        """
+        return self.cfg.start_symbol
+
+    @property
+    def nonterminals(self) -> list:
+        """Obtains the non-terminals of the CFG.
+
+        Returns:
+            list: Non-terminals of the CFG.
+        """
+        return list(self.cfg.nonterminals)
+
+    @property
+    def terminals(self) -> list:
+        """Obtains the terminals of the CFG, starting with $.
+
+        Returns:
+            list: Terminals of the CFG, starting with $.
+        """
+        return list(self.cfg.terminals)
+
+    def snapshot(self) -> snap.GrammarSnapshot:
+        """Obtains the immutable snapshot which parses are run with,
+           freezing the CFG on first use.
+
+        Raises:
+            GrammarError: If the CFG is unhealthy or not LL(1).
+
+        Returns:
+            GrammarSnapshot: Snapshot of the analysed CFG.
+        """
+        if self._snapshot is None:
+            try:
+                self._snapshot = snap.GrammarSnapshot(self.cfg)
+            except ValueError as e:
+                raise GrammarError(str(e)) from e
+        return self._snapshot
+
+class Analysis:
+    def __init__(self, code, first_set = None, follow_set = None,
+        table = None, conflicts = None, errors = None,
+        warnings = None) -> None:
+        """Holds the analysis of a CFG.
+
+        Args:
+            code (int): SUCCESS, ERROR if the parse table has conflicts, or
+            HEALTH_ERROR if the CFG could not be analysed.
+            first_set (dict, optional): First set of each non-terminal.
+            follow_set (dict, optional): Follow set of each non-terminal.
+            table (dict, optional): Parse table, as {NT: {terminal: entry}}.
+            conflicts (list, optional): (non-terminal, terminal,
+            productions) triples of conflicting cells.
+            errors (list, optional): Problems which stop the analysis.
+            warnings (list, optional): Problems which rule out LL(1)
+            parsing, or leave productions unused.
+        """
+        self.code = code
+        self.first_set = {} if first_set is None else first_set
+        self.follow_set = {} if follow_set is None else follow_set
+        self.table = {} if table is None else table
+        self.conflicts = [] if conflicts is None else conflicts
+        self.errors = [] if errors is None else errors
+        self.warnings = [] if warnings is None else warnings
+
+    @property
+    def is_ll1(self) -> bool:
+        """Checks whether the CFG has a parse table without conflicts.
+
+        Returns:
+            bool: True if it is LL(1).
+        """
+        return self.code == SUCCESS
+
+def _read(source) -> str:
+    """Obtains the contents of a source, which is a Path to a file or the
+       contents themselves.
+
+    Args:
+        source (Path | str): Path to a file, or its contents.
+
+    Raises:
+        GrammarError: If the file cannot be read.
+
+    Returns:
+        str: Contents.
+    """
+    if not isinstance(source, Path):
+        return source
+    try:
+        return source.read_text()
+    except OSError as e:
+        raise GrammarError("Could not read " + str(source) + ".") from e
+
+def load_grammar(source, spec = None, prune = False) -> Grammar:
+    """Loads a CFG, and optionally its language specification.
+
+    Args:
+        source (Path | str): Path to a CFG file, or the contents of one.
+        spec (Path | str, optional): Path to a language specification, or
+        its contents. Defaults to None.
+        prune (bool, optional): Removes unproductive and unreachable
+        non-terminals. Defaults to False.
+
+    Raises:
+        GrammarError: If a file cannot be read, a line of the CFG is not a
+        production, or the specification does not define each terminal.
+
+    Returns:
+        Grammar: Loaded grammar.
+    """
+    contents = _read(source)
+    errors = cofg.find_format_errors(contents)
+    if errors != []:
+        raise GrammarError("\n".join(errors))
+    cfg = cofg.ContextFreeGrammar.from_contents(contents, prune)
+
+    if spec is None:
+        return Grammar(cfg)
+    try:
+        spec = lang_spec.Specification.from_contents(_read(spec), cfg,
+            spec if isinstance(spec, Path) else None)
+    except ValueError as e:
+        raise GrammarError(str(e)) from e
+    return Grammar(cfg, spec)
+
+def analyse(grammar) -> Analysis:
+    """Calculates the first and follow sets and the parse table of a CFG
+       with the worklist engine, so left-recursive and deep CFGs are
+       analysed too.
+
+    Args:
+        grammar (Grammar): Loaded grammar.
+
+    Returns:
+        Analysis: Analysis of the CFG.
+    """
+    cfg = grammar.cfg
+    health = cfg.get_health()
+    if not health.is_healthy():
+        return Analysis(HEALTH_ERROR, errors=health.errors(),
+            warnings=health.warnings())
+
+    cfg.calculate_follow_set_worklist()
+    cfg.materialise_sets()
+    conflicts = cfg.find_ll1_conflicts()
+    return Analysis(SUCCESS if conflicts == [] else ERROR,
+        {nt: list(items) for nt, items in cfg.first_set.items()},
+        {nt: list(items) for nt, items in cfg.follow_set.items() if nt in
+            cfg.nonterminals},
+        cfg.parsetable.get_dense().to_dict(), conflicts,
+        warnings=health.warnings())
+
+def tokenize(grammar, inp) -> list:
+    """Obtains the token stream of an input.
+
+    Args:
+        grammar (Grammar): Loaded grammar.
+        inp (str): Input string.
+
+    Raises:
+        TokenError: If a word matches no token of the specification.
+
+    Returns:
+        list: Tokens, whose type is the word itself without a
+        specification.
+    """
+    tokens = []
+    for word in filter(None, inp.strip().split(" ")):
+        matched = word if grammar.spec is None else grammar.spec._match(word)
+        if matched == ERROR:
+            raise TokenError("[" + word + "] matches no token.")
+        tokens.append(lang_spec.Token(matched, word))
+    return tokens
+
+def parse(grammar, inp) -> snap.ParseResult:
+    """Parses an input with the LL(1) parse table of a CFG.
+
+    Args:
+        grammar (Grammar): Loaded grammar.
+        inp (str): Input string.
+
+    Raises:
+        GrammarError: If the CFG is unhealthy or not LL(1).
+
+    Returns:
+        ParseResult: Status code, parse tree, tokens, and why parsing failed.
+    """
+    return grammar.snapshot().parse(inp, grammar.spec)
@@ -1,6 +1,8 @@
 """ Creates the Kitchen CLI"""
 # kitchen/cli.py
 
+from pathlib import Path
+import sys
 import typer
 from typing import Optional
 
@@ -9,12 +11,22 @@ from kitchen import (
      __version__, 
      SUCCESS, 
      ERROR,
-     ERRORS
+     ERRORS,
+     AMBIGUOUS_ERROR
 )
 
 from kitchen.backend import (
   context_free_grammar as cfg, 
-  cli_helper
+  cli_helper,
+  cache,
+  cost,
+  memo,
+  benchmark as bm,
+  workspace as wsp,
+  batch,
+  bundle,
+  normalise as nm,
+  sentence_generator as sg
   )
 
 from kitchen.helpers import (
@@ -30,6 +42,12 @@ from dslmodule.dsltool import (
 )
 
 app = typer.Typer()
+workspace_app = typer.Typer()
+app.add_typer(workspace_app, name="workspace", 
+    help="Manages the named grammars of the workspace.")
+
+# grammar of the workspace selected with --grammar, if any
+_grammar_name = None
 
 def _version_callback(value: bool) -> None:
     """Callback to display the version of the application
@@ -44,9 +62,13 @@ def _version_callback(value: bool) -> None:
         display.general_secho(f"{__app_name__} v{__version__}")
         raise typer.Exit()
 
-def get_cfg() -> cfg.ContextFreeGrammar:
+def get_cfg(prune = False) -> cfg.ContextFreeGrammar:
     """Helper function to obtain the created cfg from the config path
 
+    Args:
+        prune (bool, optional): Removes useless non-terminals. Defaults to 
+        False.
+
     Raises:
         typer.Exit: Closes the app session if the configuration file is 
         not found.
@@ -56,7 +78,14 @@ def get_cfg() -> cfg.ContextFreeGrammar:
         cfg.ContextFreeGrammar: ContextFreeGrammar object associated with 
         the given CFG.
     """    
-    if config.CONFIG_FILE_PATH.exists():
+    if _grammar_name != None:
+        entries = config.read_workspace()
+        if _grammar_name not in entries:
+            display.fail_secho('No grammar named "' + _grammar_name + 
+                '" in the workspace.')
+            raise typer.Exit(1)
+        cfg_path = entries[_grammar_name][0]
+    elif config.CONFIG_FILE_PATH.exists():
         cfg_path = cfg.get_cfg_path(config.CONFIG_FILE_PATH)
     else:
         display.fail_secho(
@@ -65,7 +94,7 @@ def get_cfg() -> cfg.ContextFreeGrammar:
         raise typer.Exit(1)
 
     if cfg_path.exists():
-        return cfg.ContextFreeGrammar(cfg_path)
+        return cache.load_cfg(cfg_path, prune)
     else:
         display.fail_secho('CFG not found. Please run "kitchen init" first')
         raise typer.Exit(1)
@@ -86,6 +115,43 @@ def _check_cfg(cfg) -> None:
     except:
         pass
 
+    # undefined non-terminals and cycles are found before any analysis
+    if cfg.prods != ERROR and not cfg.get_health().is_healthy():
+        for message in cfg.get_health().errors():
+            display.fail_secho(message)
+        raise typer.Exit(1)
+
+def _report_pruned(cfg) -> None:
+    """Helper function to report the non-terminals removed by pruning.
+
+    Args:
+        cfg (ContextFreeGrammar): Pruned CFG.
+    """
+    if cfg.unproductive != []:
+        display.info_secho("Removed unproductive non-terminals: " + 
+            ", ".join(cfg.unproductive))
+    if cfg.unreachable != []:
+        display.info_secho("Removed unreachable non-terminals: " + 
+            ", ".join(cfg.unreachable))
+
+def _load_bundle(bundle_path) -> tuple:
+    """Helper function to load a compiled bundle.
+
+    Args:
+        bundle_path (str): Path to the bundle.
+
+    Raises:
+        typer.Exit: Closes the app session if the bundle cannot be loaded.
+
+    Returns:
+        tuple: ContextFreeGrammar and Specification (or None).
+    """
+    try:
+        return bundle.load_bundle(bundle_path)
+    except (OSError, ValueError, KeyError) as e:
+        display.fail_secho("Could not load bundle: " + str(e))
+        raise typer.Exit(1)
+
 @app.command()
 def init(
      cfg_path: str = typer.Option(
@@ -123,7 +189,19 @@ def init_tests(
         return ERROR
 
 @app.command(name="run")
-def run() -> None:
+def run(
+    workspace: bool = typer.Option(
+            False,
+            "--workspace",
+            "-w",
+            help="Loads every grammar of the workspace.",
+            ),
+    bundle_path: Optional[str] = typer.Option(
+            None,
+            "--bundle",
+            "-b",
+            help="Loads a bundle written by kitchen compile.",
+            )) -> None:
     """Application driver.
     """    
     # set configuration options and initialise narration directory
@@ -132,8 +210,27 @@ def run() -> None:
     config.init_tree_png_dir()
     config.init_config()
 
-    cfg = get_cfg()
-    spec = lang_spec.get_spec(cfg)
+    ws = None
+    if workspace:
+        ws = wsp.Workspace()
+        if ws.names() == []:
+            display.fail_secho('The workspace is empty. Please run ' + 
+                '"kitchen workspace add" first.')
+            raise typer.Exit(1)
+        name = _grammar_name if _grammar_name != None else ws.names()[0]
+        if ws.select(name) != SUCCESS:
+            display.fail_secho('No grammar named "' + name + 
+                '" in the workspace.')
+            raise typer.Exit(1)
+        cfg, spec = ws.get()
+        display.info_secho('Using grammar "' + name + '". Type \\use ' + 
+            '<name> to switch grammars.')
+    elif bundle_path != None:
+        cfg, spec = _load_bundle(bundle_path)
+    else:
+        cfg = get_cfg()
+        spec = lang_spec.get_spec(cfg)
+    _check_cfg(cfg)
 
     if spec == None:
         display.info_secho("Note:\tNo language specification has been " +
@@ -145,7 +242,9 @@ def run() -> None:
     display.print_welcome()
     while (True):
         input = typer.prompt("Input")
-        cli_helper.handle_input(input, cfg, spec)
+        cli_helper.handle_input(input, cfg, spec, ws)
+        if ws != None:
+            cfg, spec = ws.get()
 
 @app.command(name="dsl-tool")
 def init_dsl() -> None:
@@ -168,39 +267,205 @@ def show_cfg() -> None:
 
 """ Helper functions for testing """
 @app.command(name = "test-fs")
-def find_fs() -> None:
+def find_fs(
+    worklist: bool = typer.Option(
+            False,
+            "--worklist",
+            "-w",
+            help="Uses the iterative worklist engine.",
+            ),
+    matrix: bool = typer.Option(
+            False,
+            "--matrix",
+            "-m",
+            help="Uses the boolean matrix engine.",
+            )) -> None:
     """Tests the First Set.
     """    
     cfg = get_cfg()
     _check_cfg(cfg)
-    cfg.show_first_set_testing()
+    if matrix:
+        cfg.show_sets_matrix_testing()
+    elif worklist:
+        cfg.show_first_set_worklist_testing()
+    else:
+        # tests the recursive walker, rather than the cached worklist sets
+        cfg.reset_first_set()
+        cfg.show_first_set_testing()
+
+@app.command(name = "compare-fs")
+def compare_fs() -> None:
+    """Compares the recursive and worklist First Set engines.
+    """    
+    cfg = get_cfg()
+    _check_cfg(cfg)
+    differences = cfg.compare_first_set_engines()
+    if differences == {}:
+        display.success_secho("First sets match.")
+    else:
+        for key, (walker, worklist) in differences.items():
+            display.fail_secho("First(" + key + ") differs:\n\twalker:   " + 
+            str(walker) + "\n\tworklist: " + str(worklist))
 
 @app.command(name = "test-fw")
-def find_fw() -> None:
+def find_fw(
+    worklist: bool = typer.Option(
+            False,
+            "--worklist",
+            "-w",
+            help="Uses the bitset follow set engine.",
+            ),
+    matrix: bool = typer.Option(
+            False,
+            "--matrix",
+            "-m",
+            help="Uses the boolean matrix engine.",
+            )) -> None:
     """Tests the Follow Set.
     """    
     cfg = get_cfg()
     _check_cfg(cfg)
-    cfg.reset_first_set()
-    cfg.show_follow_set_testing()
+    if matrix:
+        cfg.show_sets_matrix_testing(follow=True)
+    elif worklist:
+        cfg.show_follow_set_worklist_testing()
+    else:
+        # tests the recursive walker, rather than the cached worklist sets
+        cfg.reset_first_set()
+        cfg.reset_follow_set()
+        cfg.show_follow_set_testing()
 
 @app.command(name = "test-pt")
-def find_pt() -> None:
+def find_pt(
+    prune: bool = typer.Option(
+            False,
+            "--prune",
+            "-p",
+            help="Removes useless non-terminals first.",
+            ),
+    dense: bool = typer.Option(
+            False,
+            "--dense",
+            "-d",
+            help="Prints the table from its dense array of production ids.",
+            ),
+    compress: bool = typer.Option(
+            False,
+            "--compress",
+            "-c",
+            help="Packs the dense table with row displacement.",
+            )) -> None:
     """Tests the Parsing Table.
     """    
-    cfg = get_cfg()
+    cfg = get_cfg(prune)
     _check_cfg(cfg)
-    cfg.reset_first_set()
-    cfg.reset_follow_set()
-    if not cfg.is_ambiguous:
-        # initialise parsetable
-        code = cfg.setup_parsetable()
-        # calculate parsetable
-        code = cfg.calculate_parsetable()
+    _report_pruned(cfg)
+    code = memo.analyse(cfg)
+    if code != AMBIGUOUS_ERROR:
         if code != ERROR:
-            cfg.parsetable.print_parse_table_testing()
+            if dense or compress:
+                cfg.parsetable.print_dense_table_testing(compress)
+            else:
+                cfg.parsetable.print_parse_table_testing()
     else:
         error.ERR_ambiguous_grammar(testing = True)
+        cfg.parsetable.report_conflicts()
+    cache.save_cfg(cfg)
+
+@app.command(name = "prune")
+def find_useless() -> None:
+    """Reports the unproductive and unreachable non-terminals of the CFG.
+    """    
+    cfg = get_cfg(prune = True)
+    _check_cfg(cfg)
+    if cfg.unproductive == [] and cfg.unreachable == []:
+        display.success_secho("No useless non-terminals found.")
+    else:
+        _report_pruned(cfg)
+
+@app.command(name = "health")
+def find_health() -> None:
+    """Reports undefined non-terminals, cycles, left recursion and useless
+       non-terminals of the CFG.
+    """    
+    cfg = get_cfg()
+    health = cfg.get_health()
+    for message in health.errors():
+        display.fail_secho(message)
+    for message in health.warnings():
+        display.info_secho(message)
+    if health.errors() == [] and health.warnings() == []:
+        display.success_secho("No problems found.")
+    if not health.is_healthy():
+        raise typer.Exit(1)
+
+@app.command(name = "normalise")
+def normalise_cfg(
+    output: Optional[str] = typer.Option(
+            None,
+            "--output",
+            "-o",
+            help="Path to the normalised CFG. Defaults to the CFG path " +
+                "with the " + nm.NORMALISED_SUFFIX + " suffix.",
+            ),
+    inp: Optional[str] = typer.Option(
+            None,
+            "--input",
+            "-i",
+            help="Input to be parsed with the normalised CFG.",
+            )) -> None:
+    """Eliminates left recursion and left factors the CFG, so that it may
+       be parsed with an LL(1) table.
+    """    
+    cfg = get_cfg()
+    _check_cfg(cfg)
+    try:
+        normalised = cfg.normalise(output)
+    except ValueError as e:
+        display.fail_secho("Could not normalise the CFG: " + str(e))
+        raise typer.Exit(1)
+    except OSError:
+        display.fail_secho("Could not write the normalised CFG.")
+        raise typer.Exit(1)
+
+    for rewrite in normalised.rewrites:
+        display.info_secho(rewrite)
+    conflicts = normalised.find_ll1_conflicts()
+    if conflicts == []:
+        display.success_secho("The normalised CFG is LL(1).")
+    else:
+        display.fail_secho("The normalised CFG still has " + 
+            str(len(conflicts)) + " LL(1) conflict(s).")
+    display.info_secho("Normalised CFG written to " + 
+        str(normalised._cfg_path))
+
+    if inp != None:
+        code = cli_helper._init_parsing_normalised(inp, normalised, None, 
+            testing=True)
+        if code != SUCCESS:
+            raise typer.Exit(1)
+
+@app.command(name = "conflicts")
+def find_conflicts(
+    prune: bool = typer.Option(
+            False,
+            "--prune",
+            "-p",
+            help="Removes useless non-terminals first.",
+            )) -> None:
+    """Reports every LL(1) conflict in the Parsing Table.
+    """    
+    cfg = get_cfg(prune)
+    _check_cfg(cfg)
+    _report_pruned(cfg)
+    conflicts = cfg.find_ll1_conflicts()
+    if conflicts == []:
+        display.success_secho("No LL(1) conflicts found.")
+    else:
+        display.fail_secho(str(len(conflicts)) + " LL(1) conflict(s) found:")
+        for nt, t, prods in conflicts:
+            display.general_secho("[" + nt + ", " + t + "]: " + 
+                " | ".join(prods))
 
 @app.command(name = "test-ll1")
 def find_ll1(  
@@ -209,6 +474,12 @@ def find_ll1(
             "--input",
             "-i",
             prompt="Please an input to be parsed",
+            ),
+    bundle_path: Optional[str] = typer.Option(
+            None,
+            "--bundle",
+            "-b",
+            help="Loads a bundle written by kitchen compile.",
             )) -> None:
     """Tests LL(1) Parsing
 
@@ -219,13 +490,13 @@ def find_ll1(
     Returns:
         int: Status Code
     """            
-    cfg = get_cfg()
-    _check_cfg(cfg)
-    cfg.reset_first_set()
-    cfg.reset_follow_set()
-
-    if not cfg.parsetable_calculated:
+    if bundle_path != None:
+        cfg, _ = _load_bundle(bundle_path)
+    else:
+        cfg = get_cfg()
+        _check_cfg(cfg)
         cli_helper._set_parsetable(cfg)
+        cache.save_cfg(cfg)
 
     # sets up the cfg parser with no spec (testing token streams)
     code = cli_helper._set_cfg_parser_ll1(inp, cfg, None)
@@ -237,6 +508,332 @@ def find_ll1(
         typer.echo("Problem setting up parser.")
     return SUCCESS
 
+@app.command(name = "test-lalr")
+def find_lalr(  
+    inp: str = typer.Option(
+            ...,
+            "--input",
+            "-i",
+            prompt="Please an input to be parsed",
+            )) -> None:
+    """Tests LALR(1) Parsing
+    """            
+    cfg = get_cfg()
+    _check_cfg(cfg)
+    code = cli_helper._init_parsing_lalr(inp, cfg, None, testing=True)
+    if code == SUCCESS:
+        cache.save_cfg(cfg)
+    return code
+
+@app.command(name = "benchmark")
+def run_benchmark(
+    sizes: str = typer.Option(
+            "10,20,40,80",
+            "--sizes",
+            "-s",
+            help="Comma-separated numbers of non-terminals.",
+            ),
+    terminals: int = typer.Option(
+            0,
+            "--terminals",
+            "-t",
+            help="Number of terminals. 0 uses one per non-terminal.",
+            ),
+    width: int = typer.Option(
+            4,
+            "--width",
+            help="Maximum length of a production.",
+            ),
+    nullable: float = typer.Option(
+            0.25,
+            "--nullable",
+            help="Chance of a non-terminal deriving epsilon.",
+            ),
+    recursion: int = typer.Option(
+            2,
+            "--recursion",
+            help="How far back a production may refer to a non-terminal.",
+            ),
+    length: int = typer.Option(
+            200,
+            "--length",
+            help="Length of the parsed sentence.",
+            ),
+    repeat: int = typer.Option(
+            3,
+            "--repeat",
+            "-r",
+            help="Runs per size, of which the fastest is kept.",
+            ),
+    seed: int = typer.Option(
+            0,
+            "--seed",
+            help="Seed of the grammar generator.",
+            )) -> None:
+    """Times the analysis of random LL(1) grammars of increasing size.
+    """    
+    try:
+        ns = [int(n) for n in sizes.split(",") if n.strip() != ""]
+    except ValueError:
+        display.fail_secho("Sizes must be comma-separated integers.")
+        raise typer.Exit(1)
+    rows = bm.run_benchmark(ns, terminals, width, nullable, recursion, 
+        length, repeat, seed)
+    display.print_benchmark(rows, bm.scaling(rows))
+
+@app.command(name = "analyze-dir")
+def analyse_dir(
+    directory: str = typer.Argument(..., help="Directory of CFG files."),
+    output: str = typer.Option(
+            "results.json",
+            "--output",
+            "-o",
+            help="Path to the JSON results file.",
+            ),
+    jobs: int = typer.Option(
+            0,
+            "--jobs",
+            "-j",
+            help="Number of worker processes. 0 uses one per CPU.",
+            ),
+    pattern: str = typer.Option(
+            "*.txt",
+            "--pattern",
+            help="Glob pattern of the CFG files.",
+            )) -> None:
+    """Analyses every CFG file of a directory in parallel.
+    """    
+    if not Path(directory).is_dir():
+        display.fail_secho("Directory not found: " + directory)
+        raise typer.Exit(1)
+    results = batch.analyse_dir(directory, pattern, jobs or None)
+    try:
+        batch.write_results(results, output)
+    except OSError:
+        display.fail_secho("Could not write results to " + output)
+        raise typer.Exit(1)
+
+    ll1 = sum(1 for r in results if r["status"] == "ok" and r["ll1"])
+    failed = sum(1 for r in results if r["status"] == "error")
+    display.success_secho("Analysed " + str(len(results)) + " CFG(s): " + 
+        str(ll1) + " LL(1), " + str(len(results) - ll1 - failed) + 
+        " with conflicts, " + str(failed) + " failed.")
+    display.info_secho("Results written to " + output)
+
+@app.command(name = "compile")
+def compile_cfg(
+    cfg_path: str = typer.Argument(..., help="Path to the CFG file."),
+    spec_path: Optional[str] = typer.Argument(None, 
+        help="Path to the language specification file."),
+    output: Optional[str] = typer.Option(
+            None,
+            "--output",
+            "-o",
+            help="Path to the bundle. Defaults to the CFG path with the " +
+                bundle.BUNDLE_SUFFIX + " suffix.",
+            ),
+    compress: bool = typer.Option(
+            False,
+            "--compress",
+            "-c",
+            help="Packs the parse table with row displacement.",
+            )) -> None:
+    """Compiles a CFG, and optionally its spec, into a bundle.
+    """    
+    for path in [cfg_path, spec_path]:
+        if path != None and not Path(path).is_file():
+            display.fail_secho("File not found: " + path)
+            raise typer.Exit(1)
+    errors = cfg.find_format_errors(Path(cfg_path).read_text())
+    if errors != []:
+        for e in errors:
+            display.fail_secho(e)
+        raise typer.Exit(1)
+    try:
+        grammar, spec, conflicts = bundle.compile_cfg(cfg_path, spec_path, 
+            compress)
+    except typer.Exit:
+        # the spec has already reported its problems
+        raise
+    except Exception as e:
+        display.fail_secho("Could not compile " + cfg_path + ": " + 
+            type(e).__name__ + (": " + str(e) if str(e) else ""))
+        raise typer.Exit(1)
+    if conflicts != []:
+        display.fail_secho("The CFG is not LL(1), with " + 
+            str(len(conflicts)) + " conflict(s). Run \"kitchen conflicts\" " +
+            "for details.")
+        raise typer.Exit(1)
+
+    if output == None:
+        output = str(Path(cfg_path).with_suffix(bundle.BUNDLE_SUFFIX))
+    try:
+        bundle.write_bundle(grammar, spec, output)
+    except OSError:
+        display.fail_secho("Could not write bundle to " + output)
+        raise typer.Exit(1)
+    display.success_secho("Bundle written to " + output)
+
+@app.command(name = "cost")
+def predict_cost(
+    inp: Optional[str] = typer.Option(
+            None,
+            "--input",
+            "-i",
+            help="Input whose parsing is animated.",
+            ),
+    budget: Optional[float] = typer.Option(
+            None,
+            "--budget",
+            "-b",
+            help="Fails if a scene is predicted to take longer, in seconds, " +
+                "at the chosen quality.",
+            ),
+    quality: str = typer.Option(
+            "med",
+            "--quality",
+            "-q",
+            help="Quality the budget applies to: low, med or high.",
+            )) -> None:
+    """Predicts the size of the parse table and tree, and how long each
+       animation takes to render, before any of them are built.
+    """    
+    cfg = get_cfg()
+    _check_cfg(cfg)
+    opts = ["low", "med", "high"]
+    if quality not in opts:
+        display.fail_secho("Options: --quality low | med | high")
+        raise typer.Exit(1)
+    memo.analyse(cfg)
+    report = cost.estimate(cfg, inp or "", lang_spec.get_spec(cfg))
+    display.print_cost(report)
+    if budget == None:
+        return
+
+    over = [name for name, scene in report["scenes"].items() if 
+        (scene["seconds"][cost.QUALITIES[opts.index(quality)]] or 0) > budget]
+    if over != []:
+        display.fail_secho("Over the budget of " + format(budget, "g") + 
+            " seconds: " + ", ".join(over))
+        raise typer.Exit(1)
+
+@app.command(name = "generate")
+def generate_sentences(
+    count: int = typer.Option(
+            1000,
+            "--count",
+            "-n",
+            help="Number of sentences.",
+            ),
+    output: Optional[str] = typer.Option(
+            None,
+            "--output",
+            "-o",
+            help="Path to the sentences file. Defaults to standard output.",
+            ),
+    min_length: int = typer.Option(
+            1,
+            "--min-length",
+            help="Shortest length aimed for.",
+            ),
+    max_length: int = typer.Option(
+            50,
+            "--max-length",
+            help="Longest length aimed for.",
+            ),
+    max_depth: int = typer.Option(
+            100,
+            "--max-depth",
+            help="Depth after which derivations are closed.",
+            ),
+    mutate: float = typer.Option(
+            0.0,
+            "--mutate",
+            help="Chance of a sentence being made near-valid by one edit.",
+            ),
+    lexemes: bool = typer.Option(
+            False,
+            "--lexemes",
+            "-l",
+            help="Writes lexemes of the loaded spec instead of tokens.",
+            ),
+    seed: Optional[int] = typer.Option(
+            None,
+            "--seed",
+            help="Seed of the sentence generator.",
+            )) -> None:
+    """Generates random sentences of the loaded CFG for load testing.
+    """    
+    cfg = get_cfg()
+    _check_cfg(cfg)
+    spec = None
+    if lexemes:
+        spec = lang_spec.get_spec(cfg)
+        if spec == None:
+            display.fail_secho("No language specification is loaded.")
+            raise typer.Exit(1)
+    try:
+        generator = sg.SentenceGenerator(cfg.ir, min_length, max_length, 
+            max_depth, mutate, spec, seed)
+    except ValueError as e:
+        display.fail_secho("Could not generate sentences: " + str(e))
+        raise typer.Exit(1)
+
+    if output == None:
+        sg.write_sentences(generator.sentences(count), sys.stdout)
+        return
+    try:
+        with open(output, "w") as f:
+            n = sg.write_sentences(generator.sentences(count), f)
+    except OSError:
+        display.fail_secho("Could not write sentences to " + output)
+        raise typer.Exit(1)
+    display.success_secho(str(n) + " sentence(s) written to " + output)
+
+@workspace_app.command(name = "add")
+def workspace_add(
+    name: str = typer.Argument(..., help="Name of the grammar."),
+    cfg_path: str = typer.Option(
+            ...,
+            "--cfg-path",
+            "-cfg",
+            prompt="Please provide the path to your CFG",
+            ),
+    spec_path: Optional[str] = typer.Argument(None)) -> None:
+    """Adds a named grammar to the workspace.
+    """    
+    code = config.add_to_workspace(name, cfg_path, spec_path)
+    if code != SUCCESS:
+        display.fail_secho('Adding "' + name + '" failed with "' + 
+            ERRORS[code] + '"')
+        raise typer.Exit(1)
+    display.success_secho('Added "' + name + '" to the workspace.')
+
+@workspace_app.command(name = "remove")
+def workspace_remove(
+    name: str = typer.Argument(..., help="Name of the grammar.")) -> None:
+    """Removes a named grammar from the workspace.
+    """    
+    code = config.remove_from_workspace(name)
+    if code != SUCCESS:
+        display.fail_secho('Removing "' + name + '" failed with "' + 
+            ERRORS[code] + '"')
+        raise typer.Exit(1)
+    display.success_secho('Removed "' + name + '" from the workspace.')
+
+@workspace_app.command(name = "list")
+def workspace_list() -> None:
+    """Lists the named grammars of the workspace.
+    """    
+    entries = config.read_workspace()
+    if entries == {}:
+        display.info_secho("The workspace is empty.")
+    for name, (cfg_path, spec_path) in entries.items():
+        line = name + "\t" + str(cfg_path)
+        if spec_path != None:
+            line = line + "\t" + str(spec_path)
+        display.general_secho(line)
+
 @app.callback()
 def main(
     version: Optional[bool] = typer.Option(
@@ -246,6 +843,13 @@ def main(
         help="Shows the application's version and exit.",
         callback=_version_callback,
         is_eager=True,
+    ),
+    grammar: Optional[str] = typer.Option(
+        None,
+        "--grammar",
+        "-g",
+        help="Uses a named grammar of the workspace instead of the " +
+        "configured CFG.",
     )
 ) -> None:
     """Displays application options.
@@ -255,6 +859,10 @@ def main(
         Defaults to typer.Option( None, "--version", "-v",
          help="Show the application's version and exit.", 
          callback=_version_callback, is_eager=True, ).
+        grammar (Optional[str], optional): Name of a grammar of the 
+        workspace. Defaults to None.
     """
+    global _grammar_name
+    _grammar_name = grammar
     return
 
@@ -0,0 +1,96 @@
+""" Analyses a directory of CFG files across a pool of processes. """
+# kitchen/backend/batch.py
+
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import io
+import json
+import os
+from pathlib import Path
+
+from kitchen.backend import context_free_grammar as cofg
+
+def analyse_file(cfg_path) -> dict:
+    """Calculates the first sets, follow sets, parse table and LL(1)
+       conflicts of a CFG file. This runs in a worker process, so output is
+       suppressed and every failure is recorded rather than raised.
+
+    Args:
+        cfg_path (str): Path to the CFG file.
+
+    Returns:
+        dict: Results of the analysis.
+    """
+    result = {"file": str(cfg_path)}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            cfg = cofg.ContextFreeGrammar(Path(cfg_path))
+            cfg.calculate_follow_set_worklist()
+            cfg.materialise_sets()
+            conflicts = cfg.find_ll1_conflicts()
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = type(e).__name__ + (": " + str(e) if str(e)
+            else "")
+        return result
+
+    result["status"] = "ok"
+    result["nonterminals"] = cfg.nonterminals
+    result["terminals"] = cfg.terminals
+    result["first_set"] = cfg.first_set
+    result["follow_set"] = {nt: cfg.follow_set[nt] for nt in
+        cfg.nonterminals}
+    result["parse_table"] = cfg.parsetable.pt_dict
+    result["ll1"] = conflicts == []
+    result["conflicts"] = [{"nonterminal": nt, "terminal": t,
+        "productions": prods} for nt, t, prods in conflicts]
+    return result
+
+def find_cfg_files(directory, pattern = "*.txt") -> list:
+    """Finds the CFG files of a directory.
+
+    Args:
+        directory (Path): Directory to be searched.
+        pattern (str, optional): Glob pattern of CFG files. Defaults
+        to "*.txt".
+
+    Returns:
+        list: Paths of the CFG files, sorted by name.
+    """
+    return sorted(p for p in Path(directory).glob(pattern) if p.is_file())
+
+def analyse_dir(directory, pattern = "*.txt", jobs = None) -> list:
+    """Analyses every CFG file of a directory. Files are shared out among
+       a pool of worker processes, each of which imports Kitchen once.
+
+    Args:
+        directory (Path): Directory of CFG files.
+        pattern (str, optional): Glob pattern of CFG files. Defaults
+        to "*.txt".
+        jobs (int, optional): Number of worker processes. Defaults to None,
+        which uses one per CPU.
+
+    Returns:
+        list: Results of each file, in order of file name.
+    """
+    files = [str(p) for p in find_cfg_files(directory, pattern)]
+    if files == []:
+        return []
+    jobs = min(jobs or os.cpu_count() or 1, len(files))
+    if jobs == 1:
+        return [analyse_file(f) for f in files]
+
+    chunksize = max(1, len(files) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(analyse_file, files, chunksize=chunksize))
+
+def write_results(results, output_path) -> None:
+    """Writes the results of a batch analysis as JSON.
+
+    Args:
+        results (list): Results of each file.
+        output_path (Path): Path to the results file.
+    """
+    with Path(output_path).open("w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
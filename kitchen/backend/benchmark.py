@@ -0,0 +1,129 @@
+""" Times the analysis of generated grammars of increasing size. """
+# kitchen/backend/benchmark.py
+
+import contextlib
+import io
+import math
+from pathlib import Path
+import tempfile
+import time
+
+from kitchen.backend import (
+    context_free_grammar as cofg,
+    grammar_generator as gg,
+    parser as p
+)
+
+# stages of the analysis, in the order they are timed
+STAGES = ["load", "first", "follow", "table", "parse"]
+
+def time_stages(cfg_path, tokens, repeat = 3) -> dict:
+    """Times each stage of the analysis of a CFG, from construction of the
+       ContextFreeGrammar to LL(1) parsing of a sentence. Output is
+       suppressed, and the best of several runs is kept.
+
+    Args:
+        cfg_path (Path): Path to the CFG file.
+        tokens (list): Sentence to be parsed.
+        repeat (int, optional): Number of runs. Defaults to 3.
+
+    Returns:
+        dict: Seconds taken by each stage.
+    """
+    best = dict.fromkeys(STAGES, math.inf)
+    inp = " ".join(tokens)
+    for _ in range(max(1, repeat)):
+        times = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            cfg = cofg.ContextFreeGrammar(cfg_path)
+            times["load"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cfg.reset_first_set()
+            times["first"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cfg.reset_follow_set()
+            times["follow"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cfg.setup_parsetable()
+            cfg.parsetable.populate_table()
+            times["table"] = time.perf_counter() - start
+
+            parser = p.ParserLL1(inp, cfg)
+            start = time.perf_counter()
+            parser.parse_ll1(cfg.start_symbol, semantic=True)
+            times["parse"] = time.perf_counter() - start
+
+        for stage in STAGES:
+            best[stage] = min(best[stage], times[stage])
+    return best
+
+def run_benchmark(sizes, terminals = None, width = 4, nullable_ratio = 0.25,
+    recursion = 2, length = 200, repeat = 3, seed = 0) -> list:
+    """Generates a grammar of each size and times its analysis.
+
+    Args:
+        sizes (list): Numbers of non-terminals.
+        terminals (int, optional): Number of terminals. Defaults to None,
+        which uses as many terminals as non-terminals.
+        width (int, optional): Maximum length of a production. Defaults to 4.
+        nullable_ratio (float, optional): Chance of a non-terminal deriving
+        epsilon. Defaults to 0.25.
+        recursion (int, optional): How far back a production may refer to a
+        non-terminal. Defaults to 2.
+        length (int, optional): Length of the parsed sentence. Defaults
+        to 200.
+        repeat (int, optional): Number of runs per size. Defaults to 3.
+        seed (int, optional): Seed of the generator. Defaults to 0.
+
+    Returns:
+        list: One row per size, with the size of the grammar and the seconds
+        taken by each stage.
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            grammar = gg.generate_grammar(n, terminals or n, width,
+                nullable_ratio, recursion, seed=seed)
+            tokens = gg.generate_sentence(grammar, length, seed=seed)
+            cfg_path = Path(tmp) / ("cfg_" + str(n) + ".txt")
+            cfg_path.write_text(gg.to_text(grammar))
+
+            row = {"nonterminals": n,
+                "productions": sum(len(b) for b in grammar.values()),
+                "tokens": len(tokens)}
+            row.update(time_stages(cfg_path, tokens, repeat))
+            rows.append(row)
+    return rows
+
+def scaling(rows) -> dict:
+    """Fits t = c * n^k to the times of each stage, where n is the number of
+       productions, or of tokens for parsing. k is the slope of the 
+       least-squares line through (log n, log t), so 1 means linear growth
+       and 2 quadratic.
+
+    Args:
+        rows (list): Rows obtained from `run_benchmark`.
+
+    Returns:
+        dict: Exponent k of each stage, or None if it cannot be fitted.
+    """
+    curves = {}
+    for stage in STAGES:
+        size = "tokens" if stage == "parse" else "productions"
+        points = [(math.log(r[size]), math.log(r[stage]))
+            for r in rows if r[stage] > 0 and r[size] > 0]
+        if len(points) < 2:
+            curves[stage] = None
+            continue
+        mx = sum(x for x, _ in points) / len(points)
+        my = sum(y for _, y in points) / len(points)
+        sxx = sum((x - mx) ** 2 for x, _ in points)
+        if sxx == 0:
+            curves[stage] = None
+            continue
+        curves[stage] = sum((x - mx) * (y - my) for x, y in points) / sxx
+    return curves
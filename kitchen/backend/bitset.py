@@ -0,0 +1,81 @@
+""" Represents sets of grammar symbols as integer bitmasks. """
+# kitchen/backend/bitset.py
+
+EMPTY = 0
+
+def bit(sid: int) -> int:
+    """Obtains the mask containing a single symbol.
+
+    Args:
+        sid (int): Symbol id.
+
+    Returns:
+        int: Bitmask with only the bit of this symbol set.
+    """
+    return 1 << sid
+
+def from_ids(ids) -> int:
+    """Builds a bitmask from a sequence of symbol ids.
+
+    Args:
+        ids (iterable): Symbol ids.
+
+    Returns:
+        int: Bitmask.
+    """
+    mask = EMPTY
+    for sid in ids:
+        mask |= 1 << sid
+    return mask
+
+def contains(mask: int, sid: int) -> bool:
+    """Checks whether a symbol is in a set.
+
+    Args:
+        mask (int): Bitmask.
+        sid (int): Symbol id.
+
+    Returns:
+        bool: True if the symbol is in the set.
+    """
+    return (mask >> sid) & 1 == 1
+
+def to_ids(mask: int) -> list:
+    """Lists the symbol ids in a set, in ascending order.
+
+    Args:
+        mask (int): Bitmask.
+
+    Returns:
+        list: Symbol ids.
+    """
+    ids = []
+    while mask:
+        low = mask & -mask
+        ids.append(low.bit_length() - 1)
+        mask ^= low
+    return ids
+
+def to_names(ir, mask: int) -> list:
+    """Lists the names of the symbols in a set. Since terminals are interned
+       in order of appearance, this is also the order of the CFG.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+        mask (int): Bitmask.
+
+    Returns:
+        list: Symbol names.
+    """
+    return ir.names(to_ids(mask))
+
+def size(mask: int) -> int:
+    """Counts the symbols in a set.
+
+    Args:
+        mask (int): Bitmask.
+
+    Returns:
+        int: Number of symbols.
+    """
+    return bin(mask).count("1")
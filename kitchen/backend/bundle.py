@@ -0,0 +1,188 @@
+""" Writes and loads compiled grammar bundles. """
+# kitchen/backend/bundle.py
+
+import mmap
+import os
+from pathlib import Path
+import pickle
+import struct
+import tempfile
+
+import numpy as np
+
+from kitchen import __version__
+
+from kitchen.helpers import lang_spec
+
+from kitchen.backend import (
+    context_free_grammar as cofg,
+    dense_table as dt,
+    grammar_ir as gir,
+    parse_table as pt
+)
+
+BUNDLE_MAGIC = b"KITCHEN\0"
+
+# bumped whenever the layout or the stored structures change
+BUNDLE_FORMAT = 5
+
+BUNDLE_SUFFIX = ".kbundle"
+
+# magic, format and number of sections
+_HEADER = struct.Struct("<8sII")
+
+# name, offset and length of each section
+_SECTION = struct.Struct("<16sQQ")
+
+# sections start on multiples of this, so arrays can be viewed in place
+_ALIGN = 8
+
+def compile_cfg(cfg_path, spec_path = None, compress = False) -> tuple:
+    """Analyses a CFG for a bundle. The sets are calculated by the bitset
+       engines, and the parse table must be free of LL(1) conflicts.
+
+    Args:
+        cfg_path (Path): Path to the CFG file.
+        spec_path (Path, optional): Path to the spec file. Defaults to None.
+        compress (bool, optional): Packs the parse table with row
+        displacement. Defaults to False.
+
+    Raises:
+        ValueError: If a line of the CFG is not a production.
+
+    Returns:
+        tuple: ContextFreeGrammar, Specification (or None) and the LL(1)
+        conflicts of the CFG.
+    """
+    errors = cofg.find_format_errors(Path(cfg_path).read_text())
+    if errors != []:
+        raise ValueError("\n".join(errors))
+    cfg = cofg.ContextFreeGrammar(Path(cfg_path))
+    cfg.calculate_follow_set_worklist()
+    cfg.materialise_sets()
+    conflicts = cfg.find_ll1_conflicts()
+    cfg.parsetable.get_dense(compress)
+
+    spec = None
+    if spec_path != None:
+        spec = lang_spec.Specification(Path(spec_path), cfg)
+    return cfg, spec, conflicts
+
+def write_bundle(cfg, spec, output_path) -> Path:
+    """Writes an analysed CFG, and the token patterns of its spec, to a
+       bundle. Everything except the parse table is pickled into one
+       section, and each array of the table gets a section of its own.
+
+    Args:
+        cfg (ContextFreeGrammar): CFG with a calculated parse table.
+        spec (Specification): Specification, or None.
+        output_path (Path): Path to the bundle.
+
+    Returns:
+        Path: Path to the bundle.
+    """
+    dense = cfg.parsetable.get_dense()
+    state = cfg.__getstate__()
+    state["parsetable"] = None
+    state["parser_ll1"] = None
+    state["is_parser_ll1_set_up"] = False
+    state["parser_lalr"] = None
+    state.pop("ir")
+
+    arrays = dense.arrays()
+    meta = {
+        "version": __version__,
+        "cfg_path": str(cfg._cfg_path),
+        "cfg": state,
+        "ir": cfg.ir.__dict__,
+        "conflicts": dense.conflicts,
+        "arrays": {name: (str(a.dtype), a.shape) for name, a in
+            arrays.items()},
+        "spec": spec.to_data() if spec != None else None
+    }
+    sections = [("meta", pickle.dumps(meta, protocol=pickle.HIGHEST_PROTOCOL))]
+    sections += [(name, np.ascontiguousarray(a).tobytes()) for name, a in
+        arrays.items()]
+
+    # lays the sections out after the header and section table
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = []
+    for name, data in sections:
+        offset += -offset % _ALIGN
+        table.append((name, offset, len(data)))
+        offset += len(data)
+
+    output_path = Path(output_path)
+    fd, tmp = tempfile.mkstemp(dir=output_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_FORMAT, len(sections)))
+            for name, start, length in table:
+                f.write(_SECTION.pack(name.encode(), start, length))
+            for (_, data), (_, start, _) in zip(sections, table):
+                f.write(b"\0" * (start - f.tell()))
+                f.write(data)
+        os.replace(tmp, output_path)
+    except OSError:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return output_path
+
+def load_bundle(bundle_path) -> tuple:
+    """Loads a CFG and its spec from a bundle, without reading the CFG or
+       spec files. The bundle is memory-mapped, and the arrays of the parse
+       table are read-only views of the mapping.
+
+    Args:
+        bundle_path (Path): Path to the bundle.
+
+    Raises:
+        ValueError: If the file is not a bundle of this format.
+
+    Returns:
+        tuple: ContextFreeGrammar and Specification (or None).
+    """
+    with open(bundle_path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapped) < _HEADER.size:
+        raise ValueError("not a kitchen bundle: " + str(bundle_path))
+    magic, version, count = _HEADER.unpack_from(mapped, 0)
+    if magic != BUNDLE_MAGIC:
+        raise ValueError("not a kitchen bundle: " + str(bundle_path))
+    if version != BUNDLE_FORMAT:
+        raise ValueError("bundle format " + str(version) + " is not " +
+            "supported, please compile the CFG again")
+
+    sections = {}
+    for i in range(count):
+        name, start, length = _SECTION.unpack_from(mapped,
+            _HEADER.size + i * _SECTION.size)
+        sections[name.rstrip(b"\0").decode()] = (start, length)
+
+    start, length = sections["meta"]
+    meta = pickle.loads(mapped[start:start + length])
+
+    ir = gir.GrammarIR.__new__(gir.GrammarIR)
+    ir.__dict__.update(meta["ir"])
+
+    arrays = {}
+    for name, (dtype, shape) in meta["arrays"].items():
+        start, length = sections[name]
+        count = int(np.prod(shape))
+        arrays[name] = np.frombuffer(mapped, dtype, count,
+            start).reshape(shape)
+    dense = dt.DenseTable.from_arrays(ir, arrays, meta["conflicts"])
+
+    cfg = cofg.ContextFreeGrammar.__new__(cofg.ContextFreeGrammar)
+    cfg.__dict__.update(meta["cfg"])
+    cfg.ir = ir
+    cfg._cfg_path = Path(meta["cfg_path"])
+    cfg.parsetable = pt.ParsingTable.from_dense(dense, cfg.cfg_dict)
+    cfg.parsetable.set_internals(cfg.first_set, cfg.follow_set,
+        cfg.firstset_index)
+
+    spec = None
+    if meta["spec"] != None:
+        spec = lang_spec.Specification.from_data(meta["spec"], cfg)
+    return cfg, spec
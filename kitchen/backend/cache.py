@@ -0,0 +1,168 @@
+""" Persists the analysis of CFGs between invocations of the CLI. """
+# kitchen/backend/cache.py
+
+import hashlib
+import os
+from pathlib import Path
+import pickle
+import tempfile
+
+from kitchen import (
+    __version__,
+    SUCCESS
+)
+
+from kitchen.helpers import config
+
+from kitchen.backend import context_free_grammar as cofg
+
+# the cache is kept in KITCHEN_CACHE_DIR if it is set, and is turned off 
+# altogether if KITCHEN_NO_CACHE is set to anything but an empty string
+CACHE_DIR_ENV = "KITCHEN_CACHE_DIR"
+NO_CACHE_ENV = "KITCHEN_NO_CACHE"
+
+CACHE_DIR_PATH = Path(os.environ.get(CACHE_DIR_ENV, 
+    config.CONFIG_DIR_PATH / "cache"))
+
+# the cache is trimmed to this many bytes, least recently used first
+CACHE_SIZE_LIMIT = 32 * 1024 * 1024
+
+# bumped whenever the cached structures change shape
+CACHE_FORMAT = 10
+
+def cache_key(contents: str, prune = False) -> str:
+    """Obtains the key under which the analysis of a CFG is stored.
+
+    Args:
+        contents (str): Contents of the CFG file.
+        prune (bool, optional): The CFG was pruned. Defaults to False.
+
+    Returns:
+        str: Hex digest of the contents and the kitchen version.
+    """
+    h = hashlib.sha256()
+    h.update((__version__ + ":" + str(CACHE_FORMAT) + ":" + str(prune) + 
+        "\n").encode())
+    h.update(contents.encode())
+    return h.hexdigest()
+
+def is_enabled() -> bool:
+    """Checks whether analyses are read from and written to the cache.
+
+    Returns:
+        bool: False if KITCHEN_NO_CACHE is set.
+    """
+    return os.environ.get(NO_CACHE_ENV, "") == ""
+
+def _entry_path(key: str) -> Path:
+    """Obtains the path of a cache entry.
+
+    Args:
+        key (str): Cache key.
+
+    Returns:
+        Path: Path to the entry.
+    """
+    return CACHE_DIR_PATH / (key + ".pkl")
+
+def load_cfg(cfg_path: Path, prune = False) -> cofg.ContextFreeGrammar:
+    """Obtains the ContextFreeGrammar of a CFG file, along with any analysis
+       which was cached for the same contents.
+
+    Args:
+        cfg_path (Path): Path to the CFG file.
+        prune (bool, optional): Removes useless non-terminals. Defaults to 
+        False.
+
+    Returns:
+        ContextFreeGrammar: Loaded CFG.
+    """
+    if not is_enabled():
+        return cofg.ContextFreeGrammar(cfg_path, prune)
+    contents = cfg_path.read_text()
+    entry = _entry_path(cache_key(contents, prune))
+    try:
+        with entry.open("rb") as f:
+            state = pickle.load(f)
+        # marks the entry as recently used
+        os.utime(entry)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+        ImportError):
+        return cofg.ContextFreeGrammar(cfg_path, prune)
+
+    cfg = cofg.ContextFreeGrammar.__new__(cofg.ContextFreeGrammar)
+    cfg.__dict__.update(state)
+    cfg._cfg_path = cfg_path
+    cfg._mtime = cfg_path.stat().st_mtime
+    return cfg
+
+def save_cfg(cfg, limit = CACHE_SIZE_LIMIT) -> None:
+    """Stores the analysis of a CFG. Parse tables which failed are left out
+       so that their errors are reported again, as are CFGs with undefined
+       non-terminals. Parser state is never stored.
+
+    Args:
+        cfg (ContextFreeGrammar): Analysed CFG.
+        limit (int, optional): Size limit of the cache directory in bytes.
+        Defaults to CACHE_SIZE_LIMIT.
+    """
+    if not is_enabled() or not cfg.first_set_calculated or \
+        cfg.ir.undefined != []:
+        return
+
+    state = cfg.__getstate__()
+    state["parser_ll1"] = None
+    state["is_parser_ll1_set_up"] = False
+    state["parser_lalr"] = None
+    if state.get("parsetable_code", None) != SUCCESS:
+        state["parsetable"] = {}
+        state["parsetable_calculated"] = False
+
+    entry = _entry_path(cache_key(cfg.cfg_contents, cfg._prune))
+    try:
+        CACHE_DIR_PATH.mkdir(parents=True, exist_ok=True)
+        # writes to a temporary file first, so readers never see half an entry
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR_PATH, suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, entry)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+        Path(tmp).unlink(missing_ok=True)
+        return
+    evict(limit)
+
+def evict(limit = CACHE_SIZE_LIMIT) -> int:
+    """Removes the least recently used entries until the cache fits within
+       its size limit.
+
+    Args:
+        limit (int, optional): Size limit in bytes. Defaults to
+        CACHE_SIZE_LIMIT.
+
+    Returns:
+        int: Number of entries removed.
+    """
+    entries = []
+    total = 0
+    for entry in CACHE_DIR_PATH.glob("*.pkl"):
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry))
+        total += stat.st_size
+
+    removed = 0
+    for _, size, entry in sorted(entries):
+        if total <= limit:
+            break
+        try:
+            entry.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
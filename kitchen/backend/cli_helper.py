@@ -2,13 +2,18 @@
 # kitchen/backend/cli_helper.py
 
 from pathlib import Path
+import time
 import typer
 import manim as m
 
 from kitchen import (
     __app_name__,
     AMBIGUOUS_ERROR,
+    BUDGET_ERROR,
+    ERROR,
     ERRORS, 
+    HEALTH_ERROR,
+    PARSING_ERROR,
     SUCCESS
 )
 
@@ -16,11 +21,14 @@ from kitchen.helpers import (
     display,
     error, 
     config,
-    lang_spec
+    lang_spec,
+    sounds
 )
 
 from kitchen.backend import (
+    cost,
     parse_table as pt,
+    memo,
     parser as p,
     semantic as tc,
     context_free_grammar as cofg
@@ -93,8 +101,15 @@ def load_app(cfg_path, spec_path = None, testing = False) -> None:
                 typer.secho(f"\t The language specification path is " + 
                 spec_path, fg=typer.colors.GREEN)
 
+            if cfg.prods != ERROR:
+                for message in cfg.get_health().errors():
+                    display.fail_secho(message)
+                for message in cfg.get_health().warnings():
+                    display.info_secho(message)
+
 def _set_parsetable(cfg) -> int:
-    """Sets the up and calculates the parsetable structures.
+    """Sets the up and calculates the parsetable structures, or restores
+       them if this CFG has already been analysed in this session.
 
     Args:
         cfg (ContextFreeGrammar): Loaded CFG.
@@ -102,25 +117,7 @@ def _set_parsetable(cfg) -> int:
     Returns:
         int: Status code.
     """    
-
-    if not cfg.parsetable_calculated:
-    # reset cfg structures before we begin if needed
-        if not cfg.first_set_calculated:
-            cfg.reset_first_set()
-
-        if not cfg.follow_set_calculated:
-            cfg.reset_follow_set()
-
-        if not cfg.is_ambiguous:
-            # initialise parsetable
-            cfg.setup_parsetable()
-
-            # calculate parsetable
-            code = cfg.calculate_parsetable()
-        else:
-            code = AMBIGUOUS_ERROR
-        return code
-    return SUCCESS
+    return memo.analyse(cfg)
     
 def _show_parsetable(cfg) -> None:
     """Displays the calculated parse table. 
@@ -134,20 +131,87 @@ def _show_parsetable(cfg) -> None:
         cfg.parsetable.print_parse_table()
     return code
 
-def handle_input(inp, cfg, spec) -> None:
+def handle_input(inp, cfg, spec, workspace = None) -> None:
     """Handles user input by performing commands or otherwise parsing using 
     the default method, LL(1)
 
     Args:
       inp (String): User input. 
       cfg (ContextFreeGrammar): ContextFreeGrammar Object based on loaded CFG.     
+      workspace (Workspace, optional): Named grammars of the session. 
+      Defaults to None.
     """    
+    # the CFG file may have been edited since the last input
+    if cfg.has_changed() and inp.strip() not in ["\\reload", "\\r"]:
+        _reload_cfg(cfg)
+
     if inp.strip()[0] == "\\":
-        _process_command(inp, cfg, spec)
+        _process_command(inp, cfg, spec, workspace)
     else:
         code = _init_parsing_ll1(inp.strip(), cfg, spec)
-        if code == AMBIGUOUS_ERROR:
-            error.ERR_ambiguous_grammar()
+        # CFGs which are not LL(1) are parsed bottom-up instead
+        if code == AMBIGUOUS_ERROR or cfg.parsetable_code == ERROR:
+            display.info_secho("This CFG is not LL(1), so the input is " + 
+                "parsed with LALR(1).")
+            code = _init_parsing_lalr(inp.strip(), cfg, spec)
+            if code == ERROR:
+                error.ERR_ambiguous_grammar()
+
+def _reload_cfg(cfg) -> None:
+    """Reloads the CFG file, recalculating only what its edits affect. A
+       CFG file which cannot be loaded is reported, and the previous CFG is
+       kept.
+
+    Args:
+        cfg (ContextFreeGrammar): Loaded CFG.
+    """
+    try:
+        changed, first, follow, rows = cfg.reload()
+    except ValueError as e:
+        display.fail_secho(str(e))
+        display.info_secho("The previous CFG is still loaded.")
+        return
+    if changed == set():
+        display.info_secho("CFG reloaded. No productions changed.")
+    else:
+        display.success_secho("CFG reloaded. Changed: " + 
+            ", ".join(sorted(changed)))
+        display.info_secho("Recalculated " + str(len(first)) + 
+            " first set(s), " + str(len(follow)) + " follow set(s) and " + 
+            str(len(rows)) + " parse table row(s).")
+
+def _switch_grammar(name, workspace) -> None:
+    """Makes another grammar of the workspace the current one.
+
+    Args:
+        name (str): Name of the grammar.
+        workspace (Workspace): Named grammars of the session.
+    """
+    if workspace == None:
+        display.fail_secho('No workspace loaded. Please run ' + 
+            '"kitchen run --workspace".')
+    elif name == "":
+        display.fail_secho("No grammar name given.")
+    elif workspace.select(name) != SUCCESS:
+        display.fail_secho('No grammar named "' + name + 
+            '" in the workspace.')
+    else:
+        display.success_secho('Using grammar "' + name + '".')
+
+def _show_grammars(workspace) -> None:
+    """Lists the grammars of the workspace, marking the current one.
+
+    Args:
+        workspace (Workspace): Named grammars of the session.
+    """
+    if workspace == None:
+        display.fail_secho('No workspace loaded. Please run ' + 
+            '"kitchen run --workspace".')
+        return
+    for name in workspace.names():
+        marker = "* " if name == workspace.current else "  "
+        display.general_secho(marker + name + "\t" + 
+            str(workspace.entries[name][0]))
 
 def _init_parsing_ll1_via_cmd(inp, cfg, spec) -> int:
     """Initialises LL(1) parsing via the command \ll1 <input>
@@ -159,9 +223,9 @@ def _init_parsing_ll1_via_cmd(inp, cfg, spec) -> int:
     Returns:
         int: _description_
     """    
-    config = inp.strip()[4:7].strip()
+    flag = inp.strip()[4:7].strip()
     # parse \ll1 \v <input>
-    if config == "\\v":
+    if flag == "\\v":
         to_parse = inp.strip()[7:].strip()
         if to_parse == "":
             error.ERR_no_input_given()
@@ -169,11 +233,15 @@ def _init_parsing_ll1_via_cmd(inp, cfg, spec) -> int:
             if to_parse == "":
                 error.ERR_no_input_given()
             else:
+                code, predicted = _check_budget(config.LL1_PARSING, cfg, 
+                    spec, to_parse)
+                if code != SUCCESS:
+                    return code
                 config.configure_output_file_name(config.LL1_PARSING, to_parse)
                 with m.tempconfig(config.OUTPUT_CONFIG):
                     animation = m_parser.MParseTree()
                     animation.setup_manim(to_parse, cfg, spec)
-                    animation.render()       
+                    _render(animation, config.LL1_PARSING, predicted)
     else:
         # parse \ll1 <input>
         _init_parsing_ll1(inp[4:].strip(), cfg, spec)
@@ -191,9 +259,7 @@ def _init_parsing_ll1(inp, cfg, spec, semantic = False) -> int:
         int: Status code
     """    
     # calculates the parse table if this has not yet been done 
-    code = SUCCESS
-    if not cfg.parsetable_calculated:
-        code = _set_parsetable(cfg)
+    code = _set_parsetable(cfg)
 
     if code == SUCCESS:
         # sets up the cfg parser 
@@ -207,6 +273,71 @@ def _init_parsing_ll1(inp, cfg, spec, semantic = False) -> int:
             return code
     return code
             
+def _init_parsing_lalr(inp, cfg, spec, semantic = False, 
+    testing = False) -> int:
+    """Initialises parsing using LALR(1), generating the LALR(1) table of 
+       the CFG if this has not yet been done.
+
+    Args:
+        inp (str): Input string to be parsed
+        cfg (ContextFreeGrammar): ContextFreeGrammar object
+        spec (Specification): Specification object.
+        semantic (bool, optional): Parses without displaying the tree. 
+        Defaults to False.
+        testing (bool, optional): Testing mode. Defaults to False.
+
+    Returns:
+        int: Status code
+    """
+    try:
+        table = cfg.get_lalr_table()
+    except ValueError as e:
+        display.fail_secho("Cannot build an LALR(1) table: " + str(e))
+        return ERROR
+
+    if not table.is_lalr1() and not semantic:
+        display.info_secho("Note:\tThis CFG is not LALR(1). " + 
+            str(len(table.conflicts)) + " conflict(s) were resolved as " + 
+            "yacc does,\n\tby shifting and by the earlier production.")
+
+    if cfg.parser_lalr == None or cfg.parser_lalr.spec is not spec:
+        cfg.set_parser_lalr(p.ParserLALR(inp, cfg, spec))
+        inp = ""
+    return cfg.parser_lalr.parse_lalr(inp, semantic, testing)
+
+def _init_parsing_normalised(inp, cfg, spec, semantic = False, 
+    testing = False) -> int:
+    """Parses with the LL(1) table of a normalised CFG, and shows the parse
+       tree of the CFG it was obtained from.
+
+    Args:
+        inp (str): Input string to be parsed
+        cfg (ContextFreeGrammar): CFG obtained from `normalise`.
+        spec (Specification): Specification object.
+        semantic (bool, optional): Parses without displaying the tree. 
+        Defaults to False.
+        testing (bool, optional): Testing mode. Defaults to False.
+
+    Returns:
+        int: Status code
+    """
+    if not cfg.parsetable_calculated:
+        cfg.find_ll1_conflicts()
+    if cfg.parsetable_code != SUCCESS:
+        display.fail_secho("The normalised CFG is not LL(1), so it has no " +
+            "parse table.")
+        return ERROR
+
+    parser = p.ParserLL1(inp, cfg, spec)
+    derivation = parser.derive()
+    if derivation is None:
+        if not semantic:
+            display.fail_secho("Parsing failed.")
+        return PARSING_ERROR
+    root = cfg.folding.fold(derivation, parser.tokens)
+    p._show_success(root, parser.tokens, semantic, testing)
+    return SUCCESS
+
 def _set_cfg_parser_ll1(inp, cfg, spec) -> int:
     """Initialises a new ParserLL1 object if it has not been initialised 
        in this app session yet.
@@ -233,19 +364,9 @@ def _prepare_to_parse(cfg):
     Returns:
         int: Status code.
     """    
-    if not cfg.first_set_calculated:
-        cfg.reset_first_set()
-
-    if not cfg.follow_set_calculated:
-        cfg.reset_follow_set()
-
-    if not cfg.is_ambiguous:
-        if not cfg.parsetable_calculated:
-            cfg.setup_parsetable()
-            cfg.calculate_parsetable()
-        return SUCCESS
-    else:
+    if memo.analyse(cfg) == AMBIGUOUS_ERROR:
         return AMBIGUOUS_ERROR
+    return SUCCESS
 
 def _init_parsing_vis_shortcut(inp, cfg, spec) -> int:
     """Initialises the visualisation of LL(1) parsing on some input, 
@@ -262,20 +383,93 @@ def _init_parsing_vis_shortcut(inp, cfg, spec) -> int:
     if to_parse == "":
         error.ERR_no_input_given()
     else:
+        code, predicted = _check_budget(config.LL1_PARSING, cfg, spec, 
+            to_parse)
+        if code != SUCCESS:
+            return code
         config.configure_output_file_name(config.LL1_PARSING, to_parse)
         with m.tempconfig(config.OUTPUT_CONFIG):
             animation = m_parser.MParseTree()
             animation.setup_manim(to_parse, cfg, spec)
-            animation.render()       
+            _render(animation, config.LL1_PARSING, predicted)
     return SUCCESS
 
-def _process_command(inp, cfg, spec) -> None:
+def _check_budget(scene, cfg, spec = None, inp = "") -> tuple:
+    """Predicts how long a scene takes to render at the current quality,
+       warning when it is long and refusing it when it is over the budget.
+
+    Args:
+        scene (int): Scene code, from `config`.
+        cfg (ContextFreeGrammar): Analysed CFG.
+        spec (Specification, optional): Language specification. Defaults to
+        None.
+        inp (str, optional): Input of a parsing scene. Defaults to "".
+
+    Returns:
+        tuple: Status code, and the animations predicted without 
+        calibration, or None if they could not be predicted.
+    """
+    model = cost.CostModel()
+    features = cost.measure(cfg, inp, spec)
+    narration = sounds.get_config() == sounds.NARR
+    quality = config.OUTPUT_CONFIG["quality"]
+    seconds = model.render_seconds(scene, features, quality, narration)
+    if seconds is None:
+        return SUCCESS, None
+
+    predicted = model.animations(scene, features, narration, 
+        calibrated = False)
+    if seconds > config.RENDER_BUDGET:
+        display.fail_secho("This animation is predicted to take " + 
+            format(seconds, ".0f") + " seconds to render, which is over the " +
+            "budget of " + format(config.RENDER_BUDGET, "g") + " seconds.\n" +
+            "(Lower the quality with \\c -q low, or raise the budget with " +
+            "\\c -b <seconds>.)")
+        return BUDGET_ERROR, predicted
+    if seconds > cost.WARNING_SECONDS:
+        display.info_secho("This animation is predicted to take about " + 
+            format(seconds, ".0f") + " seconds to render.")
+    return SUCCESS, predicted
+
+def _render(animation, scene, predicted) -> None:
+    """Renders a scene, and records how long it took and how many 
+       animations it made, so that later predictions are calibrated.
+
+    Args:
+        animation (Scene): Scene which has been set up.
+        scene (int): Scene code, from `config`.
+        predicted (int): Animations predicted without calibration, or None.
+    """
+    start = time.perf_counter()
+    animation.render()
+    seconds = time.perf_counter() - start
+    measured = getattr(animation.renderer, "num_plays", None)
+    if predicted and measured:
+        cost.CostModel().record(scene, config.OUTPUT_CONFIG["quality"], 
+            predicted, measured, seconds)
+
+def _show_cost(inp, cfg, spec) -> None:
+    """Displays the predicted table, tree and render times, via the command
+       '\\cost [<input>]'.
+
+    Args:
+        inp (str): Input string, which may be empty.
+        cfg (ContextFreeGrammar): Loaded CFG.
+        spec (Specification): Language specification, or None.
+    """
+    if memo.analyse(cfg) == HEALTH_ERROR:
+        return
+    display.print_cost(cost.estimate(cfg, inp, spec))
+
+def _process_command(inp, cfg, spec, workspace = None) -> None:
     """Processes a command from the user.
 
     Args:
         inp (String): User input.
         cfg (ContextFreeGrammar): ContextFreeGrammar Object based on 
                                   loaded CFG.
+        workspace (Workspace, optional): Named grammars of the session. 
+        Defaults to None.
 
     Raises:
         typer.Exit: Exits the application when the user requests this. 
@@ -298,66 +492,64 @@ def _process_command(inp, cfg, spec) -> None:
             dsl.main (spec)
 
     elif inp == "\\show first" or inp == "\\fs":
+        memo.analyse(cfg, memo.FIRST)
         cfg.show_first_set()
     
     elif inp == "\\vis first" or inp == "\\vfs":
-        if cfg.first_set_calculated:
-            cfg.reset_first_set(calculate_again = False)
-            cfg.first_set_calculated = False
+        # the animation calculates the first set again, step by step
+        memo.analyse(cfg, memo.FIRST)
+        code, predicted = _check_budget(config.FIRST_SET, cfg)
+        if code == SUCCESS:
+            memo.forget(cfg, memo.FIRST)
 
-        config.configure_output_file_name(config.FIRST_SET)
-        with m.tempconfig(config.OUTPUT_CONFIG):
-            animation = m_first.MFirstSet()
-            animation.setup_manim(cfg)
-            animation.render()
+            config.configure_output_file_name(config.FIRST_SET)
+            with m.tempconfig(config.OUTPUT_CONFIG):
+                animation = m_first.MFirstSet()
+                animation.setup_manim(cfg)
+                _render(animation, config.FIRST_SET, predicted)
+            memo.analyse(cfg, memo.FIRST)
       
     elif inp == "\\show follow" or inp == "\\fw":
-        if not cfg.first_set_calculated:
-            cfg.reset_first_set()
-            cfg.first_set_calculated = True
-
+        memo.analyse(cfg, memo.FOLLOW)
         cfg.show_follow_set()
         
     elif inp == "\\vis follow" or inp == "\\vfw":
-        if not cfg.first_set_calculated:
-            cfg.reset_first_set()
-
-        # reset the follow set to be visualised again
-        if cfg.follow_set_calculated:
-            cfg.reset_follow_set(calculate_again = False)
-            cfg.follow_set_calculated = False
+        # the animation calculates the follow set again, step by step
+        memo.analyse(cfg, memo.FOLLOW)
+        code, predicted = _check_budget(config.FOLLOW_SET, cfg)
+        if code == SUCCESS:
+            memo.forget(cfg, memo.FOLLOW)
 
-        config.configure_output_file_name(config.FOLLOW_SET)
-        with m.tempconfig(config.OUTPUT_CONFIG):
-            animation = m_follow.MFollowSet()
-            animation.setup_manim(cfg)
-            animation.render()
+            config.configure_output_file_name(config.FOLLOW_SET)
+            with m.tempconfig(config.OUTPUT_CONFIG):
+                animation = m_follow.MFollowSet()
+                animation.setup_manim(cfg)
+                _render(animation, config.FOLLOW_SET, predicted)
+            memo.analyse(cfg, memo.FOLLOW)
 
     elif inp == "\\show parsetable" or inp == "\\pt":
         code = _show_parsetable(cfg)
         if code == AMBIGUOUS_ERROR:
             error.ERR_ambiguous_grammar()
+            cfg.parsetable.report_conflicts()
 
     elif inp == "\\vis parsetable" or inp == "\\vpt":
-        if not cfg.first_set_calculated:
-            cfg.reset_first_set()
-
-        if not cfg.follow_set_calculated:
-            cfg.reset_follow_set()
-
-        if not cfg.is_ambiguous:
-            if cfg.parsetable_calculated:
-                # re-initialise parsetable
-                cfg.setup_parsetable()
-            
-            config.OUTPUT_CONFIG["output_file"] = "Parsetable"
-            config.configure_output_file_name(config.PARSETABLE)
-            with m.tempconfig(config.OUTPUT_CONFIG):
-                animation = m_parse_table.MParsingTable()
-                animation.setup_manim(cfg)
-                animation.render()
-        else:
+        if memo.analyse(cfg) == AMBIGUOUS_ERROR:
             error.ERR_ambiguous_grammar()
+        else:
+            code, predicted = _check_budget(config.PARSETABLE, cfg)
+            if code == SUCCESS:
+                # the animation fills a new parse table
+                memo.forget(cfg, memo.PARSETABLE)
+                cfg.setup_parsetable()
+                
+                config.OUTPUT_CONFIG["output_file"] = "Parsetable"
+                config.configure_output_file_name(config.PARSETABLE)
+                with m.tempconfig(config.OUTPUT_CONFIG):
+                    animation = m_parse_table.MParsingTable()
+                    animation.setup_manim(cfg)
+                    _render(animation, config.PARSETABLE, predicted)
+                memo.analyse(cfg)
 
     elif inp == "\\semantic" or inp[0:4] == "\\sem":
         stripped = inp.strip()
@@ -408,18 +600,31 @@ def _process_command(inp, cfg, spec) -> None:
             else:
                 code = _init_parsing_ll1(to_sem, cfg, spec, semantic = True)
                 if code == SUCCESS:
-                    config.OUTPUT_CONFIG["output_file"] = "TypeCheck"
-                    config.configure_output_file_name(config.TYPE_CHECK)
-                    with m.tempconfig(config.OUTPUT_CONFIG):
-                        sem_analyser = m_semantic.MSemanticAnalyser()
-                        sem_analyser.setup_manim(cfg, 
-                        cfg.parser_ll1.root, to_sem, spec)
-                        sem_analyser.render()
+                    code, predicted = _check_budget(config.TYPE_CHECK, cfg,
+                        spec, to_sem)
+                    if code == SUCCESS:
+                        config.OUTPUT_CONFIG["output_file"] = "TypeCheck"
+                        config.configure_output_file_name(config.TYPE_CHECK)
+                        with m.tempconfig(config.OUTPUT_CONFIG):
+                            sem_analyser = m_semantic.MSemanticAnalyser()
+                            sem_analyser.setup_manim(cfg, 
+                            cfg.parser_ll1.root, to_sem, spec)
+                            _render(sem_analyser, config.TYPE_CHECK, 
+                                predicted)
                 else:
                     display.fail_secho("Parsing failed. Cannot generate "+
                     "semantic analysis.\n(Is your input valid? " + 
                     "Did you provide a Language Specification file?)")
        
+    elif inp == "\\reload" or inp == "\\r":
+        _reload_cfg(cfg)
+
+    elif inp.strip()[0:4] == "\\use":
+        _switch_grammar(inp.strip()[4:].strip(), workspace)
+
+    elif inp == "\\grammars" or inp == "\\gs":
+        _show_grammars(workspace)
+
     elif inp == "\\show cfg" or inp == "\\cfg":
         cfg.show_contents()
 
@@ -429,12 +634,21 @@ def _process_command(inp, cfg, spec) -> None:
         else:
             display.fail_secho("No Language Specification file provided.")
 
+    elif inp.strip()[0:5] == "\\cost":
+        _show_cost(inp.strip()[5:].strip(), cfg, spec)
+
     elif inp.strip()[0:2] == "\\c" or inp == "\\config":
         if inp.strip()[0:2] == "\\c" and inp.strip()[0:7] != "\\config":
             config.edit_config(inp.strip()[2:].strip())
         else:
             config.edit_config(inp.strip()[7:].strip())
 
+    elif inp[0:5] == "\\lalr":
+        if inp[5:].strip() == "":
+            error.ERR_no_input_given()
+        else:
+            _init_parsing_lalr(inp[5:].strip(), cfg, spec)
+
     elif inp[0:4] == "\\ll1":
         code = _prepare_to_parse(cfg)
         if code == AMBIGUOUS_ERROR:
@@ -2,19 +2,15 @@
 # kitchen/context_free_grammar.py
 
 import configparser
-from itertools import chain
 from pathlib import Path
 import re
 from typing import Dict
-import manim as m
 import typer
 
 from kitchen import (
-    CFG_FILE_ERROR,
     ERROR, 
-    SUCCESS, RE_TERMINAL, 
-    RE_NONTERMINAL, 
-    RE_PRODUCTION
+    SUCCESS,
+    RE_NONTERMINAL
 )
 
 from kitchen.helpers import (
@@ -23,7 +19,18 @@ from kitchen.helpers import (
 )
 
 from kitchen.backend import (
-    parse_table as pt
+    parse_table as pt,
+    grammar_ir as gir,
+    bitset as bs,
+    first_set as fs,
+    follow_set as fw,
+    incremental as inc,
+    lalr_table as lt,
+    health as hl,
+    matrix_sets as ms,
+    normalise as nm,
+    predict_set as ps,
+    prune as pr
 )
 
 def get_cfg_path(config_file: Path) -> Path:
@@ -36,12 +43,97 @@ def get_cfg_path(config_file: Path) -> Path:
     config_parser.read(config_file)
     return Path(config_parser["General"]["cfg_path"])
 
-def get_prods(cfg_contents) -> list:
+# a symbol followed by an EBNF operator, such as STMT* or id?
+RE_EBNF = r'^([a-z]+|[A-Z]+)([*+?])$'
+
+# suffixes of the non-terminals which EBNF operators are compiled to
+REPEAT_SUFFIX = "REP"
+OPTION_SUFFIX = "OPT"
+
+def _expand_ebnf(prods, loops) -> list:
+    """Compiles the EBNF operators of a CFG into helper non-terminals. X*
+       becomes H, where H -> X H | #, X+ becomes X H, and X? becomes H,
+       where H -> X | #. Each symbol and operator shares one helper.
+
+    Args:
+        prods (list): Productions, which may use EBNF operators.
+        loops (set): Filled with the helper non-terminals, which the LL(1)
+        parser runs as loops rather than as nested non-terminals.
+
+    Returns:
+        list: Productions without EBNF operators.
+    """
+    used = {s for nt, bodies in prods for s in [nt] + " ".join(bodies).split()}
+    helpers = {}
+    expanded = []
+    helper_prods = []
+    for nt, bodies in prods:
+        new_bodies = []
+        for body in bodies:
+            # bodies without EBNF operators keep their text as it was
+            if not any(re.match(RE_EBNF, s) for s in body.split()):
+                new_bodies.append(body)
+                continue
+            symbols = []
+            for s in body.split():
+                match = re.match(RE_EBNF, s)
+                if match is None:
+                    symbols.append(s)
+                    continue
+                symbol, op = match.groups()
+                kind = OPTION_SUFFIX if op == "?" else REPEAT_SUFFIX
+                if (symbol, kind) not in helpers:
+                    name = symbol.upper() + kind
+                    while name in used:
+                        name = name + "X"
+                    used.add(name)
+                    helpers[(symbol, kind)] = name
+                    loops.add(name)
+                    if kind == REPEAT_SUFFIX:
+                        helper_prods.append([name, [symbol + " " + name,
+                            "#"]])
+                    else:
+                        helper_prods.append([name, [symbol, "#"]])
+                if op == "+":
+                    symbols.append(symbol)
+                symbols.append(helpers[(symbol, kind)])
+            new_bodies.append(" ".join(symbols))
+        expanded.append([nt, new_bodies])
+    return expanded + helper_prods
+
+def find_format_errors(cfg_contents) -> list:
+    """Checks that each line of a CFG is a production, without reporting
+       anything, so that contents from elsewhere than a CFG file can be
+       checked before they are compiled.
+
+    Args:
+        cfg_contents (str): Contents of a CFG.
+
+    Returns:
+        list: Descriptions of the lines which are not productions.
+    """
+    errors = []
+    cfg_list = list(filter(None, cfg_contents.split("\n")))
+    if cfg_list == []:
+        errors.append("The CFG has no productions.")
+    for line, production in enumerate(cfg_list):
+        pps = list(filter(None, production.split("->")))
+        if pps == [] or not re.match(RE_NONTERMINAL, pps[0]):
+            errors.append("CFG Error at line " + str(line) + ". " +
+                " Unexpected non-terminal format" + "".join(pps[:1]))
+        elif len(pps) != 2 or list(filter(None, pps[1].split("|"))) == []:
+            errors.append("CFG Error at line " + str(line) + ". " +
+                " Expected a non-terminal, -> and its productions.")
+    return errors
+
+def get_prods(cfg_contents, loops = None) -> list:
     """Obtains a list of productions given the contents of a CFG.
 
     Args:
         cfg_contents (String): Contents of the CFG as obtained at the 
         provided path.
+        loops (set, optional): Filled with the helper non-terminals which
+        EBNF operators are compiled to. Defaults to None.
 
     Returns:
         List: Productions in a given CFG.
@@ -78,71 +170,67 @@ def get_prods(cfg_contents) -> list:
         tmp_prod.append(groups)
         prods.append(tmp_prod)
         line = line + 1
-    return prods
-
-def populate_manim_cfg(cfg_dict, lead_to) -> Dict:
-    """Returns an equivalent cfg in manim where each production has its 
-       associated set of MObjects.
-
-    Args:
-        cfg_dict (Dictionary): Dictionary of the CFG productions.
-        lead_to (Dictionary): Dictionary holding the Mobjects for each 
-                              CFG element.
-
-    Raises:
-        typer.Abort: If Left Recursion is detected, the app session is 
-                     terminated.
-
-    Returns:
-        Dictionary: A dictionary of the Mobjects which a non-terminal leads to.
-    """    
-    manim_cfg = {}
-    try:
-        for index, key in enumerate(cfg_dict.keys(), start=0):
-            # append the text of the leading NT
-            manim_cfg[key] = [m.Text(key, weight=m.BOLD)]
-
-            # make a list of sub-productions which are led to by this NT
-            tmp_item = []
-            for i, item in enumerate(lead_to[index], start=0):
-                split_item = list(filter(None, re.findall(
-                    RE_PRODUCTION, item)))
-                tmp_split_list = []
-                for j, specific in enumerate(split_item, start=0):
-                    # gets manim equivalent of this text
-                    if specific == "#":
-                        tmp_split_list.append(
-                            m.Text("ε", weight=m.BOLD, slant=m.ITALIC))
-                    else:
-                        tmp_split_list.append(
-                            m.Text(specific, weight=m.BOLD, slant=m.ITALIC))
-                tmp_item.append(tmp_split_list)
-
-            # append this list of manim productions to the manim cfg dictionary
-            manim_cfg[key].append(tmp_item)
-        return manim_cfg
-    except:
-        error.ERR_left_recursion_detected()
-        return CFG_FILE_ERROR
+    return _expand_ebnf(prods, set() if loops is None else loops)
 
 class ContextFreeGrammar:
 
-    def __init__(self, cfg_path: Path) -> None:
+    def __init__(self, cfg_path: Path, prune = False) -> None:
         """Initialises the ContextFreeGrammar object.
 
         Args:
             cfg_path (Path): Path to the provided CFG file.
+            prune (bool, optional): Removes unproductive and unreachable 
+            non-terminals before analysis. Defaults to False.
         """
         # set up the cfg information
         self._cfg_path = cfg_path
-        self.cfg_contents = cfg_path.read_text()
-        self.prods = get_prods(self.cfg_contents)
+        self._mtime = cfg_path.stat().st_mtime
+        self._load(cfg_path.read_text(), prune)
+
+    @classmethod
+    def from_contents(cls, cfg_contents, prune = False):
+        """Creates a ContextFreeGrammar from the contents of a CFG, without
+           a CFG file. It is never reloaded.
+
+        Args:
+            cfg_contents (str): Contents of the CFG, as in a CFG file.
+            prune (bool, optional): Removes unproductive and unreachable 
+            non-terminals before analysis. Defaults to False.
+
+        Returns:
+            ContextFreeGrammar: Loaded CFG.
+        """
+        cfg = cls.__new__(cls)
+        cfg._cfg_path = None
+        cfg._mtime = None
+        cfg._load(cfg_contents, prune)
+        return cfg
+
+    def _load(self, cfg_contents, prune) -> None:
+        """Compiles the contents of a CFG and sets up its structures.
+
+        Args:
+            cfg_contents (str): Contents of the CFG.
+            prune (bool): Removes useless non-terminals.
+        """
+        self._prune = prune
+        self.cfg_contents = cfg_contents
+        # helper non-terminals of EBNF operators
+        self.loops = set()
+        self.prods = get_prods(self.cfg_contents, self.loops)
         self.is_ambiguous = False
 
+        # non-terminals removed by pruning
+        self.unproductive = []
+        self.unreachable = []
+        if prune and self.prods != None:
+            self.prods, self.unproductive, self.unreachable = pr.prune(
+                self.prods)
+
         # initialise the stuctures of the cfg
         if self.prods != None:
+            self.ir = gir.GrammarIR(self.prods)
             self._init_structures()
-            self.manim_cfg = populate_manim_cfg(self.cfg_dict, self.lead_to)
         else:
             self.prods = ERROR
 
@@ -157,25 +245,41 @@ class ContextFreeGrammar:
         # structures for first set
         self.first_set = {}
         self.first_set_calculated = False
-        self.manim_firstset_contents = {}
-        self.manim_firstset_lead = {}
         self.firstset_index = {}
         self.fstack = []
+        # bitmask first sets of the engines, and the production of each entry
+        self.first_bits = None
+        self.first_prods = None
 
         # structures for follow set
         self.follow_set = {}
         self.follow_set_calculated = False
-        self.manim_followset_contents = {}
-        self.manim_followset_lead = {}
         self.vis_has_epsilon = False
+        self.follow_bits = None
 
         # structures for parsetable
         self.parsetable = {}
         self.parsetable_calculated = False
+        self.parsetable_code = None
 
         # structures for the LL(1) parser
         self.parser_ll1 = None
         self.is_parser_ll1_set_up = False
+
+        # structures for the LALR(1) parser
+        self.lalr_table = None
+        self.parser_lalr = None
+
+        # problems found before any analysis
+        self.health = None
+
+        # set on a CFG obtained from `normalise`, to fold its parse trees 
+        # back to the original CFG
+        self.folding = None
+        self.rewrites = []
+
+        # manim objects are only created once a visualisation needs them
+        self._vis = None
         
         # assigns initial values to these structures
         self._assign_structures()
@@ -193,36 +297,180 @@ class ContextFreeGrammar:
             self.cfg_dict[p_seq[0]] = p_seq[1]
 
             self.first_set[p_seq[0]] = []
-            self.manim_firstset_contents[p_seq[0]] = m.VGroup()
             self.firstset_index[p_seq[0]] = []
-
             self.follow_set[p_seq[0]] = []
-            self.manim_followset_contents[p_seq[0]] = m.VGroup()
-            self.manim_followset_lead[p_seq[0]] = None
 
             self.nonterminals.append(p_seq[0])
             self.lead_to.append(p_seq[1])
 
-        # get all lead-to elements in a list
-        tmp = []
-        for t in list(chain(*self.lead_to)):
-            splitp = list(filter(None, re.findall(RE_PRODUCTION, t)))
-            tmp.append(splitp)
-
         # add only terminals to list, as well as create empty follow set 
-        # for them
-        # append $ to terminals by default
-        self.terminals.append("$")
-        for t in set(list(chain(*tmp))):
-            if re.match(RE_TERMINAL, t) and t != "#":
-                self.terminals.append(t)
-                self.follow_set[t] = []
-                self.manim_followset_contents[t] = m.VGroup()
-
+        # for them. $ is always the first terminal of the compiled CFG
+        self.terminals = self.ir.names(self.ir.terminals)
+        for t in self.terminals[1:]:
+            self.follow_set[t] = []
 
         # set start symbol
         self.start_symbol = list(self.cfg_dict.keys())[0]
 
+    @property
+    def vis(self):
+        """Obtains the manim objects used to visualise this CFG, creating
+           them on first use.
+
+        Returns:
+            ManimCFG: Visualisation state of the CFG.
+        """
+        if self._vis is None:
+            # imported here so that analysing a CFG never builds Mobjects
+            from kitchen.manim import m_cfg
+            self._vis = m_cfg.ManimCFG(self.ir)
+        return self._vis
+
+    def __getstate__(self) -> Dict:
+        """Excludes the visualisation state when pickling the CFG.
+
+        Returns:
+            dict: Picklable attributes.
+        """
+        state = self.__dict__.copy()
+        state["_vis"] = None
+        return state
+
+    def has_changed(self) -> bool:
+        """Checks whether the CFG file has been modified since it was loaded.
+
+        Returns:
+            bool: True if the file has changed.
+        """
+        if self._cfg_path is None:
+            return False
+        try:
+            return self._cfg_path.stat().st_mtime != self._mtime
+        except OSError:
+            return False
+
+    def reload(self) -> tuple:
+        """Re-reads the CFG file and patches this ContextFreeGrammar in place.
+           Only the first sets, follow sets and parse table rows which can 
+           reach an edited production are recalculated.
+
+        Raises:
+            ValueError: If the CFG has no file, the file cannot be read, or
+            a line of it is not a production. The CFG is left as it was.
+
+        Returns:
+            tuple: Names of the changed non-terminals, and of those whose 
+            first sets, follow sets and parse table rows were recalculated.
+        """
+        if self._cfg_path is None:
+            raise ValueError("The CFG was not loaded from a file, so there " +
+                "is nothing to reload.")
+        try:
+            mtime = self._cfg_path.stat().st_mtime
+            contents = self._cfg_path.read_text()
+        except OSError as e:
+            raise ValueError("Could not read " + str(self._cfg_path) + 
+                ".") from e
+        errors = find_format_errors(contents)
+        if errors != []:
+            # the same edit is not reported again on every input
+            self._mtime = mtime
+            raise ValueError("\n".join(errors))
+
+        old_ir = self.ir
+        old_first, old_index = self.first_set, self.firstset_index
+        old_follow, old_table = self.follow_set, self.parsetable
+        had_first = self.first_set_calculated
+        had_follow = self.follow_set_calculated and had_first
+        had_table = self.parsetable_calculated and had_follow
+
+        self._mtime = mtime
+        self.cfg_contents = contents
+        self.loops = set()
+        self.prods = get_prods(self.cfg_contents, self.loops)
+        if self._prune:
+            self.prods, self.unproductive, self.unreachable = pr.prune(
+                self.prods)
+        self.ir = gir.GrammarIR(self.prods)
+        self._init_structures()
+
+        self.nullable = fs.calculate_nullable(self.ir)
+        old_nullable = {nt for nt, items in old_first.items() if "#" in items}
+        changed, first_stale, follow_stale, rows = inc.invalidated(old_ir, 
+            self.ir, old_nullable, self.nullable)
+        if not had_first:
+            return changed, set(), set(), set()
+
+        # keep every first set which does not reach an edited production
+        known = {}
+        for name in self.ir.names(self.ir.nonterminals):
+            if name in first_stale or name not in old_first:
+                first_stale.add(name)
+                continue
+            index = {}
+            for j, t in enumerate(old_first[name]):
+                if t != "#" and j < len(old_index[name]):
+                    index[self.ir.ids.get(t)] = self.ir.prod_ids.get(
+                        old_index[name][j])
+            if None in index or None in index.values():
+                first_stale.add(name)
+                continue
+            known[self.ir.ids[name]] = (bs.from_ids(index.keys()), index)
+
+        self.first_bits, self.first_prods, conflicts = fs.calculate_first_set(
+            self.ir, self.nullable, known)
+        self.is_ambiguous = conflicts != set()
+        first_set, firstset_index = fs.to_named_sets(self.ir, self.first_bits, 
+            self.first_prods, self.nullable)
+        for name in first_set.keys():
+            if name in first_stale:
+                self.first_set[name] = first_set[name]
+                self.firstset_index[name] = firstset_index[name]
+            else:
+                self.first_set[name] = old_first[name]
+                self.firstset_index[name] = old_index[name]
+        self.first_set_calculated = True
+        rows |= first_stale
+
+        if not had_follow:
+            return changed, first_stale, set(), set()
+
+        known = {}
+        for name in self.ir.names(self.ir.nonterminals):
+            if name in follow_stale or name not in old_follow or \
+                any(t not in self.ir.ids for t in old_follow[name]):
+                follow_stale.add(name)
+            else:
+                known[self.ir.ids[name]] = bs.from_ids(
+                    self.ir.ids[t] for t in old_follow[name])
+        self.follow_bits = fw.calculate_follow_set(self.ir, self.first_bits, 
+            self.nullable, known)
+        follow_set = fw.to_named_sets(self.ir, self.follow_bits)
+        for name in follow_set.keys():
+            self.follow_set[name] = follow_set[name] if name in \
+                follow_stale else old_follow[name]
+        self.follow_set_calculated = True
+        rows |= follow_stale
+
+        if not had_table or self.is_ambiguous:
+            return changed, first_stale, follow_stale, set()
+
+        # reuse the rows of the previous table if its columns are unchanged
+        self.setup_parsetable()
+        if set(old_table.ts) == set(self.parsetable.ts):
+            for name in self.parsetable.nts:
+                if name not in rows and name in old_table.pt_dict:
+                    self.parsetable.pt_dict[name] = dict(
+                        old_table.pt_dict[name])
+                else:
+                    rows.add(name)
+            code = self.parsetable.update_rows(rows)
+        else:
+            rows = set(self.parsetable.nts)
+            code = self.parsetable.populate_table()
+        self.parsetable_calculated = code == SUCCESS
+        return changed, first_stale, follow_stale, rows
+
     def get_next_production(self, first_set) -> int:
         """Helper function to get the index of the first-encountered 
            production with an empty first set.
@@ -258,15 +506,27 @@ class ContextFreeGrammar:
     def show_first_set_testing(self) -> None:
         """Drives tests of the first set calculation.
         """        
-        self._calculate_first_set(self.start_symbol, [])
-        self._clean_first_set()
-        display.general_secho(self.first_set) 
+        if not self.first_set_calculated:
+            self.reset_first_set()
+
+        # epsilons are shown last, without reordering the calculated sets
+        cleaned = {}
+        for key, items in self.first_set.items():
+            cleaned[key] = [i for i in items if i != "#"]
+            if "#" in items:
+                cleaned[key].append("#")
+        display.general_secho(cleaned) 
 
     def reset_first_set(self, calculate_again = True) -> None:
         """Resets the first sets in preparation for another calculation.
         """        
         self.first_set = {}
 
+        # state left over from a previous calculation changes the result
+        self.fstack = []
+        self.vis_has_epsilon = False
+        self.is_ambiguous = False
+
         # resets structures
         for p_seq in self.prods:
             self.first_set[p_seq[0]] = []
@@ -298,22 +558,19 @@ class ContextFreeGrammar:
         # if production does not have a first set
         try:
             # loop through values which a production leads to
-            for p in self.cfg_dict[production]:
-             #   display.structure_secho(production + " leads to " + p)
+            for pid in self.ir.productions_of(production):
+                rhs = self.ir.rhs(pid)
 
                 # add the appended production to fstack
-                self.fstack.append(production + " -> " + p)
+                self.fstack.append(self.ir.prod_strings[pid])
 
                 # if a production is/ starts with a non-terminal
-                if p in self.cfg_dict or p[0].isupper():
+                if self.ir.kinds[rhs[0]] == gir.NONTERMINAL:
                     # find all the productions which are led by a non-terminal
-                    p_nt = list(
-                        filter(None, re.findall(RE_PRODUCTION, p)))
-
-                    for index, item in enumerate(p_nt, start=0):
-                        current_item = item.strip()
+                    for index, sid in enumerate(rhs, start=0):
+                        current_item = self.ir.symbols[sid]
                         # if a terminal is encountered after the list
-                        if re.match(RE_TERMINAL, current_item):
+                        if self.ir.kinds[sid] != gir.NONTERMINAL:
                             for j, ps in enumerate(pstack, start=0):
                                 # add First(Y) - #
                                 if current_item not in self.first_set[ps]:
@@ -349,7 +606,7 @@ class ContextFreeGrammar:
                                 # in the middle of recursion)
                                 # 4) we are not the LAST production 
                                 if not had_eps and has_eps and len(pstack) \
-                                    == 1 and index != len(p_nt) - 1:
+                                    == 1 and index != len(rhs) - 1:
                                     self.first_set[production].remove("#")
                             
                                 if not self.vis_has_epsilon:
@@ -358,10 +615,9 @@ class ContextFreeGrammar:
                     
                 else:
                     # if a production starts with a terminal
-                    first_terminal = list(
-                        filter(None, re.findall(RE_TERMINAL, p)))
+                    first_terminal = self.ir.symbols[rhs[0]]
 
-                    if first_terminal[0] == "#":
+                    if first_terminal == "#":
                         # the non-terminal which led to this may disappear 
                         # in the original production
                         self.vis_has_epsilon = True
@@ -369,9 +625,9 @@ class ContextFreeGrammar:
                         # non-terminals
                     for j, ps in enumerate(pstack, start=0):
                         # add First(P) - # if down the stack
-                        if first_terminal[0] not in self.first_set[ps]:
+                        if first_terminal not in self.first_set[ps]:
                             self.firstset_index[ps].append(self.fstack[j])
-                            self.first_set[ps].append(first_terminal[0]) 
+                            self.first_set[ps].append(first_terminal) 
                         else:
                     #        display.info_secho("1")
                             self.is_ambiguous = True
@@ -393,6 +649,107 @@ class ContextFreeGrammar:
         except KeyError:
             error.ERR_key_not_given_in_CFG(production)
 
+    def calculate_first_set_worklist(self) -> None:
+        """Calculates the first set with the iterative worklist engine, which
+           does not recurse and does not depend on the order of the CFG. The
+           sets are kept as bitmasks until `materialise_sets` is called.
+        """
+        self.nullable = fs.calculate_nullable(self.ir)
+        self.first_bits, self.first_prods, conflicts = \
+            fs.calculate_first_set(self.ir, self.nullable)
+        self.is_ambiguous = conflicts != set()
+        self.follow_bits = None
+
+    def calculate_follow_set_worklist(self) -> None:
+        """Calculates the follow set as bitmasks, along with the first set 
+           if it has not been calculated by the worklist engine yet.
+        """
+        if self.first_bits is None:
+            self.calculate_first_set_worklist()
+        self.follow_bits = fw.calculate_follow_set(self.ir, self.first_bits, 
+            self.nullable)
+
+    def calculate_sets_matrix(self) -> None:
+        """Calculates the first and follow sets with the boolean matrix
+           engine, which suits CFGs with thousands of symbols. The sets are 
+           kept as bitmasks, as with the worklist engine, until 
+           `materialise_sets` is called.
+        """
+        self.nullable = fs.calculate_nullable(self.ir)
+        engine = ms.MatrixSets(self.ir, self.nullable)
+        self.first_bits = engine.to_masks(engine.calculate_first_set())
+        self.first_prods = engine.first_index(self.first_bits)
+        self.is_ambiguous = fs.find_conflicts(self.ir, self.first_bits, 
+            self.nullable) != set()
+        self.follow_bits = engine.to_masks(engine.calculate_follow_set())
+
+    def materialise_sets(self) -> None:
+        """Converts the bitmask first and follow sets into the ordered lists
+           used by the parse table, the visualisations and the display.
+        """
+        if self.first_bits is None:
+            self.calculate_first_set_worklist()
+        self.first_set, self.firstset_index = fs.to_named_sets(self.ir, 
+            self.first_bits, self.first_prods, self.nullable)
+        self.first_set_calculated = True
+        if self.follow_bits is not None:
+            self.follow_set = fw.to_named_sets(self.ir, self.follow_bits)
+            self.follow_set_calculated = True
+
+    def show_first_set_worklist_testing(self) -> None:
+        """Drives tests of the worklist first set calculation.
+        """
+        self.calculate_first_set_worklist()
+        self.materialise_sets()
+        display.general_secho(self.first_set)
+
+    def show_sets_matrix_testing(self, follow = False) -> None:
+        """Drives tests of the boolean matrix set calculation.
+
+        Args:
+            follow (bool, optional): Shows the follow set rather than the 
+            first set. Defaults to False.
+        """
+        self.calculate_sets_matrix()
+        self.materialise_sets()
+        if follow:
+            typer.echo(self.follow_set)
+        else:
+            display.general_secho(self.first_set)
+
+    def show_follow_set_worklist_testing(self) -> None:
+        """Drives tests of the worklist follow set calculation.
+        """
+        self.calculate_follow_set_worklist()
+        self.materialise_sets()
+        typer.echo(self.follow_set)
+
+    def compare_first_set_engines(self) -> Dict:
+        """Calculates the first set with both the recursive walker and the
+           worklist engine, and reports where they disagree. The worklist 
+           result is kept.
+
+        Returns:
+            dict: {NT: (walker set, worklist set)} for each non-terminal 
+            whose first sets differ. The walker set is None if it failed.
+        """
+        try:
+            self.reset_first_set()
+            self._clean_first_set()
+            walker = {k: list(v) for k, v in self.first_set.items()}
+        except RecursionError:
+            walker = None
+
+        self.calculate_first_set_worklist()
+        self.materialise_sets()
+        differences = {}
+        for key in self.first_set.keys():
+            if walker is None:
+                differences[key] = (None, self.first_set[key])
+            elif set(walker[key]) != set(self.first_set[key]):
+                differences[key] = (walker[key], self.first_set[key])
+        return differences
+
     def _clean_first_set(self) -> None:
         """Helper function to standardise the appearance of the first set by 
            placing epsilons at the end of the list.
@@ -417,10 +774,12 @@ class ContextFreeGrammar:
     def show_follow_set_testing(self) -> None:
         """Displays the calculated follow sets for each non-terminal.
         """        
-        self._calculate_follow_set(True)
+        if not self.follow_set_calculated:
+            self._calculate_follow_set(True)
+            self.follow_set_calculated = True
         nt_follow = {}
         for key in self.follow_set.keys():
-            if re.match(RE_NONTERMINAL, key):
+            if self.ir.is_nonterminal(key):
                 nt_follow[key] = self.follow_set[key]
         typer.echo(nt_follow)
 
@@ -432,16 +791,9 @@ class ContextFreeGrammar:
         for p_seq in self.prods:
             self.follow_set[p_seq[0]] = []
 
-        # obtains the productions
-        tmp = []
-        for t in list(chain(*self.lead_to)):
-            splitp = list(filter(None, re.findall(RE_PRODUCTION, t)))
-            tmp.append(splitp)
-
         # creates an empty follow set for the terminals
-        for t in set(list(chain(*tmp))):
-            if re.match(RE_TERMINAL, t) and t != "#":
-                self.follow_set[t] = []
+        for t in self.terminals[1:]:
+            self.follow_set[t] = []
 
         if calculate_again:
             # calculates the follow set
@@ -462,10 +814,10 @@ class ContextFreeGrammar:
                 is_start_symbol = False
 
             # inspect each element in the production
-            for p in self.cfg_dict[production]:
+            for pid in self.ir.productions_of(production):
 
-                # split up the productions which are contained within this list
-                pps = list(filter(None, re.findall(RE_PRODUCTION, p)))
+                # the symbols of this production
+                pps = self.ir.names(self.ir.rhs(pid))
 
                 # examine each production and obtain follow sets
                 for index, item in enumerate(pps, start=0):
@@ -481,7 +833,7 @@ class ContextFreeGrammar:
                         next_item = pps[index + 1]
                         # if an item is directly followed by a terminal, it is
                         #  appended to its follow set
-                        if re.match(RE_TERMINAL, next_item):
+                        if not self.ir.is_nonterminal(next_item):
                             if next_item not in self.follow_set[item]:
                                 self.follow_set[item].append(next_item)
                         else:
@@ -506,68 +858,66 @@ class ContextFreeGrammar:
                                                 self.follow_set[item]\
                                                     .append(production)
                                         else:
-                                            self.follow_set[item]\
-                                                .append(next_item)
+                                            # the rest of the production 
+                                            # follows item instead
+                                            rest, rest_nullable = self.\
+                                                first_of_rest(pps, index + 2)
+                                            for r in rest:
+                                                if r not in \
+                                                    self.follow_set[item]:
+                                                    self.follow_set[item]\
+                                                        .append(r)
+                                            if rest_nullable and production \
+                                                not in self.follow_set[item]:
+                                                self.follow_set[item]\
+                                                    .append(production)
                           
         # clean the follow set
-        start_symbol = list(self.cfg_dict.keys())[0]
-        is_cleaned = []
-        is_cleaned = self.get_reset_cleaned_set()
-        self.clean_follow_set(start_symbol, [], is_cleaned)
+        self.resolve_follow_set()
 
-    def get_reset_cleaned_set(self) -> Dict:
-        """Obtains a dictionary which holds whether or not the follow sets 
-        have been cleaned.
+    def first_of_rest(self, pps, start) -> tuple:
+        """Obtains the terminals which may begin the remainder of a production.
 
-        Returns:
-            dict: Contains {NT: False} for each non-terminal NT.
-        """        
-        tmp_c = {}
-        for fc in self.follow_set.keys():
-            tmp_c[fc] = False
-        return tmp_c
+        Args:
+            pps (list): Symbols of the production.
+            start (int): Index at which the remainder begins.
 
-    def clean_follow_set(self, start, pstack, is_cleaned) -> None:
+        Returns:
+            tuple: Terminals in order of appearance, and whether the whole 
+            remainder may derive epsilon.
+        """
+        rest = []
+        for p in pps[start:]:
+            if not self.ir.is_nonterminal(p):
+                if p != "#":
+                    rest.append(p)
+                    return rest, False
+                continue
+            for t in self.first_set[p]:
+                if t != "#" and t not in rest:
+                    rest.append(t)
+            if "#" not in self.first_set[p]:
+                return rest, False
+        return rest, True
+
+    def resolve_follow_set(self) -> None:
         """Cleans the follow set after the calculation: Replaces non-terminals 
-           with their respective follow sets and removes epsilon elements. 
+           with their respective follow sets. Each placeholder is an inclusion
+           Follow(NT) within Follow(X), and the closure over these inclusions 
+           is found in a single pass over their strongly connected components.
+        """
+        def initial(key):
+            return [i for i in self.follow_set[key] if not 
+                self.ir.is_nonterminal(i)]
+
+        def relation(key):
+            return [i for i in self.follow_set[key] if i != key and 
+                i in self.follow_set and self.ir.is_nonterminal(i)]
+
+        keys = list(self.follow_set.keys())
+        resolved = fw.digraph(keys, relation, initial, fw.ordered_union)
+        self.follow_set = {key: resolved[key] for key in keys}
 
-        Args:
-            start (String): The start symbol.
-            pstack (List): Production stack. 
-        """      
-        tmp_nts = []
-        pstack.append(start)
-
-        # clean up the sets
-        items = self.follow_set[start]
-
-        # loop through the items in a given follow set and replace 
-        # non-terminals with their associated follow sets
-        for item in items:
-            # we have an item in the set
-            if re.match(RE_NONTERMINAL, item):
-                # temporarily remove the non-terminal from the list to 
-                # prevent recursion
-                items.remove(item)
-                tmp_nts.append(item)
-                self.clean_follow_set(item, pstack, is_cleaned)
-            else:
-                # we append the descended terminals to the upwards stacks
-                for p in pstack:
-                    if p != start and item not in self.follow_set[p]:
-                        self.follow_set[p].append(item)
-
-        is_cleaned[start] = True
-
-        if len(pstack) == 1:
-            pstack = []
-            # gets the next not cleaned set
-            for c in is_cleaned.keys():
-                if is_cleaned[c] == False:
-                    self.clean_follow_set(c, pstack, is_cleaned)
-        else:
-            pstack.pop()
-    
     def set_parser_ll1(self, parser) -> int:
         """Sets the CFG's internal parser. 
 
@@ -579,6 +929,70 @@ class ContextFreeGrammar:
         self.is_parser_ll1_set_up = True
         return SUCCESS
 
+    def get_health(self):
+        """Obtains the health report of the CFG, checking it on first use.
+           This takes time linear in the size of the CFG, so it is safe to
+           run before any analysis.
+
+        Returns:
+            Health: Undefined non-terminals, cycles, left recursion and 
+            useless non-terminals of the CFG.
+        """
+        if self.health is None:
+            self.health = hl.Health(self.ir)
+        return self.health
+
+    def normalise(self, output_path = None):
+        """Eliminates the left recursion of the CFG and left factors it, 
+           so that a CFG which is nearly LL(1) gets a parse table. The 
+           rewritten CFG is written out and loaded.
+
+        Args:
+            output_path (Path, optional): Path to write the rewritten CFG 
+            to. Defaults to None, which writes it beside this CFG.
+
+        Raises:
+            ValueError: If the CFG has undefined non-terminals or cycles.
+
+        Returns:
+            ContextFreeGrammar: Rewritten CFG, whose `folding` builds parse 
+            trees of this CFG from its derivations.
+        """
+        prods, folding, rewrites = nm.normalise(self.prods)
+        if output_path is None:
+            output_path = self._cfg_path.with_name(self._cfg_path.stem + 
+                nm.NORMALISED_SUFFIX + self._cfg_path.suffix)
+        nm.write_cfg(prods, Path(output_path))
+
+        normalised = ContextFreeGrammar(Path(output_path))
+        normalised.folding = folding
+        normalised.rewrites = rewrites
+        return normalised
+
+    def get_lalr_table(self):
+        """Obtains the LALR(1) table of the CFG, generating it with PLY on
+           first use. The table is kept with the CFG, so it is cached along 
+           with it.
+
+        Returns:
+            LALRTable: LALR(1) action and goto tables.
+        """
+        if self.lalr_table is None:
+            self.lalr_table = lt.LALRTable(self.ir)
+        return self.lalr_table
+
+    def set_parser_lalr(self, parser) -> int:
+        """Sets the CFG's internal LALR(1) parser. 
+
+        Args:
+            parser (ParserLALR): ParserLALR Object
+
+        Returns:
+            int: Status code.
+        """
+        self.parser_lalr = parser
+        return SUCCESS
+
     def setup_parsetable(self) -> int:
         """Sets the CFG's internal parse table.
 
@@ -589,8 +1003,22 @@ class ContextFreeGrammar:
             self.cfg_dict)
         self.parsetable.set_internals(
                 self.first_set, self.follow_set, self.firstset_index)
+        self.parsetable.set_predict(self.ir, ps.calculate_predict_sets(self.ir))
         return SUCCESS
 
+    def find_ll1_conflicts(self) -> list:
+        """Builds the parse table, even for an ambiguous CFG, and collects 
+           every conflicting cell in a single pass.
+
+        Returns:
+            list: (non-terminal, terminal, productions) triples.
+        """
+        self.setup_parsetable()
+        conflicts = self.parsetable.build_table()
+        self.parsetable_calculated = True
+        self.parsetable_code = ERROR if conflicts != [] else SUCCESS
+        return conflicts
+
     def calculate_parsetable(self) -> int:
         """Calculates the parse table.
 
@@ -599,4 +1027,5 @@ class ContextFreeGrammar:
         """        
         code = self.parsetable.populate_table()
         self.parsetable_calculated = True
+        self.parsetable_code = code
         return code
\ No newline at end of file
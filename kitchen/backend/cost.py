@@ -0,0 +1,294 @@
+""" Predicts the size of an analysis and the cost of animating it. """
+# kitchen/backend/cost.py
+
+import configparser
+
+from kitchen import (
+    CFG_WRITE_ERROR,
+    SUCCESS
+)
+
+from kitchen.helpers import (
+    config,
+    sounds
+)
+
+from kitchen.backend import (
+    grammar_ir as gir,
+    parser as p
+)
+
+CALIBRATION_FILE_PATH = config.CONFIG_DIR_PATH / "calibration.ini"
+
+# qualities of `config._set_quality`, from fastest to slowest
+QUALITIES = ["low_quality", "medium_quality", "high_quality"]
+
+# seconds to render one animation at each quality, until runs are measured
+DEFAULT_SECONDS = {
+    "low_quality": 0.6,
+    "medium_quality": 1.8,
+    "high_quality": 5.0
+}
+
+# renders predicted to take longer than this many seconds are warned about
+WARNING_SECONDS = 60
+
+# each narration waits twice, which adds about this share of animations
+NARRATION_FACTOR = 1.3
+
+# animations of each scene, as a constant plus a number per unit of each
+# feature. They are read from the calls to `play` and `wait` of the scenes,
+# including those of `display_msg`, and are scaled by measured runs
+PRIORS = {
+    config.FIRST_SET: {"base": 10, "nonterminals": 6, "walk": 5},
+    config.FOLLOW_SET: {"base": 12, "nonterminals": 4, "symbols": 6},
+    config.PARSETABLE: {"base": 5, "nonterminals": 1, "first_entries": 7,
+        "epsilon_entries": 6},
+    config.LL1_PARSING: {"base": 24, "expansions": 7, "pushed": 3,
+        "matches": 6},
+    config.TYPE_CHECK: {"base": 20, "nodes": 4}
+}
+
+# names of the scenes in the calibration file
+SCENE_NAMES = {
+    config.FIRST_SET: "first",
+    config.FOLLOW_SET: "follow",
+    config.PARSETABLE: "parsetable",
+    config.LL1_PARSING: "parsing",
+    config.TYPE_CHECK: "semantic"
+}
+
+# scenes which animate the parsing of an input
+INPUT_SCENES = [config.LL1_PARSING, config.TYPE_CHECK]
+
+def measure(cfg, inp = "", spec = None) -> dict:
+    """Counts the features of a CFG, and of an input, which the work of each
+       scene grows with. The first and follow sets must be calculated. An
+       input is only parsed if the parse table was built without conflicts.
+
+    Args:
+        cfg (ContextFreeGrammar): Analysed CFG.
+        inp (str, optional): Input string. Defaults to "".
+        spec (Specification, optional): Language specification. Defaults to
+        None.
+
+    Returns:
+        dict: Counts of each feature. Those of the input are None if it was
+        not given or is rejected, or the CFG is not LL(1).
+    """
+    ir = cfg.ir
+    nullable = {nt for nt, items in cfg.first_set.items() if
+        gir.EPSILON_SYMBOL in items}
+
+    # symbols the first set walker visits, up to the first which is not
+    # nullable
+    walk = 0
+    for nt, rhs in ir.productions:
+        for s in rhs:
+            walk = walk + 1
+            if ir.symbols[s] not in nullable:
+                break
+
+    features = {
+        "nonterminals": len(ir.nonterminals),
+        "terminals": len(ir.terminals),
+        "productions": len(ir.productions),
+        "symbols": sum(len(rhs) for _, rhs in ir.productions),
+        "walk": walk,
+        "first_entries": sum(len([t for t in items if t !=
+            gir.EPSILON_SYMBOL]) for items in cfg.first_set.values()),
+        "epsilon_entries": sum(len(cfg.follow_set.get(nt, [])) for nt in
+            nullable),
+        "expansions": None,
+        "pushed": None,
+        "matches": None,
+        "nodes": None
+    }
+
+    if inp != "" and cfg.parsetable_code == SUCCESS:
+        parser = p.ParserLL1(inp, cfg, spec)
+        derivation = parser.derive()
+        if derivation is not None:
+            features["expansions"] = len(derivation)
+            features["pushed"] = sum(len(body) for _, body in derivation)
+            features["matches"] = len(parser.tokens)
+            # a production without symbols has an epsilon leaf
+            features["nodes"] = 1 + sum(max(len(body), 1) for _, body in
+                derivation)
+    return features
+
+class CostModel:
+    def __init__(self, path = None) -> None:
+        """Loads the measured runs which calibrate the predictions.
+
+        Args:
+            path (Path, optional): Calibration file. Defaults to None, which
+            uses CALIBRATION_FILE_PATH.
+        """
+        self.path = path if path is not None else CALIBRATION_FILE_PATH
+        self.runs = configparser.ConfigParser()
+        self.runs.read(self.path)
+
+    def _ratio(self, section, numerator, denominator, default) -> float:
+        """Divides two totals of the measured runs.
+
+        Args:
+            section (str): Section of the calibration file.
+            numerator (str): Key of the numerator.
+            denominator (str): Key of the denominator.
+            default (float): Ratio before any run is measured.
+
+        Returns:
+            float: Ratio.
+        """
+        if not self.runs.has_section(section):
+            return default
+        below = self.runs[section].getfloat(denominator, 0)
+        if below <= 0:
+            return default
+        return self.runs[section].getfloat(numerator, 0) / below
+
+    def scale(self, scene) -> float:
+        """Finds how many animations a scene made for each one predicted.
+
+        Args:
+            scene (int): Scene code, from `config`.
+
+        Returns:
+            float: Scale of the prediction.
+        """
+        return self._ratio(SCENE_NAMES[scene], "measured", "predicted", 1.0)
+
+    def seconds(self, quality) -> float:
+        """Finds the time taken to render one animation.
+
+        Args:
+            quality (str): Quality, such as "low_quality".
+
+        Returns:
+            float: Seconds.
+        """
+        return self._ratio(quality, "seconds", "animations",
+            DEFAULT_SECONDS[quality])
+
+    def animations(self, scene, features, narration = True,
+        calibrated = True) -> int:
+        """Predicts the number of animations, which are the calls to `play`
+           and `wait`, of a scene.
+
+        Args:
+            scene (int): Scene code, from `config`.
+            features (dict): Counts, as obtained from `measure`.
+            narration (bool, optional): Narration is on. Defaults to True.
+            calibrated (bool, optional): Scales the prediction by the
+            measured runs. Defaults to True.
+
+        Returns:
+            int: Number of animations, or None if the input of a parsing
+            scene was not given or is rejected.
+        """
+        total = 0
+        for feature, weight in PRIORS[scene].items():
+            if feature == "base":
+                total = total + weight
+            elif features[feature] is None:
+                return None
+            else:
+                total = total + weight * features[feature]
+        if narration:
+            total = total * NARRATION_FACTOR
+        if calibrated:
+            total = total * self.scale(scene)
+        return round(total)
+
+    def render_seconds(self, scene, features, quality,
+        narration = True) -> float:
+        """Predicts the time taken to render a scene.
+
+        Args:
+            scene (int): Scene code, from `config`.
+            features (dict): Counts, as obtained from `measure`.
+            quality (str): Quality, such as "low_quality".
+            narration (bool, optional): Narration is on. Defaults to True.
+
+        Returns:
+            float: Seconds, or None if the number of animations is unknown.
+        """
+        count = self.animations(scene, features, narration)
+        if count is None:
+            return None
+        return count * self.seconds(quality)
+
+    def record(self, scene, quality, predicted, measured, seconds) -> int:
+        """Adds a measured run to the calibration file.
+
+        Args:
+            scene (int): Scene code, from `config`.
+            quality (str): Quality it was rendered at.
+            predicted (int): Animations predicted without calibration.
+            measured (int): Animations the scene made.
+            seconds (float): Time taken to render it.
+
+        Returns:
+            int: Status code.
+        """
+        name = SCENE_NAMES[scene]
+        for section in [name, quality]:
+            if not self.runs.has_section(section):
+                self.runs.add_section(section)
+
+        totals = [(name, "predicted", predicted), (name, "measured",
+            measured), (quality, "animations", measured), (quality,
+            "seconds", seconds)]
+        for section, key, value in totals:
+            value = self.runs[section].getfloat(key, 0) + value
+            self.runs[section][key] = str(value)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("w") as file:
+                self.runs.write(file)
+        except OSError:
+            return CFG_WRITE_ERROR
+        return SUCCESS
+
+def estimate(cfg, inp = "", spec = None, model = None) -> dict:
+    """Predicts the table, the parse tree and the animations of a CFG and
+       an optional input, before any of them are built.
+
+    Args:
+        cfg (ContextFreeGrammar): Analysed CFG.
+        inp (str, optional): Input string. Defaults to "".
+        spec (Specification, optional): Language specification. Defaults to
+        None.
+        model (CostModel, optional): Calibrated model. Defaults to None,
+        which loads the calibration file.
+
+    Returns:
+        dict: Table dimensions, tree nodes, and the animations and seconds
+        at each quality of each scene, by the scene's name.
+    """
+    if model is None:
+        model = CostModel()
+    features = measure(cfg, inp, spec)
+    narration = sounds.get_config() == sounds.NARR
+
+    # the terminals include the end marker
+    rows = features["nonterminals"]
+    columns = features["terminals"]
+    scenes = {}
+    for scene in PRIORS:
+        if scene in INPUT_SCENES and inp == "":
+            continue
+        scenes[SCENE_NAMES[scene]] = {
+            "animations": model.animations(scene, features, narration),
+            "seconds": {q: model.render_seconds(scene, features, q,
+                narration) for q in QUALITIES}
+        }
+    return {
+        "table": {"rows": rows, "columns": columns, "cells": rows * columns,
+            "entries": features["first_entries"] +
+                features["epsilon_entries"]},
+        "nodes": features["nodes"],
+        "scenes": scenes,
+        "features": features
+    }
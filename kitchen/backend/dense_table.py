@@ -0,0 +1,258 @@
+""" Stores the parse table as a dense array of production ids. """
+# kitchen/backend/dense_table.py
+
+import numpy as np
+
+from kitchen.backend import bitset as bs
+
+# cells which do not hold a production id. A cell reached through Follow(A)
+# holds the nullable production of A itself
+ERROR_CELL = -1
+
+class DenseTable:
+    def __init__(self, ir, predict, compress = False) -> None:
+        """Builds the parse table as an array of production ids, indexed by
+           non-terminal and terminal. Identical rows and columns are merged,
+           so each distinct row and column is only stored once.
+
+        Args:
+            ir (GrammarIR): Compiled CFG.
+            predict (list): (first mask, follow mask) of each production, as
+            obtained from `calculate_predict_sets`.
+            compress (bool, optional): Packs the rows into a single vector
+            with row displacement, which suits very sparse tables. Defaults
+            to False.
+        """
+        self.ir = ir
+        self.rows = {nt: i for i, nt in enumerate(ir.nonterminals)}
+        self.cols = {t: j for j, t in enumerate(ir.terminals)}
+        # the parser looks cells up by name
+        self.named_rows = {ir.symbols[nt]: i for nt, i in self.rows.items()}
+        self.named_cols = {ir.symbols[t]: j for t, j in self.cols.items()}
+        self.conflicts = {}
+        dtype = np.int16 if len(ir.productions) < np.iinfo(np.int16).max \
+            else np.int32
+
+        full = np.full((len(self.rows), len(self.cols)), ERROR_CELL, dtype)
+        for nt in ir.nonterminals:
+            for pid in ir.lead_to[nt]:
+                first, follow = predict[pid]
+                for t in bs.to_ids(first):
+                    self._fill(full, nt, t, pid)
+                for t in bs.to_ids(follow):
+                    self._fill(full, nt, t, pid)
+
+        # merge identical rows, then identical columns of what remains
+        merged, row_of = np.unique(full, axis=0, return_inverse=True)
+        merged, col_of = np.unique(merged, axis=1, return_inverse=True)
+        self.row_of = row_of.reshape(-1).astype(np.int32)
+        self.col_of = col_of.reshape(-1).astype(np.int32)
+        self.table = merged
+
+        self.base = self.values = self.check = None
+        if compress:
+            self._compress()
+
+    @classmethod
+    def from_arrays(cls, ir, arrays, conflicts = None):
+        """Creates a DenseTable from arrays which were built before, such as
+           read-only views of a bundle file. The arrays are not copied.
+
+        Args:
+            ir (GrammarIR): Compiled CFG.
+            arrays (dict): Arrays, as obtained from `arrays`.
+            conflicts (dict, optional): Conflicts found when the table was 
+            built. Defaults to None.
+
+        Returns:
+            DenseTable: Dense table.
+        """
+        dense = cls.__new__(cls)
+        dense.ir = ir
+        dense.rows = {nt: i for i, nt in enumerate(ir.nonterminals)}
+        dense.cols = {t: j for j, t in enumerate(ir.terminals)}
+        dense.named_rows = {ir.symbols[nt]: i for nt, i in dense.rows.items()}
+        dense.named_cols = {ir.symbols[t]: j for t, j in dense.cols.items()}
+        dense.conflicts = {} if conflicts is None else conflicts
+        for name in ["row_of", "col_of", "table", "base", "values", "check"]:
+            setattr(dense, name, arrays.get(name))
+        return dense
+
+    def arrays(self) -> dict:
+        """Obtains the arrays which hold the table.
+
+        Returns:
+            dict: Arrays by name. A compressed table has no "table".
+        """
+        arrays = {"row_of": self.row_of, "col_of": self.col_of}
+        if self.table is not None:
+            arrays["table"] = self.table
+        else:
+            arrays.update(base=self.base, values=self.values, 
+                check=self.check)
+        return arrays
+
+    def _fill(self, full, nt, t, code) -> None:
+        """Fills a cell, recording a conflict if it is already filled by
+           another production. As in the ParsingTable, the first production
+           is kept.
+
+        Args:
+            full (ndarray): Table being built.
+            nt (int): Non-terminal id.
+            t (int): Terminal id.
+            code (int): Production id.
+        """
+        r, c = self.rows[nt], self.cols[t]
+        if full[r, c] == code:
+            return
+        if full[r, c] != ERROR_CELL:
+            self.conflicts.setdefault((nt, t), [int(full[r, c])]).append(code)
+        else:
+            full[r, c] = code
+
+    def _compress(self) -> None:
+        """Packs the merged rows into one vector by row displacement. Each
+           row is placed at the first offset where its filled cells land on
+           free slots, densest rows first. A slot belongs to a row if the
+           check vector holds that row's index.
+        """
+        n_rows, n_cols = self.table.shape
+        filled = [np.flatnonzero(self.table[r] != ERROR_CELL).tolist()
+            for r in range(n_rows)]
+        base = np.zeros(n_rows, np.int32)
+        check = np.full(n_rows * n_cols + n_cols, -1, np.int32)
+        values = np.full(check.shape, ERROR_CELL, self.table.dtype)
+        used = bytearray(len(check))
+        free = 0
+        size = 0
+
+        for r in sorted(range(n_rows), key=lambda r: -len(filled[r])):
+            cells = filled[r]
+            if cells == []:
+                continue
+            # every slot below the first free one is taken
+            offset = max(0, free - cells[0])
+            while any(used[offset + c] for c in cells):
+                offset += 1
+            for c in cells:
+                used[offset + c] = 1
+            while used[free]:
+                free += 1
+            base[r] = offset
+            check[[offset + c for c in cells]] = r
+            values[[offset + c for c in cells]] = self.table[r, cells]
+            size = max(size, offset + n_cols)
+
+        # every lookup of base + column stays within the vectors
+        size = max(size, int(base.max(initial=0)) + n_cols)
+        self.base = base
+        self.check = check[:size].copy()
+        self.values = values[:size].copy()
+        self.table = None
+
+    def lookup_ids(self, nt, t) -> int:
+        """Obtains the cell of a non-terminal and terminal, given their ids.
+
+        Args:
+            nt (int): Non-terminal id.
+            t (int): Terminal id.
+
+        Raises:
+            KeyError: If either symbol has no row or column.
+
+        Returns:
+            int: Production id or ERROR_CELL.
+        """
+        return self._cell(self.rows[nt], self.cols[t])
+
+    def lookup(self, nt, t) -> int:
+        """Obtains the cell of a non-terminal and terminal, given their names.
+
+        Args:
+            nt (str): Non-terminal.
+            t (str): Terminal.
+
+        Raises:
+            KeyError: If either symbol has no row or column.
+
+        Returns:
+            int: Production id or ERROR_CELL.
+        """
+        return self._cell(self.named_rows[nt], self.named_cols[t])
+
+    def _cell(self, row, col) -> int:
+        """Obtains a cell given its position in the full table.
+
+        Args:
+            row (int): Row of the non-terminal.
+            col (int): Column of the terminal.
+
+        Returns:
+            int: Production id or ERROR_CELL.
+        """
+        # item() avoids creating a numpy scalar for every lookup
+        r = self.row_of.item(row)
+        c = self.col_of.item(col)
+        if self.table is not None:
+            return self.table.item(r, c)
+        i = self.base.item(r) + c
+        return self.values.item(i) if self.check.item(i) == r else ERROR_CELL
+
+    def to_entry(self, code) -> str:
+        """Converts a cell into the text used by the ParsingTable.
+
+        Args:
+            code (int): Production id or ERROR_CELL.
+
+        Returns:
+            str: "Error", or a production in the form "A -> b C".
+        """
+        if code == ERROR_CELL:
+            return "Error"
+        return self.ir.prod_strings[code]
+
+    def entry(self, nt, t) -> str:
+        """Obtains the text of a cell, as held in `ParsingTable.pt_dict`.
+
+        Args:
+            nt (str): Non-terminal.
+            t (str): Terminal.
+
+        Returns:
+            str: "Error", or a production in the form "A -> b C".
+        """
+        return self.to_entry(self.lookup(nt, t))
+
+    def to_dict(self) -> dict:
+        """Obtains the table as a dictionary of rows, in the same form as
+           `ParsingTable.pt_dict`, for display.
+
+        Returns:
+            dict: {NT: {terminal: entry}}, sorted by name.
+        """
+        nts = sorted(self.ir.names(self.ir.nonterminals))
+        ts = sorted(self.ir.names(self.ir.terminals))
+        return {nt: {t: self.entry(nt, t) for t in ts} for nt in nts}
+
+    def get_conflicts(self) -> list:
+        """Obtains every conflict found when the table was built.
+
+        Returns:
+            list: (non-terminal, terminal, productions) triples, in the
+            order in which they were found.
+        """
+        return [(self.ir.symbols[nt], self.ir.symbols[t],
+            [self.to_entry(code) for code in codes])
+            for (nt, t), codes in self.conflicts.items()]
+
+    @property
+    def nbytes(self) -> int:
+        """Obtains the memory held by the arrays of the table.
+
+        Returns:
+            int: Size in bytes.
+        """
+        arrays = [self.row_of, self.col_of, self.table, self.base,
+            self.values, self.check]
+        return sum(a.nbytes for a in arrays if a is not None)
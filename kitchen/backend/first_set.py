@@ -0,0 +1,198 @@
+""" Calculates first sets iteratively over the compiled grammar. """
+# kitchen/backend/first_set.py
+
+from collections import deque
+
+from kitchen.backend import (
+    grammar_ir as gir,
+    bitset as bs
+)
+
+def calculate_nullable(ir) -> list:
+    """Finds the symbols which may derive epsilon. Each production keeps a
+       count of body symbols not yet known to be nullable, so every
+       production is visited at most once per body symbol.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+
+    Returns:
+        list: Nullable flag, indexed by symbol id.
+    """
+    nullable = [False] * len(ir.symbols)
+    nullable[ir.epsilon] = True
+    remaining = []
+    occurs_in = {}
+    worklist = deque()
+
+    for pid, (nt, rhs) in enumerate(ir.productions):
+        body = [s for s in rhs if s != ir.epsilon]
+        remaining.append(len(body))
+        for s in dict.fromkeys(body):
+            occurs_in.setdefault(s, []).append(pid)
+        if body == [] and not nullable[nt]:
+            nullable[nt] = True
+            worklist.append(nt)
+
+    while worklist:
+        s = worklist.popleft()
+        for pid in occurs_in.get(s, []):
+            # a symbol may repeat in a body, so count every occurrence
+            remaining[pid] -= ir.rhs(pid).count(s)
+            nt = ir.productions[pid][0]
+            if remaining[pid] == 0 and not nullable[nt]:
+                nullable[nt] = True
+                worklist.append(nt)
+    return nullable
+
+def calculate_first_set(ir, nullable = None, known = None) -> tuple:
+    """Calculates the first set of every non-terminal with a worklist,
+       along with the production responsible for each terminal. Sets are
+       bitmasks over symbol ids, and epsilon is left to the nullable flags.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+        nullable (list, optional): Nullable flags, as obtained from
+        `calculate_nullable`. Defaults to None.
+        known (dict, optional): First sets which are still valid, as 
+        {nt id: (mask, index)}. Only the remaining non-terminals are 
+        calculated. Defaults to None.
+
+    Returns:
+        tuple: First sets ({nt id: mask}), the production which derives
+        each terminal ({nt id: {terminal id: production id}}) and the set 
+        of (nt id, symbol id) pairs derived by more than one production.
+    """
+    if nullable is None:
+        nullable = calculate_nullable(ir)
+
+    if known is None:
+        known = {}
+
+    first = {}
+    index = {}
+    for nt in ir.nonterminals + ir.undefined:
+        if nt in known:
+            first[nt], index[nt] = known[nt][0], dict(known[nt][1])
+        else:
+            first[nt] = bs.EMPTY
+            index[nt] = {}
+
+    # First(X) is a subset of First(A) for every A -> a X b where a is
+    # nullable. These edges are labelled with the production responsible
+    feeds = {}
+    worklist = deque()
+    queued = set()
+
+    def add(nt, incoming, pid):
+        new = incoming & ~first[nt]
+        if new:
+            first[nt] |= new
+            for t in bs.to_ids(new):
+                index[nt][t] = pid
+            if nt not in queued:
+                queued.add(nt)
+                worklist.append(nt)
+
+    for pid, (nt, rhs) in enumerate(ir.productions):
+        if nt in known:
+            continue
+        for s in rhs:
+            if s == ir.epsilon:
+                continue
+            if ir.kinds[s] == gir.NONTERMINAL:
+                feeds.setdefault(s, []).append((nt, pid))
+            else:
+                add(nt, bs.bit(s), pid)
+            if not nullable[s]:
+                break
+
+    # known sets are complete, but still flow into the others
+    for nt in known:
+        if nt not in queued:
+            queued.add(nt)
+            worklist.append(nt)
+
+    # a non-terminal is only revisited when its first set has grown
+    while worklist:
+        s = worklist.popleft()
+        queued.discard(s)
+        for nt, pid in feeds.get(s, []):
+            add(nt, first[s], pid)
+
+    return first, index, find_conflicts(ir, first, nullable)
+
+def first_of_sequence(ir, rhs, first, nullable) -> tuple:
+    """Calculates the first set of a sequence of symbols.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+        rhs (tuple): Symbol ids.
+        first (dict): First sets of the non-terminals.
+        nullable (list): Nullable flags.
+
+    Returns:
+        tuple: First set of the sequence as a mask, and whether the whole
+        sequence may derive epsilon.
+    """
+    mask = bs.EMPTY
+    for s in rhs:
+        if s == ir.epsilon:
+            continue
+        if ir.kinds[s] == gir.NONTERMINAL:
+            mask |= first[s]
+        else:
+            mask |= bs.bit(s)
+        if not nullable[s]:
+            return mask, False
+    return mask, True
+
+def find_conflicts(ir, first, nullable) -> set:
+    """Finds the terminals which more than one production of the same 
+       non-terminal may begin with. Two nullable productions conflict on 
+       epsilon.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+        first (dict): First sets of the non-terminals.
+        nullable (list): Nullable flags.
+
+    Returns:
+        set: (nt id, symbol id) pairs.
+    """
+    conflicts = set()
+    for nt in ir.nonterminals:
+        seen = bs.EMPTY
+        for pid in ir.lead_to[nt]:
+            mask, empty = first_of_sequence(ir, ir.rhs(pid), first, nullable)
+            if empty:
+                mask |= bs.bit(ir.epsilon)
+            for t in bs.to_ids(seen & mask):
+                conflicts.add((nt, t))
+            seen |= mask
+    return conflicts
+
+def to_named_sets(ir, first, index, nullable) -> tuple:
+    """Converts first set masks into the ordered, named lists used by the
+       ContextFreeGrammar, with epsilon placed at the end of each set.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+        first (dict): First set masks.
+        index (dict): Production ids for each terminal.
+        nullable (list): Nullable flags.
+
+    Returns:
+        tuple: First set and first set index, keyed by non-terminal name.
+    """
+    first_set = {}
+    firstset_index = {}
+    for nt in ir.nonterminals:
+        name = ir.symbols[nt]
+        ts = bs.to_ids(first[nt])
+        first_set[name] = ir.names(ts)
+        firstset_index[name] = [ir.prod_strings[index[nt][t]] for t in ts]
+        if nullable[nt]:
+            first_set[name].append(gir.EPSILON_SYMBOL)
+            firstset_index[name].append(name + " -> " + gir.EPSILON_SYMBOL)
+    return first_set, firstset_index
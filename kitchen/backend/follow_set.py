@@ -0,0 +1,145 @@
+""" Calculates follow sets as bitmasks over the compiled grammar. """
+# kitchen/backend/follow_set.py
+
+import operator
+import sys
+
+from kitchen.backend import (
+    grammar_ir as gir,
+    bitset as bs
+)
+
+def calculate_follow_set(ir, first, nullable, known = None) -> dict:
+    """Calculates the follow set of every non-terminal. A single right-to-left
+       pass over each production finds the terminals which directly follow a
+       non-terminal, and the non-terminals whose follow sets it inherits.
+       These inclusions are then closed with `digraph`.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+        first (dict): First set masks, as obtained from `calculate_first_set`.
+        nullable (list): Nullable flags.
+        known (dict, optional): Follow set masks which are still valid. 
+        Only the remaining non-terminals are calculated. Defaults to None.
+
+    Returns:
+        dict: Follow set masks, keyed by non-terminal id.
+    """
+    if known is None:
+        known = {}
+
+    follow = {nt: bs.EMPTY for nt in ir.nonterminals + ir.undefined}
+    if ir.start is not None:
+        follow[ir.start] = bs.bit(ir.end)
+    follow.update(known)
+
+    # Follow(X) includes Follow(A) for every A -> a X b, where b is nullable
+    includes = {}
+    for nt, rhs in ir.productions:
+        trailer = bs.EMPTY
+        trailer_nullable = True
+        for s in reversed(rhs):
+            if s == ir.epsilon:
+                continue
+            if ir.kinds[s] == gir.NONTERMINAL:
+                if s not in known:
+                    follow[s] |= trailer
+                if trailer_nullable and s != nt and s not in known:
+                    includes.setdefault(s, []).append(nt)
+                if nullable[s]:
+                    trailer |= first[s]
+                else:
+                    trailer = first[s]
+                    trailer_nullable = False
+            else:
+                trailer = bs.bit(s)
+                trailer_nullable = False
+
+    return digraph(list(follow.keys()), lambda nt: includes.get(nt, ()),
+        lambda nt: follow[nt], operator.or_)
+
+def ordered_union(a, b) -> list:
+    """Merges two ordered sets, keeping the order of their first appearance.
+
+    Args:
+        a (list): First set.
+        b (list): Second set.
+
+    Returns:
+        list: Union of both sets.
+    """
+    return a + [i for i in b if i not in a]
+
+def digraph(nodes, relation, initial, union) -> dict:
+    """Computes F(x) = F'(x) U { F(y) | x R y } for every node, following
+       the digraph algorithm of DeRemer and Pennello (as used by yacc.py in
+       PLY). Nodes in the same strongly connected component share one set,
+       and every edge is visited once. The traversal keeps its own stack, so 
+       long chains of non-terminals do not recurse.
+
+    Args:
+        nodes (list): Nodes of the graph.
+        relation (function): Obtains the nodes which a node is related to.
+        initial (function): Obtains the initial set F'(x) of a node.
+        union (function): Combines two sets.
+
+    Returns:
+        dict: F(x) for each node.
+    """
+    depth = dict.fromkeys(nodes, 0)
+    stack = []
+    sets = {}
+
+    def visit(x):
+        stack.append(x)
+        depth[x] = len(stack)
+        sets[x] = initial(x)
+        work.append((x, depth[x], iter(relation(x))))
+
+    for root in nodes:
+        if depth[root] != 0:
+            continue
+        work = []
+        visit(root)
+        while work:
+            x, d, related = work[-1]
+            descended = False
+            for y in related:
+                if depth.get(y, 0) == 0:
+                    visit(y)
+                    descended = True
+                    break
+                depth[x] = min(depth[x], depth[y])
+                sets[x] = union(sets[x], sets[y])
+            if descended:
+                continue
+
+            # x is finished, so close its component if it is the root
+            work.pop()
+            if depth[x] == d:
+                while True:
+                    element = stack.pop()
+                    depth[element] = sys.maxsize
+                    sets[element] = sets[x]
+                    if element == x:
+                        break
+
+            # the edge which led to x can now be completed
+            if work:
+                parent = work[-1][0]
+                depth[parent] = min(depth[parent], depth[x])
+                sets[parent] = union(sets[parent], sets[x])
+    return sets
+
+def to_named_sets(ir, follow) -> dict:
+    """Converts follow set masks into named lists, in CFG order.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+        follow (dict): Follow set masks.
+
+    Returns:
+        dict: Follow sets, keyed by non-terminal name.
+    """
+    return {ir.symbols[nt]: bs.to_names(ir, follow[nt])
+        for nt in ir.nonterminals}
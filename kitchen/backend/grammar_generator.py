@@ -0,0 +1,170 @@
+""" Generates random LL(1) grammars, and sentences which they accept. """
+# kitchen/backend/grammar_generator.py
+
+import random
+
+def symbol_name(i, upper = False) -> str:
+    """Obtains the name of the i-th generated symbol. Symbol names may only
+       contain letters, so indices are written in base 26 (a, b, ..., z, aa).
+
+    Args:
+        i (int): Index of the symbol.
+        upper (bool, optional): Names a non-terminal. Defaults to False.
+
+    Returns:
+        str: Name of the symbol.
+    """
+    name = ""
+    i = i + 1
+    while i > 0:
+        i, r = divmod(i - 1, 26)
+        name = chr(ord("a") + r) + name
+    return name.upper() if upper else name
+
+def generate_grammar(nonterminals = 10, terminals = 10, width = 4,
+    nullable_ratio = 0.25, recursion = 2, alternatives = 3,
+    seed = None) -> dict:
+    """Generates a random LL(1) grammar. Non-terminals are built from the
+       last to the first, so that the first set of every non-terminal
+       which a production may start with is already known:
+
+       - the alternatives of a non-terminal start with distinct terminals,
+         or with non-nullable non-terminals whose first sets are disjoint.
+       - a quarter of the terminals are kept as closers, which never start a
+         production. Each nullable non-terminal is followed by a closer, so
+         that its follow set never meets its first set.
+       - the first alternative only refers to the next non-terminal, which
+         keeps every non-terminal reachable and productive.
+       - references to earlier non-terminals (recursion) never start a
+         production, so there is no left recursion.
+
+    Args:
+        nonterminals (int, optional): Number of non-terminals. Defaults to 10.
+        terminals (int, optional): Number of terminals. Defaults to 10.
+        width (int, optional): Maximum length of a production. Defaults to 4.
+        nullable_ratio (float, optional): Chance of a non-terminal deriving
+        epsilon. Defaults to 0.25.
+        recursion (int, optional): How far back a production may refer to a
+        non-terminal. 0 gives an acyclic grammar. Defaults to 2.
+        alternatives (int, optional): Maximum number of alternatives of a
+        non-terminal. Defaults to 3.
+        seed (int, optional): Seed of the generator. Defaults to None.
+
+    Returns:
+        dict: {NT: list of bodies}, where each body is a list of names. The
+        first NT is the start symbol.
+    """
+    rng = random.Random(seed)
+    nonterminals = max(1, nonterminals)
+    terminals = max(2, terminals)
+    width = max(1, width)
+
+    nts = [symbol_name(i, upper=True) for i in range(nonterminals)]
+    ts = [symbol_name(i) for i in range(terminals)]
+    closers = ts[:max(1, terminals // 4)]
+    leads = ts[len(closers):]
+
+    # the start symbol always derives some input
+    nullable = [i > 0 and rng.random() < nullable_ratio
+        for i in range(nonterminals)]
+    first = [None] * nonterminals
+    bodies = [None] * nonterminals
+
+    def reference(body, m):
+        body.append(nts[m])
+        if nullable[m]:
+            body.append(rng.choice(closers))
+
+    for i in reversed(range(nonterminals)):
+        used = set()
+        alts = []
+        for a in range(rng.randint(1, max(1, alternatives))):
+            # chooses the symbol which this alternative starts with
+            starters = [m for m in range(i + 1, nonterminals) if
+                not nullable[m] and not first[m] & used]
+            free = [t for t in leads if t not in used]
+            body = []
+            size = rng.randint(1, width)
+            if a > 0 and starters and rng.random() < 0.3:
+                m = rng.choice(starters)
+                body.append(nts[m])
+                used |= first[m]
+            elif free:
+                t = rng.choice(free)
+                body.append(t)
+                used.add(t)
+            else:
+                break
+
+            # the first alternative only leads on to the next non-terminal
+            if a == 0:
+                if i + 1 < nonterminals:
+                    reference(body, i + 1)
+                while len(body) < size:
+                    body.append(rng.choice(ts))
+                alts.append(body)
+                continue
+
+            while len(body) < size:
+                if rng.random() < 0.5:
+                    body.append(rng.choice(ts))
+                elif recursion > 0 and rng.random() < 0.3:
+                    reference(body, rng.randint(max(0, i - recursion + 1), i))
+                elif i + 1 < nonterminals:
+                    reference(body, rng.randint(i + 1, nonterminals - 1))
+            alts.append(body)
+
+        if nullable[i]:
+            alts.append(["#"])
+        first[i] = used
+        bodies[i] = alts
+
+    return {nts[i]: bodies[i] for i in range(nonterminals)}
+
+def to_text(grammar) -> str:
+    """Writes a generated grammar in the format of a CFG file.
+
+    Args:
+        grammar (dict): Generated grammar.
+
+    Returns:
+        str: Contents of the CFG file.
+    """
+    return "\n".join(nt + " -> " + " | ".join(" ".join(b) for b in bodies)
+        for nt, bodies in grammar.items()) + "\n"
+
+def generate_sentence(grammar, length = 50, seed = None) -> list:
+    """Derives a random sentence of a generated grammar. Alternatives which
+       contain non-terminals are chosen at random until the sentence reaches
+       the given length, after which the derivation is closed as quickly as
+       possible. Acyclic grammars may only derive shorter sentences.
+
+    Args:
+        grammar (dict): Generated grammar.
+        length (int, optional): Number of tokens after which the derivation
+        is closed. Defaults to 50.
+        seed (int, optional): Seed of the generator. Defaults to None.
+
+    Returns:
+        list: Tokens of the sentence.
+    """
+    rng = random.Random(seed)
+    tokens = []
+    stack = [next(iter(grammar))]
+    while stack:
+        top = stack.pop()
+        if top not in grammar:
+            if top != "#":
+                tokens.append(top)
+            continue
+        bodies = grammar[top]
+        if len(tokens) < length:
+            # bodies which lead on to other non-terminals keep it growing
+            growing = [b for b in bodies if any(s in grammar for s in b)]
+            body = rng.choice(growing or bodies)
+        elif bodies[-1] == ["#"]:
+            body = bodies[-1]
+        else:
+            body = bodies[0]
+        stack.extend(reversed(body))
+    return tokens
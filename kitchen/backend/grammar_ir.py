@@ -0,0 +1,237 @@
+""" Compiles a CFG into an interned, integer-based representation. """
+# kitchen/backend/grammar_ir.py
+
+import re
+
+from kitchen import (
+    RE_NONTERMINAL,
+    RE_PRODUCTION,
+    RE_TERMINAL
+)
+
+(
+    TERMINAL,
+    NONTERMINAL,
+    EPSILON
+) = range(3)
+
+END_MARKER = "$"
+EPSILON_SYMBOL = "#"
+
+def tokenise(text: str) -> list:
+    """Splits the right-hand side of a production into its symbols.
+
+    Args:
+        text (str): Production body, eg. "a B D h".
+
+    Returns:
+        list: Symbols in the order in which they appear.
+    """
+    return list(filter(None, re.findall(RE_PRODUCTION, text)))
+
+def classify(symbol: str) -> int:
+    """Determines the kind of a symbol.
+
+    Args:
+        symbol (str): Symbol as it appears in the CFG.
+
+    Returns:
+        int: Symbol kind (TERMINAL, NONTERMINAL or EPSILON).
+    """
+    if symbol == EPSILON_SYMBOL:
+        return EPSILON
+    if symbol == END_MARKER or re.match(RE_TERMINAL, symbol):
+        return TERMINAL
+    if re.match(RE_NONTERMINAL, symbol):
+        return NONTERMINAL
+    return TERMINAL
+
+class GrammarIR:
+    def __init__(self, prods: list) -> None:
+        """Compiles the productions of a CFG, interning every symbol to a
+           small integer. This happens once, when the CFG is loaded, so
+           that no algorithm needs to tokenise or classify strings again.
+
+        Args:
+            prods (list): Productions, as obtained from `get_prods`.
+        """
+        # symbol tables
+        self.symbols = []
+        self.ids = {}
+        self.kinds = []
+
+        # ordered symbol ids
+        self.nonterminals = []
+        self.terminals = []
+
+        # productions, stored as (lhs id, tuple of rhs ids)
+        self.productions = []
+        self.prod_strings = []
+        self.prod_ids = {}
+        self.lead_to = {}
+
+        # memo for parse table entries which are not CFG productions
+        self._entries = {}
+
+        # $ and # always exist, and $ is always the first terminal
+        self.end = self.intern(END_MARKER)
+        self.epsilon = self.intern(EPSILON_SYMBOL)
+        self.terminals.append(self.end)
+
+        # non-terminals are numbered in the order they are defined
+        for p_seq in prods:
+            nt = self.intern(p_seq[0], NONTERMINAL)
+            if nt not in self.lead_to:
+                self.nonterminals.append(nt)
+                self.lead_to[nt] = []
+
+        # compile each production body. As in the CFG dictionary, a
+        # non-terminal which is defined twice keeps its last definition
+        for p_seq in prods:
+            nt = self.ids[p_seq[0]]
+            self.lead_to[nt] = []
+            for body in p_seq[1]:
+                rhs = []
+                for symbol in tokenise(body):
+                    sid = self.intern(symbol)
+                    if self.kinds[sid] == TERMINAL and sid not in \
+                        self.terminals:
+                        self.terminals.append(sid)
+                    rhs.append(sid)
+                self._add_production(nt, tuple(rhs), p_seq[0] + " -> " + body)
+
+        # non-terminals which are used, but never defined
+        self.undefined = [sid for sid, kind in enumerate(self.kinds) 
+            if kind == NONTERMINAL and sid not in self.lead_to]
+
+        self.start = self.nonterminals[0] if self.nonterminals != [] else None
+
+    def intern(self, symbol: str, kind = None) -> int:
+        """Obtains the id of a symbol, assigning a new one if necessary.
+
+        Args:
+            symbol (str): Symbol to be interned.
+            kind (int, optional): Kind of the symbol. Classified from its
+            text if not given. Defaults to None.
+
+        Returns:
+            int: Symbol id.
+        """
+        sid = self.ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            self.symbols.append(symbol)
+            self.ids[symbol] = sid
+            self.kinds.append(classify(symbol) if kind is None else kind)
+        return sid
+
+    def _add_production(self, nt: int, rhs: tuple, text: str) -> int:
+        """Stores a compiled production.
+
+        Args:
+            nt (int): Id of the non-terminal which leads to the production.
+            rhs (tuple): Symbol ids of the production body.
+            text (str): Production in the form "A -> b C".
+
+        Returns:
+            int: Production id.
+        """
+        pid = len(self.productions)
+        self.productions.append((nt, rhs))
+        self.prod_strings.append(text)
+        self.prod_ids.setdefault(text, pid)
+        self.lead_to[nt].append(pid)
+        return pid
+
+    def kind_of(self, symbol: str) -> int:
+        """Obtains the kind of a symbol given its name.
+
+        Args:
+            symbol (str): Symbol name.
+
+        Returns:
+            int: Symbol kind.
+        """
+        sid = self.ids.get(symbol)
+        if sid is None:
+            return classify(symbol)
+        return self.kinds[sid]
+
+    def is_nonterminal(self, symbol: str) -> bool:
+        """Checks whether a named symbol is a non-terminal.
+
+        Args:
+            symbol (str): Symbol name.
+
+        Returns:
+            bool: True if the symbol is a non-terminal.
+        """
+        return self.kind_of(symbol) == NONTERMINAL
+
+    def is_terminal(self, symbol: str) -> bool:
+        """Checks whether a named symbol is a terminal (including $).
+
+        Args:
+            symbol (str): Symbol name.
+
+        Returns:
+            bool: True if the symbol is a terminal.
+        """
+        return self.kind_of(symbol) == TERMINAL
+
+    def names(self, ids) -> list:
+        """Converts a sequence of symbol ids to their names.
+
+        Args:
+            ids (iterable): Symbol ids.
+
+        Returns:
+            list: Symbol names.
+        """
+        return [self.symbols[i] for i in ids]
+
+    def rhs(self, pid: int) -> tuple:
+        """Obtains the body of a production.
+
+        Args:
+            pid (int): Production id.
+
+        Returns:
+            tuple: Symbol ids of the body.
+        """
+        return self.productions[pid][1]
+
+    def productions_of(self, nt: str) -> list:
+        """Obtains the production ids led to by a non-terminal.
+
+        Args:
+            nt (str): Non-terminal name.
+
+        Raises:
+            KeyError: If the non-terminal has no productions in the CFG.
+
+        Returns:
+            list: Production ids.
+        """
+        return self.lead_to[self.ids[nt]]
+
+    def split_entry(self, entry: str) -> tuple:
+        """Splits a parse table entry of the form "A -> b C" into its
+           non-terminal and symbols, without re-tokenising known productions.
+
+        Args:
+            entry (str): Parse table entry.
+
+        Returns:
+            tuple: Non-terminal name and list of symbol names.
+        """
+        pid = self.prod_ids.get(entry)
+        if pid is not None:
+            nt, rhs = self.productions[pid]
+            return self.symbols[nt], self.names(rhs)
+
+        # derived entries, such as A -> # for a nullable A, are compiled once
+        if entry not in self._entries:
+            sides = entry.split("->")
+            self._entries[entry] = (sides[0].strip(), tokenise(sides[1]))
+        return self._entries[entry]
@@ -0,0 +1,227 @@
+""" Checks the health of a CFG before it is analysed. """
+# kitchen/backend/health.py
+
+from collections import deque
+
+from kitchen.backend import (
+    first_set as fs,
+    grammar_ir as gir,
+    prune as pr
+)
+
+def strongly_connected(nodes, edges) -> list:
+    """Finds the strongly connected components of a graph with Tarjan's
+       algorithm. The depth-first search keeps its own stack, so deep
+       grammars cannot exhaust the recursion limit.
+
+    Args:
+        nodes (list): Node ids.
+        edges (dict): {node: list of (target, label)}.
+
+    Returns:
+        list: Components, each a list of node ids, in reverse topological
+        order.
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(edges.get(root, ())))]
+        while work:
+            node, targets = work[-1]
+            for target, _ in targets:
+                if target not in index:
+                    index[target] = low[target] = len(index)
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(edges.get(target, ()))))
+                    break
+                if target in on_stack:
+                    low[node] = min(low[node], index[target])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+def find_cycles(nodes, edges) -> list:
+    """Finds one cycle through each strongly connected component which has
+       one. Each cycle is found by a breadth-first search which stays inside
+       its component, so every edge is visited a constant number of times.
+
+    Args:
+        nodes (list): Node ids.
+        edges (dict): {node: list of (target, label)}.
+
+    Returns:
+        list: Cycles, each a list of the edge labels along it.
+    """
+    order = {node: i for i, node in enumerate(nodes)}
+    cycles = []
+    for component in strongly_connected(nodes, edges):
+        members = set(component)
+        root = min(component, key=order.get)
+        if len(component) == 1 and not any(t == root for t, _ in
+            edges.get(root, ())):
+            continue
+
+        # the label of the edge by which each node was first reached
+        reached = {}
+        queue = deque([root])
+        while root not in reached:
+            node = queue.popleft()
+            for target, label in edges.get(node, ()):
+                if target in members and target not in reached:
+                    reached[target] = (node, label)
+                    queue.append(target)
+
+        cycle = []
+        node = root
+        while True:
+            node, label = reached[node]
+            cycle.append(label)
+            if node == root:
+                break
+        cycles.append(cycle[::-1])
+    return cycles
+
+class Health:
+    def __init__(self, ir, nullable = None) -> None:
+        """Checks a CFG for the problems which make the analysis fail or
+           the LL(1) parse table impossible. Every check visits each symbol
+           of each production a constant number of times.
+
+        Args:
+            ir (GrammarIR): Compiled CFG.
+            nullable (list, optional): Nullable flags, indexed by symbol id.
+            Defaults to None, which calculates them.
+        """
+        self.ir = ir
+        if nullable is None:
+            nullable = fs.calculate_nullable(ir)
+
+        # A -> B when A -> x B y, where x is nullable. A cycle of these
+        # edges is left recursion
+        left_corner = {}
+        # A -> B when A -> x B y, where both x and y are nullable. A cycle
+        # of these edges lets A derive itself
+        unit = {}
+        # the first production using each undefined non-terminal
+        undefined = set(ir.undefined)
+        used_by = {}
+
+        for pid, (nt, rhs) in enumerate(ir.productions):
+            for s in rhs:
+                if s == ir.epsilon:
+                    continue
+                if ir.kinds[s] == gir.NONTERMINAL:
+                    left_corner.setdefault(nt, []).append((s, pid))
+                if not nullable[s]:
+                    break
+
+            blocking = [s for s in rhs if not nullable[s]]
+            if blocking == []:
+                candidates = {s for s in rhs if ir.kinds[s] ==
+                    gir.NONTERMINAL}
+            elif len(blocking) == 1 and ir.kinds[blocking[0]] == \
+                gir.NONTERMINAL:
+                candidates = {blocking[0]}
+            else:
+                candidates = set()
+            for s in candidates:
+                unit.setdefault(nt, []).append((s, pid))
+
+            for s in rhs:
+                if s in undefined and s not in used_by:
+                    used_by[s] = pid
+
+        nodes = ir.nonterminals + ir.undefined
+        self.left_recursion = [self._productions(c) for c in
+            find_cycles(nodes, left_corner)]
+        self.cycles = [self._productions(c) for c in find_cycles(nodes, unit)]
+        self.undefined = [(ir.symbols[s], ir.prod_strings[used_by[s]]) for s
+            in ir.undefined]
+        self.unproductive, self.unreachable = pr.find_useless(ir)
+        # undefined non-terminals are reported on their own
+        self.unproductive = [nt for nt in self.unproductive if ir.ids[nt]
+            not in undefined]
+
+    def _productions(self, pids) -> list:
+        """Names the productions along a cycle.
+
+        Args:
+            pids (list): Production ids.
+
+        Returns:
+            list: Productions, such as "A -> B c".
+        """
+        return [self.ir.prod_strings[pid] for pid in pids]
+
+    def is_healthy(self) -> bool:
+        """Checks that the CFG can be analysed at all. Left recursion and
+           useless non-terminals only rule out LL(1) parsing or waste
+           productions, so they are not counted.
+
+        Returns:
+            bool: True if there are no undefined non-terminals or cycles.
+        """
+        return self.undefined == [] and self.cycles == []
+
+    def is_ll1_candidate(self) -> bool:
+        """Checks whether the CFG could be LL(1).
+
+        Returns:
+            bool: True if it is healthy and not left-recursive.
+        """
+        return self.is_healthy() and self.left_recursion == []
+
+    def errors(self) -> list:
+        """Describes the problems which stop the CFG from being analysed.
+
+        Returns:
+            list: Messages.
+        """
+        messages = []
+        for nt, production in self.undefined:
+            messages.append("Non-terminal [" + nt + "] has no production, " +
+                "but is used in " + production)
+        for cycle in self.cycles:
+            messages.append("Cycle, as [" + cycle[0].split(" ->")[0] +
+                "] derives itself: " + ", ".join(cycle))
+        return messages
+
+    def warnings(self) -> list:
+        """Describes the problems which rule out LL(1) parsing, or which
+           leave productions unused.
+
+        Returns:
+            list: Messages.
+        """
+        messages = []
+        for cycle in self.left_recursion:
+            kind = "Direct" if len(cycle) == 1 else "Indirect"
+            messages.append(kind + " left recursion: " + ", ".join(cycle))
+        if self.unproductive != []:
+            messages.append("Unproductive non-terminals: " +
+                ", ".join(self.unproductive))
+        if self.unreachable != []:
+            messages.append("Unreachable non-terminals: " +
+                ", ".join(self.unreachable))
+        return messages
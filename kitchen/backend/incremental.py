@@ -0,0 +1,157 @@
+""" Finds the parts of a CFG's analysis which an edit invalidates. """
+# kitchen/backend/incremental.py
+
+from collections import deque
+
+from kitchen.backend import grammar_ir as gir
+
+def bodies(ir) -> dict:
+    """Obtains the production bodies of each non-terminal by name, so that
+       two compilations of a CFG can be compared.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+
+    Returns:
+        dict: {NT: tuple of bodies}, where each body is a tuple of names.
+    """
+    return {ir.symbols[nt]: tuple(tuple(ir.names(ir.rhs(pid)))
+        for pid in ir.lead_to[nt]) for nt in ir.nonterminals}
+
+def changed_nonterminals(old_ir, new_ir) -> set:
+    """Finds the non-terminals whose productions were added, removed or
+       edited.
+
+    Args:
+        old_ir (GrammarIR): Previous compilation of the CFG.
+        new_ir (GrammarIR): Current compilation of the CFG.
+
+    Returns:
+        set: Names of the changed non-terminals.
+    """
+    old = bodies(old_ir)
+    new = bodies(new_ir)
+    return {nt for nt in old.keys() | new.keys()
+        if old.get(nt) != new.get(nt)}
+
+def first_dependents(ir, nullable) -> dict:
+    """Links each non-terminal to those whose first sets it contributes to.
+       B contributes to A if A -> a B b, where a is nullable.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+        nullable (list): Nullable flags.
+
+    Returns:
+        dict: {B: set of A}, by name.
+    """
+    graph = {}
+    for nt, rhs in ir.productions:
+        for s in rhs:
+            if ir.kinds[s] == gir.NONTERMINAL:
+                graph.setdefault(ir.symbols[s], set()).add(ir.symbols[nt])
+            if not nullable[s]:
+                break
+    return graph
+
+def follow_dependents(ir, nullable) -> dict:
+    """Links each non-terminal to those whose follow sets it contributes to.
+       A contributes to X if A -> a X b, where b is nullable.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+        nullable (list): Nullable flags.
+
+    Returns:
+        dict: {A: set of X}, by name.
+    """
+    graph = {}
+    for nt, rhs in ir.productions:
+        for s in reversed(rhs):
+            if ir.kinds[s] == gir.NONTERMINAL:
+                graph.setdefault(ir.symbols[nt], set()).add(ir.symbols[s])
+            if not nullable[s]:
+                break
+    return graph
+
+def followers(ir, nullable, targets) -> set:
+    """Finds the non-terminals which may be directly followed by one of the
+       targets, and so take terminals from its first set.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+        nullable (list): Nullable flags.
+        targets (set): Names of non-terminals.
+
+    Returns:
+        set: Names of the preceding non-terminals.
+    """
+    found = set()
+    for _, rhs in ir.productions:
+        for i, s in enumerate(rhs):
+            if ir.kinds[s] != gir.NONTERMINAL:
+                continue
+            for nxt in rhs[i + 1:]:
+                if ir.symbols[nxt] in targets:
+                    found.add(ir.symbols[s])
+                if not nullable[nxt]:
+                    break
+    return found
+
+def reach(graph, roots) -> set:
+    """Finds every node reachable from a set of roots, including the roots.
+
+    Args:
+        graph (dict): Adjacency sets.
+        roots (iterable): Starting nodes.
+
+    Returns:
+        set: Reachable nodes.
+    """
+    seen = set(roots)
+    queue = deque(seen)
+    while queue:
+        for nxt in graph.get(queue.popleft(), ()):
+            if nxt not in seen:
+                seen.add(nxt)
+                queue.append(nxt)
+    return seen
+
+def invalidated(old_ir, new_ir, old_nullable, nullable) -> tuple:
+    """Finds the first sets, follow sets and parse table rows which must be
+       recalculated after a CFG changes. Everything else may be kept.
+
+    Args:
+        old_ir (GrammarIR): Previous compilation of the CFG.
+        new_ir (GrammarIR): Current compilation of the CFG.
+        old_nullable (set): Names of the previously nullable non-terminals.
+        nullable (list): Current nullable flags.
+
+    Returns:
+        tuple: Names of the edited non-terminals, and those whose first
+        sets, follow sets and parse table rows are invalidated.
+    """
+    changed = changed_nonterminals(old_ir, new_ir)
+    now_nullable = {new_ir.symbols[nt] for nt in new_ir.nonterminals
+        if nullable[nt]}
+    roots = changed | (old_nullable ^ now_nullable)
+
+    first = reach(first_dependents(new_ir, nullable), roots)
+
+    # symbols in an edited production may gain or lose followers, as may
+    # those followed by a non-terminal whose first set changed
+    seeds = followers(new_ir, nullable, first)
+    for ir in (old_ir, new_ir):
+        for nt in roots:
+            if nt in ir.ids and ir.ids[nt] in ir.lead_to:
+                for pid in ir.lead_to[ir.ids[nt]]:
+                    seeds.update(ir.symbols[s] for s in ir.rhs(pid)
+                        if ir.kinds[s] == gir.NONTERMINAL)
+    if old_ir.symbols[old_ir.start] != new_ir.symbols[new_ir.start]:
+        seeds.add(old_ir.symbols[old_ir.start])
+        seeds.add(new_ir.symbols[new_ir.start])
+    follow = reach(follow_dependents(new_ir, nullable), seeds)
+
+    defined = set(new_ir.names(new_ir.nonterminals))
+    return (changed, first & defined, follow & defined,
+        (roots | first | follow) & defined)
@@ -0,0 +1,117 @@
+""" Builds LALR(1) parse tables for a CFG with the bundled PLY. """
+# kitchen/backend/lalr_table.py
+
+from dslmodule.gcc.ply import yacc
+
+# actions of the table, each stored as (kind, target)
+(
+    SHIFT,
+    REDUCE,
+    ACCEPT
+) = range(3)
+
+def alias(sid: int) -> str:
+    """Obtains the name given to a symbol in the PLY grammar. Kitchen symbols
+       such as "+" or "(" are not valid PLY names, so symbols are named by
+       their ids instead.
+
+    Args:
+        sid (int): Symbol id.
+
+    Returns:
+        str: PLY symbol name.
+    """
+    return "s" + str(sid)
+
+def to_ply_grammar(ir) -> tuple:
+    """Converts a compiled CFG into a PLY Grammar, augmented with its start
+       symbol.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+
+    Raises:
+        ValueError: If a non-terminal is used, but never defined.
+
+    Returns:
+        tuple: PLY Grammar, and the production id of each PLY production
+        (None for the augmented production).
+    """
+    if ir.undefined != []:
+        raise ValueError("undefined non-terminals: " +
+            ", ".join(ir.names(ir.undefined)))
+
+    grammar = yacc.Grammar([alias(t) for t in ir.terminals if t != ir.end])
+    pids = [None]
+    seen = set()
+    for pid, (nt, rhs) in enumerate(ir.productions):
+        body = [alias(s) for s in rhs if s != ir.epsilon]
+        # PLY rejects repeated productions, which parse the same way anyway
+        if (nt, tuple(body)) in seen:
+            continue
+        seen.add((nt, tuple(body)))
+        grammar.add_production(alias(nt), body)
+        pids.append(pid)
+    grammar.set_start(alias(ir.start))
+    return grammar, pids
+
+class LALRTable:
+    def __init__(self, ir) -> None:
+        """Generates the LALR(1) action and goto tables of a CFG. PLY's
+           tables are converted to lists indexed by state and symbol id, so
+           that they can be pickled with the CFG and do not refer to PLY.
+
+        Args:
+            ir (GrammarIR): Compiled CFG.
+        """
+        grammar, pids = to_ply_grammar(ir)
+        generated = yacc.LRGeneratedTable(grammar, "LALR")
+        ids = {alias(sid): sid for sid in range(len(ir.symbols))}
+        ids["$end"] = ir.end
+
+        # productions, as (lhs id, length, production id)
+        self.productions = [(ids.get(p.name), len(p.prod), pids[p.number])
+            for p in generated.lr_productions]
+
+        self.action = []
+        self.goto = []
+        for state in range(len(generated.lr_action)):
+            row = {}
+            for t, code in generated.lr_action[state].items():
+                if t not in ids:
+                    continue
+                if code > 0:
+                    row[ids[t]] = (SHIFT, code)
+                elif code < 0:
+                    row[ids[t]] = (REDUCE, -code)
+                else:
+                    row[ids[t]] = (ACCEPT, 0)
+            self.action.append(row)
+            self.goto.append({ids[nt]: target for nt, target in
+                generated.lr_goto.get(state, {}).items()})
+
+        # PLY resolves shift/reduce conflicts by shifting, and reduce/reduce
+        # conflicts in favour of the earlier production, as yacc does
+        self.conflicts = [("shift/reduce", state, ir.symbols[ids[t]],
+            resolution) for state, t, resolution in generated.sr_conflicts]
+        self.conflicts += [("reduce/reduce", state,
+            ir.prod_strings[pids[chosen.number]], "rejected " +
+            ir.prod_strings[pids[rejected.number]]) for state, chosen,
+            rejected in generated.rr_conflicts]
+
+    @property
+    def states(self) -> int:
+        """Obtains the number of states of the automaton.
+
+        Returns:
+            int: Number of states.
+        """
+        return len(self.action)
+
+    def is_lalr1(self) -> bool:
+        """Checks whether the table was built without resolving conflicts.
+
+        Returns:
+            bool: True if the CFG is LALR(1).
+        """
+        return self.conflicts == []
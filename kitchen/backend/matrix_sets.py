@@ -0,0 +1,192 @@
+""" Calculates first and follow sets as closures of boolean matrices. """
+# kitchen/backend/matrix_sets.py
+
+import numpy as np
+
+from kitchen.backend import (
+    grammar_ir as gir,
+    first_set as fs
+)
+
+def closure(relation):
+    """Computes the reflexive transitive closure of a relation by repeated
+       squaring, so a chain of n non-terminals needs about log2(n) products.
+       The products are taken in float32, which numpy hands to BLAS; any
+       positive count is a path, so rounding cannot lose one.
+
+    Args:
+        relation (ndarray): Square boolean matrix, where [x, y] holds if
+        x is related to y.
+
+    Returns:
+        ndarray: Boolean matrix, where [x, y] holds if y is reachable from x
+        in zero or more steps.
+    """
+    reach = relation | np.eye(len(relation), dtype=bool)
+    while True:
+        step = reach.astype(np.float32)
+        squared = (step @ step) > 0
+        if np.array_equal(squared, reach):
+            return reach
+        reach = squared
+
+class MatrixSets:
+    def __init__(self, ir, nullable = None) -> None:
+        """Indexes the non-terminals and terminals of a compiled CFG as the
+           rows and columns of the matrices.
+
+        Args:
+            ir (GrammarIR): Compiled CFG.
+            nullable (list, optional): Nullable flags, as obtained from
+            `calculate_nullable`. Defaults to None.
+        """
+        self.ir = ir
+        self.nullable = fs.calculate_nullable(ir) if nullable is None \
+            else nullable
+        # undefined non-terminals get rows of their own, which stay empty
+        self.nts = ir.nonterminals + ir.undefined
+        self.rows = {nt: i for i, nt in enumerate(self.nts)}
+        self.cols = {t: j for j, t in enumerate(ir.terminals)}
+        self.first = None
+        self.follow = None
+
+    def _relation(self, pairs, columns) -> np.ndarray:
+        """Builds a boolean matrix from (row, column) pairs.
+
+        Args:
+            pairs (list): (row, column) pairs.
+            columns (int): Number of columns.
+
+        Returns:
+            ndarray: Boolean matrix with a row per non-terminal.
+        """
+        matrix = np.zeros((len(self.nts), columns), dtype=bool)
+        if pairs != []:
+            rows, cols = zip(*pairs)
+            matrix[list(rows), list(cols)] = True
+        return matrix
+
+    def _split(self, pairs):
+        """Separates (row, symbol id) pairs into the pairs whose symbol is a
+           non-terminal and those whose symbol is a terminal, as matrices.
+
+        Args:
+            pairs (list): (row, symbol id) pairs.
+
+        Returns:
+            tuple: Non-terminal and terminal relations.
+        """
+        nt_pairs = []
+        t_pairs = []
+        for row, s in pairs:
+            if self.ir.kinds[s] == gir.NONTERMINAL:
+                nt_pairs.append((row, self.rows[s]))
+            else:
+                t_pairs.append((row, self.cols[s]))
+        return self._relation(nt_pairs, len(self.nts)), \
+            self._relation(t_pairs, len(self.cols))
+
+    def _leading(self, rhs) -> list:
+        """Obtains the symbols which a sequence may begin with, ie. each
+           symbol up to and including the first which is not nullable.
+
+        Args:
+            rhs (tuple): Symbol ids.
+
+        Returns:
+            list: Symbol ids.
+        """
+        leading = []
+        for s in rhs:
+            if s == self.ir.epsilon:
+                continue
+            leading.append(s)
+            if not self.nullable[s]:
+                break
+        return leading
+
+    def calculate_first_set(self) -> np.ndarray:
+        """Calculates First(A) for every non-terminal A as the closure of
+           "A begins with B" applied to "B begins with terminal t".
+
+        Returns:
+            ndarray: Boolean matrix, non-terminals by terminals.
+        """
+        pairs = [(self.rows[nt], s) for nt, rhs in self.ir.productions
+            for s in self._leading(rhs)]
+        begins_with, direct = self._split(pairs)
+        reach = closure(begins_with).astype(np.float32)
+        self.first = (reach @ direct.astype(np.float32)) > 0
+        return self.first
+
+    def calculate_follow_set(self) -> np.ndarray:
+        """Calculates Follow(X) for every non-terminal X as the closure of
+           "Follow(X) includes Follow(A)", for each A -> a X b where b is
+           nullable, applied to the terminals which directly follow X.
+
+        Returns:
+            ndarray: Boolean matrix, non-terminals by terminals.
+        """
+        if self.first is None:
+            self.calculate_first_set()
+
+        followed_by = []
+        includes = []
+        for nt, rhs in self.ir.productions:
+            rhs = [s for s in rhs if s != self.ir.epsilon]
+            for i, s in enumerate(rhs):
+                if self.ir.kinds[s] != gir.NONTERMINAL:
+                    continue
+                trailer = self._leading(rhs[i + 1:])
+                followed_by += [(self.rows[s], t) for t in trailer]
+                if all(self.nullable[t] for t in trailer) and s != nt:
+                    includes.append((self.rows[s], self.rows[nt]))
+
+        # X is directly followed by each terminal in First(b)
+        by_nt, by_t = self._split(followed_by)
+        direct = by_t | ((by_nt.astype(np.float32) @
+            self.first.astype(np.float32)) > 0)
+        if self.ir.start is not None:
+            direct[self.rows[self.ir.start], self.cols[self.ir.end]] = True
+
+        reach = closure(self._relation(includes,
+            len(self.nts))).astype(np.float32)
+        self.follow = (reach @ direct.astype(np.float32)) > 0
+        return self.follow
+
+    def to_masks(self, matrix) -> dict:
+        """Converts a set matrix into the bitmasks used by the worklist
+           engines.
+
+        Args:
+            matrix (ndarray): Boolean matrix, non-terminals by terminals.
+
+        Returns:
+            dict: Masks, keyed by non-terminal id.
+        """
+        # scatter the terminal columns to their symbol ids, then pack each
+        # row into the bytes of a little-endian integer
+        full = np.zeros((len(self.nts), len(self.ir.symbols)), dtype=bool)
+        full[:, self.ir.terminals] = matrix
+        packed = np.packbits(full, axis=1, bitorder="little")
+        return {nt: int.from_bytes(packed[i].tobytes(), "little")
+            for i, nt in enumerate(self.nts)}
+
+    def first_index(self, first) -> dict:
+        """Finds the production responsible for each terminal of a first
+           set. Where several are, the first production of the CFG is kept.
+
+        Args:
+            first (dict): First set masks.
+
+        Returns:
+            dict: {nt id: {terminal id: production id}}.
+        """
+        index = {nt: {} for nt in self.nts}
+        for pid, (nt, rhs) in enumerate(self.ir.productions):
+            mask, _ = fs.first_of_sequence(self.ir, rhs, first, self.nullable)
+            while mask:
+                low = mask & -mask
+                index[nt].setdefault(low.bit_length() - 1, pid)
+                mask ^= low
+        return index
@@ -0,0 +1,187 @@
+""" Memoises the analysis of CFGs for the length of a session. """
+# kitchen/backend/memo.py
+
+from kitchen import (
+    AMBIGUOUS_ERROR,
+    HEALTH_ERROR,
+    SUCCESS
+)
+
+from kitchen.backend import cache
+
+# stages of the analysis, each of which needs the ones before it
+(
+    FIRST,
+    FOLLOW,
+    PARSETABLE
+) = range(3)
+
+# analyses of this session, keyed by `memo_key`
+_analyses = {}
+
+def memo_key(cfg) -> str:
+    """Obtains the key of a CFG's analysis. This hashes the contents of the
+       CFG along with the kitchen version and cache format, so results are
+       never shared between versions of the algorithms.
+
+    Args:
+        cfg (ContextFreeGrammar): Loaded CFG.
+
+    Returns:
+        str: Key of the analysis.
+    """
+    return cache.cache_key(cfg.cfg_contents, cfg._prune)
+
+def _freeze(sets) -> tuple:
+    """Converts named sets into an immutable value.
+
+    Args:
+        sets (dict): {symbol: list of symbols}.
+
+    Returns:
+        tuple: (symbol, tuple of symbols) pairs, in the order of the sets.
+    """
+    return tuple((key, tuple(items)) for key, items in sets.items())
+
+def _thaw(frozen) -> dict:
+    """Converts a frozen value back into named sets, which the CFG and the
+       visualisations are free to modify.
+
+    Args:
+        frozen (tuple): Value, as obtained from `_freeze`.
+
+    Returns:
+        dict: {symbol: list of symbols}.
+    """
+    return {key: list(items) for key, items in frozen}
+
+def _record(cfg, entry, stage) -> None:
+    """Stores the results of a stage which the CFG currently holds.
+
+    Args:
+        cfg (ContextFreeGrammar): Analysed CFG.
+        entry (dict): Memoised results of the CFG's contents.
+        stage (int): Stage of the analysis.
+    """
+    if stage == FIRST:
+        entry[FIRST] = (_freeze(cfg.first_set), _freeze(cfg.firstset_index),
+            cfg.is_ambiguous)
+    elif stage == FOLLOW:
+        entry[FOLLOW] = _freeze(cfg.follow_set)
+    else:
+        entry[PARSETABLE] = (cfg.parsetable, cfg.parsetable_code)
+
+def _restore(cfg, entry, stage) -> None:
+    """Gives the CFG the memoised results of a stage.
+
+    Args:
+        cfg (ContextFreeGrammar): Loaded CFG.
+        entry (dict): Memoised results of the CFG's contents.
+        stage (int): Stage of the analysis.
+    """
+    if stage == FIRST:
+        first_set, firstset_index, cfg.is_ambiguous = entry[FIRST]
+        cfg.first_set = _thaw(first_set)
+        cfg.firstset_index = _thaw(firstset_index)
+        cfg.first_set_calculated = True
+    elif stage == FOLLOW:
+        cfg.follow_set = _thaw(entry[FOLLOW])
+        cfg.follow_set_calculated = True
+    else:
+        # the parse table is only ever replaced, never modified, so it is
+        # shared rather than copied
+        parsetable, cfg.parsetable_code = entry[PARSETABLE]
+        if cfg.parsetable is not parsetable:
+            cfg.parsetable = parsetable
+            cfg.parser_ll1 = None
+            cfg.is_parser_ll1_set_up = False
+        cfg.parsetable_calculated = True
+
+def _calculate(cfg, stage) -> None:
+    """Calculates a stage of the analysis with the worklist engine,
+       assuming the CFG holds the results of the stages before it. A parse 
+       table with LL(1) conflicts is built in full, and its status code is
+       AMBIGUOUS_ERROR.
+
+    Args:
+        cfg (ContextFreeGrammar): Loaded CFG.
+        stage (int): Stage of the analysis.
+    """
+    if stage == FIRST:
+        cfg.calculate_first_set_worklist()
+        cfg.materialise_sets()
+    elif stage == FOLLOW:
+        cfg.calculate_follow_set_worklist()
+        cfg.materialise_sets()
+    elif cfg.find_ll1_conflicts() != []:
+        # the table is kept, so that its conflicts can be reported
+        cfg.parsetable_code = AMBIGUOUS_ERROR
+
+def _holds(cfg, stage) -> bool:
+    """Checks whether the CFG holds the results of a stage.
+
+    Args:
+        cfg (ContextFreeGrammar): Loaded CFG.
+        stage (int): Stage of the analysis.
+
+    Returns:
+        bool: True if the results are held.
+    """
+    return [cfg.first_set_calculated, cfg.follow_set_calculated,
+        cfg.parsetable_calculated][stage]
+
+def analyse(cfg, stage = PARSETABLE) -> int:
+    """Makes sure the CFG holds the results of every stage up to the given
+       one. If the CFG file was edited, it is reloaded first. Results are
+       served from the memo when its contents were analysed before in this
+       session, so only a CFG which actually changed is analysed again. A
+       CFG with undefined non-terminals or cycles is not analysed at all.
+
+    Args:
+        cfg (ContextFreeGrammar): Loaded CFG.
+        stage (int, optional): Last stage needed. Defaults to PARSETABLE.
+
+    Returns:
+        int: Status code of the parse table, if it was needed, or SUCCESS.
+    """
+    if cfg.has_changed():
+        cfg.reload()
+    if not cfg.get_health().is_healthy():
+        return HEALTH_ERROR
+
+    entry = _analyses.setdefault(memo_key(cfg), {})
+    for s in range(stage + 1):
+        if s in entry:
+            _restore(cfg, entry, s)
+        else:
+            # results loaded from the cache or found by a reload are kept
+            if not _holds(cfg, s):
+                _calculate(cfg, s)
+            _record(cfg, entry, s)
+
+    if stage == PARSETABLE:
+        return cfg.parsetable_code if cfg.parsetable_code != None else \
+            SUCCESS
+    return SUCCESS
+
+def forget(cfg, stage) -> None:
+    """Clears the results of a stage and those after it from the CFG, so
+       that a visualisation can calculate them step by step. The memo keeps
+       them, and `analyse` gives them back.
+
+    Args:
+        cfg (ContextFreeGrammar): Loaded CFG.
+        stage (int): First stage to be cleared.
+    """
+    if stage <= FIRST:
+        cfg.reset_first_set(calculate_again = False)
+        cfg.first_set_calculated = False
+    if stage <= FOLLOW:
+        cfg.reset_follow_set(calculate_again = False)
+        cfg.follow_set_calculated = False
+    cfg.parsetable_calculated = False
+
+def clear() -> None:
+    """Forgets every memoised analysis.
+    """
+    _analyses.clear()
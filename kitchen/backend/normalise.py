@@ -0,0 +1,571 @@
+""" Rewrites CFGs which are nearly LL(1) into ones with a parse table. """
+# kitchen/backend/normalise.py
+
+import anytree
+
+from kitchen.backend import (
+    grammar_ir as gir,
+    health as hl
+)
+
+# suffixes of the non-terminals introduced by each rewrite
+TAIL_SUFFIX = "TAIL"
+REST_SUFFIX = "REST"
+
+# rounds of inlining and left factoring, which bound the growth of the CFG
+MAX_ROUNDS = 8
+
+# suffix of the file the rewritten CFG is written to by default
+NORMALISED_SUFFIX = "_normalised"
+
+# parts of a shape, which describes how the values of a production's
+# children are assembled into nodes of the original CFG:
+#   (CHILD, i): the items of child i
+#   (ARG, i): the items of argument i, given to a helper non-terminal
+#   (NODE, nt, elements): one node of nt, holding the items of its elements
+#   (CALL, value, values): the items returned by a helper non-terminal
+#   (ITEMS, elements): the items of its elements, as a single value
+(
+    CHILD,
+    ARG,
+    NODE,
+    CALL,
+    ITEMS
+) = range(5)
+
+def _fresh(base, used) -> str:
+    """Names a new non-terminal, which must consist of upper case letters.
+
+    Args:
+        base (str): Preferred name.
+        used (set): Names which are taken. The new name is added to it.
+
+    Returns:
+        str: Unused name.
+    """
+    name = base
+    while name in used:
+        name = name + "X"
+    used.add(name)
+    return name
+
+def _rewrite(elements, ref) -> list:
+    """Rewrites the references to children and arguments of a shape.
+
+    Args:
+        elements (list): Shape.
+        ref (function): Maps a (CHILD, i) or (ARG, i) reference to the value
+        which replaces it.
+
+    Returns:
+        list: Rewritten shape.
+    """
+    rewritten = []
+    for e in elements:
+        if e[0] in (CHILD, ARG):
+            value = ref(e)
+            if value[0] == ITEMS:
+                rewritten += value[1]
+            else:
+                rewritten.append(value)
+        elif e[0] == NODE:
+            rewritten.append((NODE, e[1], _rewrite(e[2], ref)))
+        else:
+            rewritten.append((CALL, _rewrite_value(e[1], ref),
+                [_rewrite_value(v, ref) for v in e[2]]))
+    return rewritten
+
+def _rewrite_value(value, ref) -> tuple:
+    """Rewrites the references of a value within a shape.
+
+    Args:
+        value (tuple): (CHILD, i), (ARG, i) or (ITEMS, elements).
+        ref (function): As in `_rewrite`.
+
+    Returns:
+        tuple: Rewritten value.
+    """
+    if value[0] in (CHILD, ARG):
+        return ref(value)
+    return (ITEMS, _rewrite(value[1], ref))
+
+def _substitute(shape, body_shape, length) -> list:
+    """Rewrites the shape of a production A -> B x once its leading B has
+       been replaced by the body of a production B -> y.
+
+    Args:
+        shape (list): Shape of A -> B x.
+        body_shape (list): Shape of B -> y.
+        length (int): Number of symbols in y.
+
+    Returns:
+        list: Shape of A -> y x.
+    """
+    def ref(e):
+        if e == (CHILD, 0):
+            return (ITEMS, body_shape)
+        if e[0] == CHILD:
+            return (CHILD, e[1] - 1 + length)
+        return e
+    return _rewrite(shape, ref)
+
+def _eliminate(nt, grammar, used, arity) -> str:
+    """Eliminates the direct left recursion of a non-terminal, rewriting
+       A -> A x | y as A -> y T and T -> x T | #. The tail T is given the
+       node built so far, so that it can nest it as the original CFG does.
+
+    Args:
+        nt (str): Non-terminal.
+        grammar (dict): {non-terminal: list of (body, shape)}.
+        used (set): Names which are taken.
+        arity (dict): Number of arguments of each helper non-terminal.
+
+    Returns:
+        str: Name of the tail, or None if there was no left recursion to
+        eliminate.
+    """
+    recursive = [(body[1:], shape) for body, shape in grammar[nt]
+        if body[:1] == (nt,) and len(body) > 1]
+    rest = [(body, shape) for body, shape in grammar[nt] if body[:1] != (nt,)]
+    if recursive == [] or rest == []:
+        return None
+
+    tail = _fresh(nt + TAIL_SUFFIX, used)
+    arity[tail] = 1
+    grammar[nt] = [(body + (tail,), [(CALL, (CHILD, len(body)),
+        [(ITEMS, shape)])]) for body, shape in rest]
+
+    def ref(e):
+        if e == (CHILD, 0):
+            return (ARG, 0)
+        if e[0] == CHILD:
+            return (CHILD, e[1] - 1)
+        return e
+    grammar[tail] = [(body + (tail,), [(CALL, (CHILD, len(body)),
+        [(ITEMS, _rewrite(shape, ref))])]) for body, shape in recursive]
+    grammar[tail].append(((), [(ARG, 0)]))
+    return tail
+
+def _factor(nt, grammar, used, arity) -> list:
+    """Left factors the productions of a non-terminal, rewriting
+       A -> x y | x z as A -> x R and R -> y | z. The helper R is given the
+       children of x, so that it can build the nodes of A's productions.
+
+    Args:
+        nt (str): Non-terminal.
+        grammar (dict): {non-terminal: list of (body, shape)}.
+        used (set): Names which are taken.
+        arity (dict): Number of arguments of each helper non-terminal.
+
+    Returns:
+        list: Helper non-terminals which were introduced.
+    """
+    # identical bodies make the CFG ambiguous, and only the first of them
+    # is kept
+    unique = {}
+    for body, shape in grammar[nt]:
+        unique.setdefault(body, shape)
+    grammar[nt] = list(unique.items())
+
+    groups = {}
+    for body, shape in grammar[nt]:
+        if body != ():
+            groups.setdefault(body[0], []).append((body, shape))
+
+    helpers = []
+    alts = []
+    for body, shape in grammar[nt]:
+        group = groups.get(body[0]) if body != () else None
+        if group is None or len(group) == 1:
+            alts.append((body, shape))
+            continue
+        if body != group[0][0]:
+            continue
+
+        # the longest prefix which all bodies of the group share
+        prefix = list(body)
+        for other, _ in group[1:]:
+            n = 0
+            while n < len(prefix) and n < len(other) and \
+                prefix[n] == other[n]:
+                n += 1
+            prefix = prefix[:n]
+        p = len(prefix)
+
+        helper = _fresh(nt + REST_SUFFIX, used)
+        args = arity.get(nt, 0)
+        arity[helper] = p + args
+        alts.append((tuple(prefix) + (helper,), [(CALL, (CHILD, p),
+            [(CHILD, i) for i in range(p)] + [(ARG, a) for a in
+            range(args)])]))
+
+        def ref(e):
+            if e[0] == CHILD:
+                return (ARG, e[1]) if e[1] < p else (CHILD, e[1] - p)
+            return (ARG, p + e[1])
+        grammar[helper] = [(other[p:], _rewrite(shape, ref)) for other, shape
+            in group]
+        helpers.append(helper)
+    grammar[nt] = alts
+    return helpers
+
+def _first_sets(grammar) -> dict:
+    """Finds the first set of each non-terminal of a CFG being rewritten.
+
+    Args:
+        grammar (dict): {non-terminal: list of (body, shape)}.
+
+    Returns:
+        dict: {non-terminal: set of terminals}, which hold epsilon for a
+        nullable non-terminal.
+    """
+    first = {nt: set() for nt in grammar}
+    changed = True
+    while changed:
+        changed = False
+        for nt, alts in grammar.items():
+            for body, _ in alts:
+                found = _first_of(body, first)
+                if not found <= first[nt]:
+                    first[nt] |= found
+                    changed = True
+    return first
+
+def _first_of(body, first) -> set:
+    """Finds the first set of a production body.
+
+    Args:
+        body (tuple): Symbols.
+        first (dict): First sets of the non-terminals.
+
+    Returns:
+        set: Terminals, and epsilon if the body is nullable.
+    """
+    found = set()
+    for s in body:
+        if s not in first:
+            found.add(s)
+            return found
+        found |= first[s] - {gir.EPSILON_SYMBOL}
+        if gir.EPSILON_SYMBOL not in first[s]:
+            return found
+    found.add(gir.EPSILON_SYMBOL)
+    return found
+
+def _inline(nt, grammar, arity, first) -> list:
+    """Replaces a leading non-terminal by its productions wherever its
+       first set clashes with that of another production, so that left
+       factoring can then merge them. Helpers, which expect arguments, are
+       never inlined.
+
+    Args:
+        nt (str): Non-terminal.
+        grammar (dict): {non-terminal: list of (body, shape)}.
+        arity (dict): Number of arguments of each helper non-terminal.
+        first (dict): First sets of the non-terminals.
+
+    Returns:
+        list: Non-terminals which were inlined.
+    """
+    alts = grammar[nt]
+    firsts = [_first_of(body, first) - {gir.EPSILON_SYMBOL} for body, _ in
+        alts]
+    inlined = []
+    rewritten = []
+    for i, (body, shape) in enumerate(alts):
+        lead = body[0] if body != () else None
+        clashes = any(firsts[i] & firsts[j] for j in range(len(alts))
+            if j != i)
+        if lead in grammar and lead != nt and lead not in arity and clashes:
+            for other, other_shape in grammar[lead]:
+                rewritten.append((other + body[1:], _substitute(shape,
+                    other_shape, len(other))))
+            if lead not in inlined:
+                inlined.append(lead)
+        else:
+            rewritten.append((body, shape))
+    grammar[nt] = rewritten
+    return inlined
+
+def _reachable(grammar, start) -> set:
+    """Finds the non-terminals which the start symbol reaches.
+
+    Args:
+        grammar (dict): {non-terminal: list of (body, shape)}.
+        start (str): Start symbol.
+
+    Returns:
+        set: Reachable non-terminals.
+    """
+    found = {start}
+    queue = [start]
+    while queue:
+        for body, _ in grammar[queue.pop()]:
+            for s in body:
+                if s in grammar and s not in found:
+                    found.add(s)
+                    queue.append(s)
+    return found
+
+def normalise(prods) -> tuple:
+    """Eliminates the left recursion of a CFG, both direct and indirect,
+       and then left factors it. Indirect left recursion is removed by
+       substituting the productions of the non-terminals which take part in
+       it, from the last defined to the first. Left recursion hidden behind
+       a nullable prefix is left as it is.
+
+    Args:
+        prods (list): Productions, as obtained from `get_prods`.
+
+    Raises:
+        ValueError: If the CFG has undefined non-terminals or cycles.
+
+    Returns:
+        tuple: Rewritten productions, the Folding which maps parse trees
+        back to the original CFG, and a description of each rewrite.
+    """
+    ir = gir.GrammarIR(prods)
+    health = hl.Health(ir)
+    if not health.is_healthy():
+        raise ValueError(health.errors()[0])
+
+    order = ir.names(ir.nonterminals)
+    used = set(ir.symbols)
+    arity = {}
+    grammar = {}
+    for nt in ir.nonterminals:
+        grammar[ir.symbols[nt]] = []
+        for pid in ir.lead_to[nt]:
+            body = tuple(ir.names(s for s in ir.rhs(pid) if s != ir.epsilon))
+            shape = [(NODE, ir.symbols[nt], [(CHILD, i) for i in
+                range(len(body))])]
+            grammar[ir.symbols[nt]].append((body, shape))
+
+    # non-terminals only need substituting into those they are left
+    # recursive with
+    edges = {nt: [(body[0], None) for body, _ in grammar[nt] if body != ()
+        and body[0] in grammar] for nt in order}
+    component = {}
+    for i, members in enumerate(hl.strongly_connected(order, edges)):
+        for nt in members:
+            component[nt] = i
+
+    # the non-terminals each left recursive group is entered by come first
+    # in the CFG, so they are rewritten last and take in the rest
+    steps = []
+    tails = {}
+    substitution_order = order[::-1]
+    for i, nt in enumerate(substitution_order):
+        for earlier in substitution_order[:i]:
+            if component[earlier] != component[nt]:
+                continue
+            substituted = []
+            for body, shape in grammar[nt]:
+                if body[:1] != (earlier,):
+                    substituted.append((body, shape))
+                    continue
+                for other, other_shape in grammar[earlier]:
+                    substituted.append((other + body[1:], _substitute(shape,
+                        other_shape, len(other))))
+            if substituted != grammar[nt]:
+                steps.append("Substituted " + earlier + " into " + nt)
+            grammar[nt] = substituted
+        tail = _eliminate(nt, grammar, used, arity)
+        if tail != None:
+            steps.append("Eliminated the left recursion of " + nt +
+                " with " + tail)
+            tails[nt] = [tail]
+    output = [s for nt in order for s in [nt] + tails.get(nt, [])]
+
+    # non-terminals which the CFG never reached are kept as they are, but
+    # those which substitution leaves unused are removed
+    unreachable = set(health.unreachable)
+    for _ in range(MAX_ROUNDS):
+        reached = _reachable(grammar, order[0]) | unreachable
+        for nt in output:
+            if nt not in reached:
+                steps.append("Removed " + nt + ", which is no longer used")
+        output = [nt for nt in output if nt in reached]
+
+        queue = list(output)
+        while queue:
+            nt = queue.pop(0)
+            helpers = _factor(nt, grammar, used, arity)
+            for helper in helpers:
+                steps.append("Left factored " + nt + " with " + helper)
+            output[output.index(nt) + 1:output.index(nt) + 1] = helpers
+            queue += helpers
+
+        first = _first_sets(grammar)
+        changed = False
+        for nt in output:
+            for lead in _inline(nt, grammar, arity, first):
+                steps.append("Inlined " + lead + " into " + nt)
+                changed = True
+        if not changed:
+            break
+
+    rewritten = [[nt, [" ".join(body) if body != () else gir.EPSILON_SYMBOL
+        for body, _ in grammar[nt]]] for nt in output]
+    origins = {(nt, body): shape for nt in output for body, shape in
+        grammar[nt]}
+    return rewritten, Folding(origins, set(arity)), steps
+
+def write_cfg(prods, output_path) -> None:
+    """Writes productions out in the CFG file format.
+
+    Args:
+        prods (list): Productions, as obtained from `get_prods`.
+        output_path (Path): Path to the CFG file.
+    """
+    lines = [nt + " -> " + " | ".join(bodies) for nt, bodies in prods]
+    output_path.write_text("\n\n".join(lines) + "\n")
+
+class Folding:
+    def __init__(self, origins, helpers) -> None:
+        """Maps parse trees of a normalised CFG back to the shape of the
+           original CFG.
+
+        Args:
+            origins (dict): Shape of each production, keyed by (non-terminal,
+            body).
+            helpers (set): Non-terminals introduced by the rewrites.
+        """
+        self.origins = origins
+        self.helpers = helpers
+
+        # the productions which derive epsilon, for entries such as A -> #
+        # which the parse table holds for a nullable A
+        self.nullable = {}
+        changed = True
+        while changed:
+            changed = False
+            for (nt, body) in origins:
+                if nt not in self.nullable and all(s in self.nullable for s
+                    in body):
+                    self.nullable[nt] = body
+                    changed = True
+
+    def fold(self, derivation, tokens):
+        """Builds the parse tree of the original CFG from a leftmost
+           derivation in the normalised CFG.
+
+        Args:
+            derivation (list): (non-terminal, body) pairs, as obtained from
+            `ParserLL1.derive`.
+            tokens (list): Tokens of the input.
+
+        Returns:
+            Node: Root of the parse tree.
+        """
+        steps = iter(derivation)
+        tokens = iter(tokens)
+        lhs, body = next(steps)
+        stack = [(lhs, body, [])]
+        while True:
+            lhs, body, values = stack[-1]
+            if len(values) == len(body):
+                stack.pop()
+                value = self._evaluate(lhs, body, values)
+                if stack == []:
+                    return value[0]
+                stack[-1][2].append(value)
+            elif gir.classify(body[len(values)]) == gir.NONTERMINAL:
+                lhs, body = next(steps)
+                stack.append((lhs, body, []))
+            else:
+                symbol = body[len(values)]
+                values.append([anytree.Node(symbol, id=symbol,
+                    token=next(tokens))])
+
+    def _evaluate(self, lhs, body, values):
+        """Obtains the value of a node of the normalised parse tree.
+
+        Args:
+            lhs (str): Non-terminal.
+            body (tuple): Symbols of its production.
+            values (list): Values of its children.
+
+        Returns:
+            list or tuple: Items of the original parse tree, or for a
+            helper, its shape and the values of its children, which are
+            applied to its arguments by `_apply`.
+        """
+        if (lhs, body) not in self.origins:
+            # the non-terminal derives epsilon through others
+            body = self.nullable[lhs]
+            values = [self._evaluate(s, self.nullable[s], []) for s in body]
+        shape = self.origins[(lhs, body)]
+        if lhs in self.helpers:
+            return (shape, values)
+        return self._elements(shape, values, None)
+
+    def _apply(self, helper, args) -> list:
+        """Applies a helper non-terminal to its arguments. The tail of a 
+           left-recursive list ends in a call to the next tail, which is 
+           applied in the same loop, so a long list is folded without
+           recursion.
+
+        Args:
+            helper (tuple): Shape of the helper and the values of its 
+            children.
+            args (list): Values of the arguments.
+
+        Returns:
+            list: Nodes of the original parse tree.
+        """
+        items = []
+        while True:
+            shape, values = helper
+            if shape == [] or shape[-1][0] != CALL:
+                return items + self._elements(shape, values, args)
+            items += self._elements(shape[:-1], values, args)
+            call = shape[-1]
+            helper, args = self._value(call[1], values, args), \
+                [self._value(v, values, args) for v in call[2]]
+
+    def _elements(self, elements, values, args) -> list:
+        """Assembles the items described by a shape.
+
+        Args:
+            elements (list): Shape.
+            values (list): Values of the children.
+            args (list): Values of the arguments.
+
+        Returns:
+            list: Nodes of the original parse tree.
+        """
+        items = []
+        for e in elements:
+            if e[0] == NODE:
+                node = anytree.Node(e[1], id=e[1], token=None)
+                children = self._elements(e[2], values, args)
+                if children == []:
+                    anytree.Node(gir.EPSILON_SYMBOL, parent=node,
+                        id=gir.EPSILON_SYMBOL, token=None)
+                for child in children:
+                    child.parent = node
+                items.append(node)
+            elif e[0] == CALL:
+                items += self._apply(self._value(e[1], values, args),
+                    [self._value(v, values, args) for v in e[2]])
+            else:
+                items += self._value(e, values, args)
+        return items
+
+    def _value(self, value, values, args):
+        """Obtains a value referred to by a shape.
+
+        Args:
+            value (tuple): (CHILD, i), (ARG, i) or (ITEMS, elements).
+            values (list): Values of the children.
+            args (list): Values of the arguments.
+
+        Returns:
+            list or tuple: Value.
+        """
+        if value[0] == CHILD:
+            return values[value[1]]
+        if value[0] == ARG:
+            return args[value[1]]
+        return self._elements(value[1], values, args)
@@ -15,6 +15,11 @@ from kitchen.helpers import (
     error
 )
 
+from kitchen.backend import (
+    bitset as bs,
+    dense_table as dt
+)
+
 class ParsingTable:
     def __init__(self, terminals, nonterminals, cfgd):
         """Initialises a ParsingTable object.
@@ -27,13 +32,79 @@ class ParsingTable:
         """        
         self.first_set = {}
         self.follow_set = {}
-        self.ts = sorted(terminals)
-        self.nts = sorted(nonterminals)
+        self._set_symbols(terminals, nonterminals)
         self.cfg_dict = cfgd
         self.pt_dict = {}
+        self.conflicts = {}
+        # the PREDICT sets, and the dense table built from them
+        self.ir = None
+        self.predict = None
+        self.dense = None
         self.init_parsetable()
         self.calculated = False
 
+    @classmethod
+    def from_dense(cls, dense, cfgd):
+        """Creates a ParsingTable around a DenseTable which has already been
+           built, such as one loaded from a bundle. The rows of `pt_dict` 
+           are only written out if they are asked for.
+
+        Args:
+            dense (DenseTable): Dense table.
+            cfgd (dict): Dictionary containing non-terminals and their 
+            productions. 
+
+        Returns:
+            ParsingTable: Calculated parsing table.
+        """
+        table = cls.__new__(cls)
+        table.first_set = {}
+        table.follow_set = {}
+        table._set_symbols(dense.ir.names(dense.ir.terminals), 
+            dense.ir.names(dense.ir.nonterminals))
+        table.cfg_dict = cfgd
+        table._pt_dict = None
+        table.conflicts = {}
+        table.ir = dense.ir
+        table.predict = None
+        table.dense = dense
+        table.calculated = True
+        return table
+
+    def _set_symbols(self, terminals, nonterminals):
+        """Sets the sorted columns and rows of the table.
+
+        Args:
+            terminals (list): List of terminals. 
+            nonterminals (list): List of non-terminals. 
+        """
+        self.ts = sorted(terminals)
+        self.nts = sorted(nonterminals)
+
+        # positions of each symbol in the table
+        self._rows = {}
+        self._cols = {}
+        for i, nt in enumerate(self.nts):
+            self._rows.setdefault(nt, i)
+        for i, t in enumerate(self.ts):
+            self._cols.setdefault(t, i)
+
+    @property
+    def pt_dict(self):
+        """Obtains the table as a dictionary of rows, writing it out from 
+           the dense table if it was not built as one.
+
+        Returns:
+            dict: {NT: {terminal: entry}}.
+        """
+        if self._pt_dict is None:
+            self._pt_dict = self.dense.to_dict()
+        return self._pt_dict
+
+    @pt_dict.setter
+    def pt_dict(self, value):
+        self._pt_dict = value
+
     def set_internals(self, fs, fw, fs_index):
         """Sets up the internal components of the parsing table. 
 
@@ -63,7 +134,7 @@ class ParsingTable:
         Returns:
             int: Row index
         """        
-        return self.nts.index(nt) + 1
+        return self._rows[nt] + 1
 
     def col(self, t):
         """Obtains the column index of a terminal.
@@ -74,50 +145,148 @@ class ParsingTable:
         Returns:
             int: Column index
         """        
-        return self.ts.index(t) + 1
+        return self._cols[t] + 1
+
+    def set_predict(self, ir, predict):
+        """Sets the PREDICT sets from which the table is built.
+
+        Args:
+            ir (GrammarIR): Compiled CFG.
+            predict (list): (first mask, follow mask) of each production, as 
+            obtained from `calculate_predict_sets`.
+        """
+        self.ir = ir
+        self.predict = predict
+        self.dense = None
+
+    def get_dense(self, compress = False):
+        """Obtains the table as a DenseTable of production ids, building it
+           from the PREDICT sets on first use.
+
+        Args:
+            compress (bool, optional): Packs the rows with row displacement.
+            Defaults to False.
+
+        Returns:
+            DenseTable: Dense table, or None if no PREDICT sets were set.
+            A table without PREDICT sets keeps the dense table it has.
+        """
+        dense = self.dense
+        if dense is not None and compress == (dense.table is None):
+            return dense
+        if self.predict is None:
+            return dense
+        self.dense = dt.DenseTable(self.ir, self.predict, compress)
+        return self.dense
 
     def populate_table(self):
-        """Populates the whole table with the first and follow set, if 
-        appropriate
+        """Populates the whole table from the PREDICT set of each production,
+        in a single pass over the productions. Every conflict is collected 
+        and reported, rather than stopping at the first.
+
+        Returns:
+            int: Status code.
         """
-        for key in self.first_set.keys():
-            for j, item in enumerate(self.first_set[key], start=0):
-                # if the first set contains epsilon, it may disappear. So, 
-                # we need to add elements in the follow set too.
-                if item == "#":
-                    for f in self.follow_set[key]:
-                        prod = key + " -> " + item
-                        if f == "$":
-                            # make A->a in column of "$"
-                            code = self.add_to_parsetable(key, "$", prod)
-                        else:
-                            code = self.add_to_parsetable(key, f, prod)
-                        if code == ERROR: return ERROR
-                else:
-                    # add item to the parse table
-                    prod = self.firstset_index[key][j]
-                    code = self.add_to_parsetable(key, item, prod)
-                    if code == ERROR: return ERROR
-        return SUCCESS
+        self.build_table()
+        return self.report_conflicts()
+
+    def build_table(self):
+        """Fills every row of the table without reporting conflicts.
+
+        Returns:
+            list: Conflicts, as obtained from `get_conflicts`.
+        """
+        self.conflicts = {}
+        self.init_parsetable()
+        for nt in self.ir.nonterminals:
+            self.populate_row(self.ir.symbols[nt])
+        return self.get_conflicts()
+
+    def populate_row(self, key):
+        """Populates the row of a single non-terminal.
+
+        Args:
+            key (str): Non-terminal.
+
+        Returns:
+            int: Status code.
+        """
+        code = SUCCESS
+        for pid in self.ir.productions_of(key):
+            first, follow = self.predict[pid]
+            prod = self.ir.prod_strings[pid]
+            for t in bs.to_ids(first):
+                if self.add_to_parsetable(key, self.ir.symbols[t], prod) \
+                    == ERROR:
+                    code = ERROR
+
+            # a nullable production also derives nothing before Follow(A)
+            for t in bs.to_ids(follow):
+                if self.add_to_parsetable(key, self.ir.symbols[t], prod) \
+                    == ERROR:
+                    code = ERROR
+        return code
+
+    def update_rows(self, keys):
+        """Recalculates the given rows, leaving the rest of the table as is.
+
+        Args:
+            keys (set): Non-terminals whose rows are invalidated.
+
+        Returns:
+            int: Status code.
+        """
+        self.conflicts = {cell: prods for cell, prods in 
+            self.conflicts.items() if cell[0] not in keys}
+        for key in self.ir.names(self.ir.nonterminals):
+            if key in keys:
+                self.pt_dict[key] = {t: "Error" for t in self.ts}
+                self.populate_row(key)
+        return self.report_conflicts()
 
     def add_to_parsetable(self, nt, t, production, testing = False):
-        """Adds a production to the parsetable at a given index. 
+        """Adds a production to the parsetable at a given index. If the cell
+        is already filled by another production, the conflict is recorded 
+        and the first production is kept.
 
         Args:
             nt (str): Non-terminal.
             t (str): Terminal.
             production (str): Production at ParseTable[nt, t].
+
+        Returns:
+            int: Status code.
         """
-        try:
-            if self.pt_dict[nt][t] != "Error":
-                error.ERR_too_many_productions_ll1(nt, t)
-                return ERROR
-            else:
-                self.pt_dict[nt][t] = production
-        except KeyError:
-            self.pt_dict[nt][t] = production
+        row = self.pt_dict.setdefault(nt, {})
+        current = row.get(t, "Error")
+        if current == production:
+            return SUCCESS
+        if current != "Error":
+            self.conflicts.setdefault((nt, t), [current]).append(production)
+            return ERROR
+        row[t] = production
         return SUCCESS
 
+    def get_conflicts(self):
+        """Obtains every conflict found when the table was populated.
+
+        Returns:
+            list: (non-terminal, terminal, productions) triples, in the 
+            order in which they were found.
+        """
+        return [(nt, t, list(prods)) for (nt, t), prods in 
+            self.conflicts.items()]
+
+    def report_conflicts(self):
+        """Displays an error for each conflicting cell of the table.
+
+        Returns:
+            int: Status code.
+        """
+        for nt, t, _ in self.get_conflicts():
+            error.ERR_too_many_productions_ll1(nt, t)
+        return ERROR if self.get_conflicts() != [] else SUCCESS
+
     def get_row_contents(self):
         """Gets the rows as a list of lists. 
 
@@ -157,9 +326,12 @@ class ParsingTable:
         # print heading
         display.general_secho(self.pt_dict)
 
+    def print_dense_table_testing(self, compress = False):
+        """Prints the dense table, in the same form as the parse table, for
+        testing purposes.
 
-
-
-
-
-  
\ No newline at end of file
+        Args:
+            compress (bool, optional): Packs the rows with row displacement.
+            Defaults to False.
+        """
+        display.general_secho(self.get_dense(compress).to_dict())
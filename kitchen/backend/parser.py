@@ -3,15 +3,11 @@
 
 import os
 import anytree
-import re
 from kitchen.helpers.config import TREE_PNG
 from anytree.exporter import DotExporter
 
 from kitchen import (
-        RE_NONTERMINAL, 
         ERROR, 
-        RE_PRODUCTION, 
-        RE_TERMINAL, 
         SUCCESS, 
         PARSING_ERROR
         )
@@ -23,6 +19,11 @@ from kitchen.helpers import (
         config
         )
 
+from kitchen.backend import (
+        grammar_ir as gir,
+        lalr_table as lt
+        )
+
 def init_input(self, inp) -> int:
     """Helper function to (re-)initialise the input of a Parser.
     Args:
@@ -51,6 +52,34 @@ def get_tokens_from_input(inp, spec = None) -> list:
     else:
         return list(filter(None, inp.split(" ")))
 
+def _show_success(root, tokens, semantic: bool, testing = False, 
+    verbose = True):
+    """Notifies the viewer when parsing is successful.
+
+    Args:
+        root (Node): Root of the parse tree.
+        tokens (list): List of tokens.
+        semantic (bool): If parsing is being completed for semantic
+        analysis.
+        testing (bool, optional): Testing mode. Defaults to False.
+        verbose (bool, optional): Verbose mode. Defaults to True.
+    """        
+    types = lang_spec.get_token_format(tokens, types=True)
+    values = lang_spec.get_token_format(tokens, values=True)
+    
+    if not semantic:
+        if testing:
+            display.success_secho("Success.")
+            display.structure_secho(anytree.RenderTree(root, 
+            style= anytree.AsciiStyle()).by_attr("id"))
+            return
+
+        if verbose:
+            display.success_secho("\nSuccessfully parsed token stream '" + 
+            types + "'\nfrom input stream '" + values + 
+            "'.\n\nParse tree:")
+            display.print_parsetree(root)
+
 class ParserLL1:
     def __init__(self, inp, cfg, spec = None):
         """Initialises the parser object.
@@ -62,6 +91,8 @@ class ParserLL1:
         """        
         self.cfg = cfg
         self.pt_dict = cfg.parsetable.pt_dict
+        # cells are looked up by symbol id when the dense table is available
+        self.dense = cfg.parsetable.get_dense()
         self.spec = spec
         init_input(self, inp)
 
@@ -73,12 +104,76 @@ class ParserLL1:
         """        
         # look for any epsilons that came before and add.
         for node in self.root.descendants:
-            if re.match(RE_NONTERMINAL, node.id):
+            if self.cfg.ir.is_nonterminal(node.id):
                 if len(node.children) == 0 and "#" in \
                 self.cfg.first_set[node.id]:
                     anytree.Node("#", parent=node, id= "#", token = None)
         return SUCCESS
 
+    def _entry(self, nt, t) -> str:
+        """Obtains a cell of the parse table, by symbol id when the dense
+           table is available.
+
+        Args:
+            nt (str): Non-terminal of the row.
+            t (str): Terminal of the column.
+
+        Raises:
+            KeyError: If the symbols have no cell.
+
+        Returns:
+            str: Production of the cell, or "Error".
+        """
+        if self.dense is not None:
+            return self.dense.entry(nt, t)
+        return self.pt_dict[nt][t]
+
+    def derive(self, inp = "") -> list:
+        """Parses the input without building a tree, recording the 
+           productions of its leftmost derivation. This is how a CFG which
+           was normalised is parsed, as its derivation is folded back into
+           a tree of the original CFG.
+
+        Args:
+            inp (str, optional): Input string. Defaults to "", which parses
+            the previous input.
+
+        Returns:
+            list: (non-terminal, body) pairs, where the body is a tuple of 
+            symbols, or None if the input is rejected or the parse table
+            has conflicts.
+        """
+        # a table with conflicts may expand without consuming any input
+        if self.cfg.parsetable_code != SUCCESS:
+            return None
+        if inp != "" and init_input(self, inp) != SUCCESS:
+            return None
+        if None in self.tokens:
+            return None
+
+        types = [getattr(t, "type", t) for t in self.tokens] + ["$"]
+        stack = [self.cfg.start_symbol]
+        derivation = []
+        position = 0
+        while stack != []:
+            top = stack.pop()
+            if not self.cfg.ir.is_nonterminal(top):
+                if top != types[position]:
+                    return None
+                position = position + 1
+                continue
+            try:
+                entry = self._entry(top, types[position])
+            except KeyError:
+                return None
+            if entry == "Error":
+                return None
+            lhs, ps = self.cfg.ir.split_entry(entry)
+            body = tuple(p for p in ps if p != "#")
+            derivation.append((lhs, body))
+            stack.extend(reversed(body))
+        return derivation if types[position] == "$" else None
+
     def _parsing_successful(self, tokens, semantic: bool, testing = False, 
         verbose = True):
         """Notifies the viewer when parsing is successful.
@@ -90,21 +185,7 @@ class ParserLL1:
             testing (bool, optional): Testing mode. Defaults to False.
             verbose (bool, optional): Verbose mode. Defaults to True.
         """        
-        types = lang_spec.get_token_format(tokens, types=True)
-        values = lang_spec.get_token_format(tokens, values=True)
-        
-        if not semantic:
-            if testing:
-                display.success_secho("Success.")
-                display.structure_secho(anytree.RenderTree(self.root, 
-                style= anytree.AsciiStyle()).by_attr("id"))
-                return
-
-            if verbose:
-                display.success_secho("\nSuccessfully parsed token stream '" + 
-                types + "'\nfrom input stream '" + values + 
-                "'.\n\nParse tree:")
-                display.print_parsetree(self.root)
+        _show_success(self.root, tokens, semantic, testing, verbose)
 
     def parse_ll1(self, start_symbol, inp="", semantic = False, 
         testing = False) -> int:
@@ -129,7 +210,8 @@ class ParserLL1:
             return
 
         # set up structures
-        tokens = self.tokens[:]
+        # the next token is the last, so matching it takes constant time
+        tokens = self.tokens[::-1]
         original_tokens = self.tokens[:]
         self.stack = []
         self.id_count = 0
@@ -138,37 +220,37 @@ class ParserLL1:
         self.stack.append(start_symbol)
         self.root = anytree.Node(start_symbol, id = start_symbol, token = None)
         self.parents = []
-        self.vertex_ids = []
+        self.vertex_ids = set()
 
         while self.stack != []:
-            # in case we run out of input before the stack is empty
+            top = self.stack[-1]
+            # in case we run out of input before the stack is empty, the
+            # remaining non-terminals are expanded with the $ column, so 
+            # that they may tend to epsilon
             if tokens == []:
-                if re.match(RE_TERMINAL, self.stack[-1]):
+                next = "$"
+                if not self.cfg.ir.is_nonterminal(top):
                     if not semantic:
-                        error.ERR_parsing_error(self.root, "Expected " + 
-                        self.stack[-1])
-                else:
-                    # parsing is successful if the remaining non-terminal 
-                    # may tend to epsilon
-                    if "#" in self.cfg.first_set[self.stack[-1]] and \
-                    len(self.stack) == 1:
-                        self._parsing_successful(original_tokens, semantic, 
-                        testing)
-                        return SUCCESS
+                        error.ERR_parsing_error(self.root, "Expected " + top)
+                    return PARSING_ERROR
+                entry = self._entry(top, next)
+                if entry == "Error":
                     if not semantic:
                         error.ERR_parsing_error(self.root)
-                return PARSING_ERROR
-
-            top = self.stack[-1]
-            try:
-                next = tokens[0].type
-            except:
-                next = tokens[0]
+                    return PARSING_ERROR
+                if top not in self.cfg.loops and \
+                self.cfg.ir.split_entry(entry)[1] == ["#"]:
+                    self._end_with_epsilon()
+                    continue
+            else:
+                try:
+                    next = tokens[-1].type
+                except:
+                    next = tokens[-1]
 
-            if re.match(RE_TERMINAL, top) or top == "$":
+            if self.cfg.ir.is_terminal(top):
                 if top == next:
-                    prev_token = tokens[0]
-                    tokens = tokens[1:]
+                    prev_token = tokens.pop()
                     p = self.stack.pop()
 
                     if self.parents != []:
@@ -188,10 +270,10 @@ class ParserLL1:
                             "Unexpected token [" + top + "]")
                     return PARSING_ERROR
 
-            elif re.match(RE_NONTERMINAL, top):
+            elif self.cfg.ir.is_nonterminal(top):
 
                 try:
-                    pt_entry = self.pt_dict[top][next]
+                    pt_entry = self._entry(top, next)
 
                     if self.parents != []:
                         replaced_parent = self.parents[-1]
@@ -200,8 +282,12 @@ class ParserLL1:
                         self._call_ptable_error(top, next)
                         return
 
-                    prods = pt_entry.split("->")
-                    
+                    lhs, ps = self.cfg.ir.split_entry(pt_entry)
+
+                    if top in self.cfg.loops:
+                        self._iterate(top, ps)
+                        continue
+
                     self.stack.pop()
 
                     if top != start_symbol:
@@ -210,10 +296,6 @@ class ParserLL1:
                         if to_be_appended.parent == None:
                             to_be_appended.parent = to_be_appended.tmp_parent
 
-                    # add sequence of productions to the stack
-                    ps = list(filter(None, re.findall(
-                        RE_PRODUCTION, prods[1])))
-                    
                     nodes_to_append = []
                     stack_to_append = []
 
@@ -226,12 +308,17 @@ class ParserLL1:
                                 v_id = v_id + "_" + str(self.id_count)
                                 self.id_count = self.id_count + 1
            
-                            new_node = anytree.Node(p, parent=self.root, id=p, 
+                            # loop states are never part of the tree, and
+                            # the items of a loop are attached as they are
+                            # parsed, so the nodes after them must wait
+                            new_node = anytree.Node(p, parent=None if 
+                            self.cfg.loops.intersection(ps) else self.root,
+                            id=p, 
                             tmp_p = self.root.id, tmp_parent = self.root, 
                             vertex_id = v_id,
                             parent_id = self.root.id,
                             token = None)
-                            self.vertex_ids.append(v_id)
+                            self.vertex_ids.add(v_id)
 
                         else:
                             # add connecting node if it is a non-terminal
@@ -243,11 +330,11 @@ class ParserLL1:
                                 self.id_count = self.id_count + 1
                           
                             new_node = anytree.Node(
-                                p, id=p, parent = None, tmp_p=prods[0].strip(),
+                                p, id=p, parent = None, tmp_p=lhs,
                                 vertex_id = v_id,
                                 parent_id = replaced_parent.vertex_id,
                                 tmp_parent = replaced_parent, token = None)
-                            self.vertex_ids.append(v_id)
+                            self.vertex_ids.add(v_id)
 
                         # we don't need to match epsilon, and we also only 
                         # want non-terminals as parent nodes
@@ -282,6 +369,56 @@ class ParserLL1:
         self._parsing_successful(original_tokens, semantic, testing)               
         return SUCCESS
 
+    def _end_with_epsilon(self):
+        """Derives epsilon from the non-terminal on top of the stack once
+           the input has run out, giving its node an epsilon leaf.
+        """
+        self.stack.pop()
+        if self.parents == []:
+            node = self.root
+        else:
+            node = self.parents.pop()
+            if node.parent == None:
+                node.parent = node.tmp_parent
+        if node.children == ():
+            anytree.Node("#", parent=node, id="#", token=None)
+
+    def _iterate(self, top, ps):
+        """Runs one step of the loop state of an EBNF operator. The loop
+           state stays on the stack while its symbol repeats, and the nodes
+           of each repetition are given to the node which holds the loop, 
+           so a list is parsed without recursion and its tree stays flat.
+
+        Args:
+            top (str): Helper non-terminal of the EBNF operator.
+            ps (list): Body of the production chosen by the parse table.
+        """
+        state = self.parents[-1]
+        body = [p for p in ps if p != "#"]
+        if body[-1:] == [top]:
+            body = body[:-1]
+        else:
+            # the loop or option is finished
+            self.stack.pop()
+            self.parents.pop()
+
+        nodes = []
+        for p in body:
+            v_id = state.tmp_parent.id + "_" + p
+            if v_id in self.vertex_ids:
+                v_id = v_id + "_" + str(self.id_count)
+                self.id_count = self.id_count + 1
+            nodes.append(anytree.Node(p, id=p, parent=None, 
+                tmp_p=state.tmp_p, vertex_id=v_id, 
+                parent_id=state.parent_id, tmp_parent=state.tmp_parent,
+                token=None))
+            self.vertex_ids.add(v_id)
+
+        for n in reversed(nodes):
+            self.parents.append(n)
+        for p in reversed(body):
+            self.stack.append(p)
+
     def export_tree(self):
         """Exports parse tree as a PNG image.
         """        
@@ -319,3 +456,165 @@ class ParserLL1:
         error.ERR_parsing_error(self.root,
                 "ParseTable[" + top + ", " + next + "] is empty.")
 
+class ParserLALR:
+    def __init__(self, inp, cfg, spec = None):
+        """Initialises the LALR(1) parser object.
+
+        Args:
+            inp (str): Input string.
+            cfg (ContextFreeGrammar): Loaded CFG.
+            spec (Specification, optional): Language specification. 
+            Defaults to None.
+        """
+        self.cfg = cfg
+        self.table = cfg.get_lalr_table()
+        self.spec = spec
+        self.root = None
+        self.inp = ""
+        self.tokens = []
+        init_input(self, inp)
+
+    def _shift(self, token, name):
+        """Creates the leaf of a shifted terminal.
+
+        Args:
+            token (Token or str): Token from the input stream.
+            name (str): Terminal.
+
+        Returns:
+            Node: Leaf of the parse tree.
+        """
+        return anytree.Node(name, id=name, token=token)
+
+    def _reduce(self, lhs, children):
+        """Creates the node of a reduced non-terminal. A production with no
+           symbols derives epsilon, as in the LL(1) parse tree.
+
+        Args:
+            lhs (str): Non-terminal.
+            children (list): Nodes of the production body.
+
+        Returns:
+            Node or list: Node of the parse tree, or the items of an EBNF 
+            operator, which are given to the node holding them.
+        """
+        # the helpers of EBNF operators gather their items in a list, in
+        # reverse so that each repetition is added in constant time
+        if lhs in self.cfg.loops:
+            if children == []:
+                return []
+            items = children[-1] if isinstance(children[-1], list) else []
+            items.append(children[0])
+            return items
+
+        node = anytree.Node(lhs, id=lhs, token=None)
+        children = self._flatten(children)
+        if children == []:
+            anytree.Node("#", parent=node, id="#", token=None)
+        for child in children:
+            child.parent = node
+        return node
+
+    def _flatten(self, children) -> list:
+        """Replaces the item lists of EBNF operators by their items.
+
+        Args:
+            children (list): Nodes and item lists.
+
+        Returns:
+            list: Nodes.
+        """
+        nodes = []
+        for child in children:
+            if isinstance(child, list):
+                nodes.extend(reversed(child))
+            else:
+                nodes.append(child)
+        return nodes
+
+    def _partial_tree(self, nodes):
+        """Gathers the subtrees built so far under the start symbol, to show
+           where parsing failed.
+
+        Args:
+            nodes (list): Nodes of the parse stack.
+
+        Returns:
+            Node: Root of the partial tree.
+        """
+        root = anytree.Node(self.cfg.start_symbol, id=self.cfg.start_symbol,
+            token=None)
+        for node in self._flatten(nodes):
+            node.parent = root
+        return root
+
+    def parse_lalr(self, inp = "", semantic = False, testing = False) -> int:
+        """LALR(1) Parser: Generates a parse tree and stores this to 
+           self.root. Each token is shifted once and each node is created
+           by one reduction, so parsing takes linear time.
+
+        Args:
+            inp (str, optional): Input string. Defaults to "", which parses
+            the previous input.
+            semantic (bool, optional): If parsing is being completed for 
+            semantic analysis, in which case nothing is displayed. Defaults
+            to False.
+            testing (bool, optional): Testing mode. Defaults to False.
+
+        Returns:
+            int: Status code
+        """
+        if inp != "":
+            init_input(self, inp)
+        elif self.tokens == []:
+            return ERROR
+
+        if None in self.tokens:
+            display.fail_secho("Not all tokens from the input stream were \
+                matched :(\nParsing failed.")
+            return PARSING_ERROR
+
+        ir = self.cfg.ir
+        action = self.table.action
+        goto = self.table.goto
+        productions = self.table.productions
+
+        states = [0]
+        nodes = []
+        i = 0
+        while True:
+            if i < len(self.tokens):
+                token = self.tokens[i]
+                name = getattr(token, "type", token)
+            else:
+                token = name = gir.END_MARKER
+            t = ir.ids.get(name)
+            kind, target = action[states[-1]].get(t, (None, None))
+
+            if kind == lt.SHIFT:
+                states.append(target)
+                nodes.append(self._shift(token, name))
+                i += 1
+            elif kind == lt.REDUCE:
+                lhs, length, _ = productions[target]
+                children = nodes[len(nodes) - length:]
+                del nodes[len(nodes) - length:]
+                del states[len(states) - length:]
+                nodes.append(self._reduce(ir.symbols[lhs], children))
+                states.append(goto[states[-1]][lhs])
+            elif kind == lt.ACCEPT:
+                self.root = nodes[-1]
+                _show_success(self.root, self.tokens, semantic, testing)
+                return SUCCESS
+            else:
+                if not semantic:
+                    detail = "Unexpected end of input." if name == \
+                        gir.END_MARKER else "Unexpected token [" + name + "]"
+                    self.root = self._partial_tree(nodes)
+                    error.ERR_parsing_error(self.root, detail)
+                return PARSING_ERROR
+
+    def export_tree(self):
+        """Exports parse tree as a PNG image.
+        """
+        ParserLL1.export_tree(self)
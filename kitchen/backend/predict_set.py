@@ -0,0 +1,37 @@
+""" Calculates the PREDICT set of every production of a compiled grammar. """
+# kitchen/backend/predict_set.py
+
+from kitchen.backend import (
+    bitset as bs,
+    first_set as fs,
+    follow_set as fw
+)
+
+def calculate_predict_sets(ir, first = None, nullable = None,
+    follow = None) -> list:
+    """Calculates which terminals select each production. A production
+       A -> a is predicted by First(a), and also by Follow(A) if a is
+       nullable. The two parts are kept apart, since a cell reached through
+       Follow(A) holds the entry A -> #.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+        first (dict, optional): First set masks. Defaults to None.
+        nullable (list, optional): Nullable flags. Defaults to None.
+        follow (dict, optional): Follow set masks. Defaults to None.
+
+    Returns:
+        list: (first mask, follow mask) of each production, by production id.
+    """
+    if nullable is None:
+        nullable = fs.calculate_nullable(ir)
+    if first is None:
+        first = fs.calculate_first_set(ir, nullable)[0]
+    if follow is None:
+        follow = fw.calculate_follow_set(ir, first, nullable)
+
+    predict = []
+    for nt, rhs in ir.productions:
+        mask, empty = fs.first_of_sequence(ir, rhs, first, nullable)
+        predict.append((mask, follow[nt] if empty else bs.EMPTY))
+    return predict
@@ -0,0 +1,115 @@
+""" Finds and removes the useless non-terminals of a CFG. """
+# kitchen/backend/prune.py
+
+from collections import deque
+
+from kitchen.backend import grammar_ir as gir
+
+def productive(ir) -> set:
+    """Finds the non-terminals which derive a string of terminals. Each
+       production counts the non-terminals in its body which are not yet
+       known to be productive, so every production is visited once per
+       symbol in its body.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+
+    Returns:
+        set: Ids of the productive non-terminals.
+    """
+    pending = []
+    users = {}
+    queue = deque()
+    found = set()
+    for pid, (nt, rhs) in enumerate(ir.productions):
+        body = {s for s in rhs if ir.kinds[s] == gir.NONTERMINAL}
+        pending.append(len(body))
+        for s in body:
+            users.setdefault(s, []).append(pid)
+        if not body and nt not in found:
+            found.add(nt)
+            queue.append(nt)
+
+    while queue:
+        for pid in users.get(queue.popleft(), ()):
+            pending[pid] -= 1
+            nt = ir.productions[pid][0]
+            if pending[pid] == 0 and nt not in found:
+                found.add(nt)
+                queue.append(nt)
+    return found
+
+def reachable(ir, live) -> set:
+    """Finds the non-terminals which appear in a sentential form of the start
+       symbol, using only productions whose non-terminals are all live.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+        live (set): Ids of the productive non-terminals.
+
+    Returns:
+        set: Ids of the reachable non-terminals.
+    """
+    if ir.start is None or ir.start not in live:
+        return set()
+    found = {ir.start}
+    queue = deque(found)
+    while queue:
+        for pid in ir.lead_to[queue.popleft()]:
+            rhs = ir.rhs(pid)
+            if any(ir.kinds[s] == gir.NONTERMINAL and s not in live
+                for s in rhs):
+                continue
+            for s in rhs:
+                if ir.kinds[s] == gir.NONTERMINAL and s not in found:
+                    found.add(s)
+                    queue.append(s)
+    return found
+
+def find_useless(ir) -> tuple:
+    """Finds the useless non-terminals of a CFG. Non-terminals which are used
+       but never defined are unproductive.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+
+    Returns:
+        tuple: Names of the unproductive non-terminals, and of the productive
+        ones which cannot be reached from the start symbol.
+    """
+    live = productive(ir)
+    reached = reachable(ir, live)
+    unproductive = [ir.symbols[nt] for nt in ir.nonterminals + ir.undefined
+        if nt not in live]
+    unreachable = [ir.symbols[nt] for nt in ir.nonterminals
+        if nt in live and nt not in reached]
+    return unproductive, unreachable
+
+def prune(prods) -> tuple:
+    """Removes the useless non-terminals of a CFG, along with every
+       production which uses one. A CFG whose start symbol is unproductive
+       derives nothing, and is left as it is.
+
+    Args:
+        prods (list): Productions, as obtained from `get_prods`.
+
+    Returns:
+        tuple: Remaining productions, and the names of the unproductive and
+        unreachable non-terminals which were removed.
+    """
+    ir = gir.GrammarIR(prods)
+    unproductive, unreachable = find_useless(ir)
+    if unproductive == [] and unreachable == []:
+        return prods, [], []
+    if ir.start is None or ir.symbols[ir.start] in unproductive:
+        return prods, [], []
+
+    useless = set(unproductive) | set(unreachable)
+    pruned = []
+    for p_seq in prods:
+        if p_seq[0] in useless:
+            continue
+        bodies = [body for body in p_seq[1] if not useless.intersection(
+            gir.tokenise(body))]
+        pruned.append([p_seq[0], bodies])
+    return pruned, unproductive, unreachable
@@ -0,0 +1,340 @@
+""" Generates sentences of a CFG for load-testing the parsers. """
+# kitchen/backend/sentence_generator.py
+
+import math
+import random
+import re
+
+try:
+    import re._parser as sre_parse
+except ImportError:
+    import sre_parse
+
+from kitchen.backend import grammar_ir as gir
+
+# the longest run a regex repeat such as * or + is sampled with
+MAX_REPEAT = 8
+
+# candidate lexemes sampled for each terminal of a spec
+LEXEME_POOL = 32
+
+# printable characters which a negated class or . may produce
+_PRINTABLE = [chr(c) for c in range(33, 127)]
+
+_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: [chr(c) for c in range(48, 58)],
+    sre_parse.CATEGORY_WORD: [c for c in _PRINTABLE if c.isalnum()] + ["_"],
+    sre_parse.CATEGORY_SPACE: [" "],
+}
+
+def _fixpoint(ir, combine) -> tuple:
+    """Finds the least value of each non-terminal over its productions,
+       where the value of a production is combined from its body symbols.
+       Unproductive non-terminals keep an infinite value.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+        combine (function): Obtains the value of a body from the values of
+        its symbols.
+
+    Returns:
+        tuple: Values of the symbols, indexed by id, and of the productions.
+    """
+    value = [math.inf] * len(ir.symbols)
+    for t in ir.terminals:
+        value[t] = 1
+    value[ir.epsilon] = 0
+    prods = [math.inf] * len(ir.productions)
+
+    changed = True
+    while changed:
+        changed = False
+        for pid, (nt, rhs) in enumerate(ir.productions):
+            prods[pid] = combine([value[s] for s in rhs])
+            if prods[pid] < value[nt]:
+                value[nt] = prods[pid]
+                changed = True
+    return value, prods
+
+class SentenceGenerator:
+    def __init__(self, ir, min_length = 1, max_length = 50, max_depth = 100,
+        mutate = 0.0, spec = None, seed = None) -> None:
+        """Prepares the productions of a CFG for random derivation. Each
+           sentence aims for a length drawn uniformly between the bounds, and
+           expansions deeper than the depth limit are closed as quickly as
+           possible.
+
+        Args:
+            ir (GrammarIR): Compiled CFG.
+            min_length (int, optional): Shortest target length. Defaults to 1.
+            max_length (int, optional): Longest target length. Defaults to 50.
+            max_depth (int, optional): Depth of the derivation after which
+            only the shallowest productions are chosen. Defaults to 100.
+            mutate (float, optional): Chance of a sentence being made
+            near-valid by one random edit. Defaults to 0.0.
+            spec (Specification, optional): Spec whose token patterns give
+            concrete lexemes. Defaults to None, which emits terminals.
+            seed (int, optional): Seed of the generator. Defaults to None.
+
+        Raises:
+            ValueError: If the start symbol derives no sentence.
+        """
+        self.ir = ir
+        self.min_length = min_length
+        self.max_length = max(min_length, max_length)
+        self.max_depth = max_depth
+        self.mutate = mutate
+        self.rng = random.Random(seed)
+
+        self.min_len, prod_len = _fixpoint(ir, sum)
+        self.min_height, prod_height = _fixpoint(ir,
+            lambda values: 1 + max(values, default=0))
+        if ir.start is None or self.min_len[ir.start] == math.inf:
+            raise ValueError("the start symbol derives no sentence")
+
+        # bodies without epsilon, each with its shortest yield, in order of
+        # the CFG. Productions which derive nothing are left out
+        self.bodies = {}
+        self.shortest = {}
+        self.shallowest = {}
+        for nt in ir.nonterminals:
+            pids = [pid for pid in ir.lead_to[nt] if prod_len[pid] != math.inf]
+            if pids == []:
+                continue
+            self.bodies[nt] = [(tuple(s for s in ir.rhs(pid) if s !=
+                ir.epsilon), prod_len[pid]) for pid in pids]
+            self.shortest[nt] = self.bodies[nt][min(range(len(pids)),
+                key=lambda i: prod_len[pids[i]])][0]
+            self.shallowest[nt] = self.bodies[nt][min(range(len(pids)),
+                key=lambda i: prod_height[pids[i]])][0]
+
+        self.is_nonterminal = [kind == gir.NONTERMINAL for kind in ir.kinds]
+        self.terminals = [t for t in ir.terminals if t != ir.end]
+        self.names = list(ir.symbols)
+        if spec != None:
+            self.lexemes = lexeme_pools(ir, spec, self.rng)
+        else:
+            self.lexemes = None
+
+    def derive(self, target) -> list:
+        """Derives a sentence of about the target length. A production is
+           chosen at random among those whose shortest yield still fits the
+           target, or else the one with the shortest yield. Epsilon is only
+           chosen at random once the target is reached, so that sentences do
+           not stop short of it.
+
+        Args:
+            target (int): Number of tokens aimed for.
+
+        Returns:
+            list: Terminal ids of the sentence.
+        """
+        rng = self.rng
+        is_nonterminal = self.is_nonterminal
+        min_len = self.min_len
+        tokens = []
+        stack = [(self.ir.start, 0)]
+        # shortest yield of everything on the stack
+        pending = min_len[self.ir.start]
+        while stack:
+            top, depth = stack.pop()
+            if not is_nonterminal[top]:
+                tokens.append(top)
+                pending -= 1
+                continue
+
+            pending -= min_len[top]
+            if depth >= self.max_depth:
+                body = self.shallowest[top]
+            else:
+                room = target - len(tokens) - pending
+                fits = [b for b, length in self.bodies[top] if length <= room
+                    and (b != () or room <= 0)]
+                body = rng.choice(fits) if fits else self.shortest[top]
+            for s in reversed(body):
+                stack.append((s, depth + 1))
+                pending += min_len[s]
+        return tokens
+
+    def _mutate(self, tokens) -> list:
+        """Makes a sentence near-valid by deleting, repeating, swapping or
+           replacing one of its tokens.
+
+        Args:
+            tokens (list): Terminal ids of a sentence.
+
+        Returns:
+            list: Terminal ids of the edited sentence.
+        """
+        rng = self.rng
+        if tokens == []:
+            return [rng.choice(self.terminals)]
+        i = rng.randrange(len(tokens))
+        edit = rng.randrange(4)
+        if edit == 0:
+            del tokens[i]
+        elif edit == 1:
+            tokens.insert(i, tokens[i])
+        elif edit == 2 and len(tokens) > 1:
+            j = i + 1 if i + 1 < len(tokens) else i - 1
+            tokens[i], tokens[j] = tokens[j], tokens[i]
+        else:
+            tokens[i] = rng.choice(self.terminals)
+        return tokens
+
+    def sentence(self) -> str:
+        """Generates one sentence.
+
+        Returns:
+            str: Space-separated terminals, or lexemes if a spec was given.
+        """
+        tokens = self.derive(self.rng.randint(self.min_length,
+            self.max_length))
+        if self.mutate and self.rng.random() < self.mutate:
+            tokens = self._mutate(tokens)
+        if self.lexemes != None:
+            choice = self.rng.choice
+            return " ".join(choice(self.lexemes[t]) for t in tokens)
+        names = self.names
+        return " ".join(names[t] for t in tokens)
+
+    def sentences(self, count = None):
+        """Generates sentences one at a time, so that any number of them can
+           be streamed without being held in memory.
+
+        Args:
+            count (int, optional): Number of sentences. Defaults to None,
+            which generates them indefinitely.
+
+        Yields:
+            str: Sentence.
+        """
+        n = 0
+        while count is None or n < count:
+            yield self.sentence()
+            n += 1
+
+def sample_regex(pattern, rng) -> str:
+    """Produces a random string which a regex matches, for the constructs
+       used in specifications: literals, classes, groups, alternation and
+       repeats. Repeats are cut off at MAX_REPEAT.
+
+    Args:
+        pattern (str): Regex.
+        rng (Random): Random number generator.
+
+    Returns:
+        str: Random string.
+    """
+    return "".join(_sample(sre_parse.parse(pattern), rng))
+
+def _sample(parsed, rng) -> list:
+    """Samples the characters of a parsed regex.
+
+    Args:
+        parsed (SubPattern): Parsed regex.
+        rng (Random): Random number generator.
+
+    Returns:
+        list: Characters.
+    """
+    out = []
+    for op, av in parsed:
+        if op == sre_parse.LITERAL:
+            out.append(chr(av))
+        elif op == sre_parse.NOT_LITERAL:
+            out.append(rng.choice([c for c in _PRINTABLE if ord(c) != av]))
+        elif op == sre_parse.ANY:
+            out.append(rng.choice(_PRINTABLE))
+        elif op == sre_parse.IN:
+            out.append(rng.choice(_class_members(av)))
+        elif op == sre_parse.BRANCH:
+            out += _sample(rng.choice(av[1]), rng)
+        elif op == sre_parse.SUBPATTERN:
+            out += _sample(av[-1], rng)
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            low, high, item = av
+            high = min(high, low + MAX_REPEAT)
+            for _ in range(rng.randint(low, high)):
+                out += _sample(item, rng)
+    return out
+
+def _class_members(items) -> list:
+    """Lists the printable characters of a regex character class.
+
+    Args:
+        items (list): Parsed members of the class.
+
+    Returns:
+        list: Characters.
+    """
+    members = set()
+    negate = False
+    for op, av in items:
+        if op == sre_parse.NEGATE:
+            negate = True
+        elif op == sre_parse.LITERAL:
+            members.add(chr(av))
+        elif op == sre_parse.RANGE:
+            members.update(chr(c) for c in range(av[0], av[1] + 1))
+        elif op == sre_parse.CATEGORY:
+            members.update(_CATEGORIES.get(av, []))
+    if negate:
+        return [c for c in _PRINTABLE if c not in members]
+    return sorted(members)
+
+def lexeme_pools(ir, spec, rng) -> dict:
+    """Samples lexemes for every terminal of a CFG from its spec. Only
+       lexemes which the spec's lexer reads back as the same terminal are
+       kept, and reserved words stand for themselves.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+        spec (Specification): Language specification.
+        rng (Random): Random number generator.
+
+    Raises:
+        ValueError: If no lexeme could be found for a terminal.
+
+    Returns:
+        dict: Lexemes, keyed by terminal id.
+    """
+    pools = {}
+    for t in ir.terminals:
+        name = ir.symbols[t]
+        if t == ir.end:
+            continue
+        if name in spec.reserved_words:
+            pools[t] = [name]
+            continue
+        pool = set()
+        pattern = spec.token_spec.get(name, re.escape(name))
+        for _ in range(LEXEME_POOL * 4):
+            lexeme = sample_regex(pattern, rng)
+            if lexeme != "" and " " not in lexeme and \
+                spec._match(lexeme) == name:
+                pool.add(lexeme)
+            if len(pool) == LEXEME_POOL:
+                break
+        if pool == set():
+            raise ValueError("no lexeme of " + name + " is read back as " +
+                name + " by the spec")
+        pools[t] = sorted(pool)
+    return pools
+
+def write_sentences(sentences, stream) -> int:
+    """Writes sentences to a stream, one per line.
+
+    Args:
+        sentences (iterable): Sentences.
+        stream (file): Text stream.
+
+    Returns:
+        int: Number of sentences written.
+    """
+    n = 0
+    for sentence in sentences:
+        stream.write(sentence)
+        stream.write("\n")
+        n += 1
+    return n
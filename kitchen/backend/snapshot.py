@@ -0,0 +1,187 @@
+""" Freezes the analysis of a CFG so that it can be shared by threads. """
+# kitchen/backend/snapshot.py
+
+from types import MappingProxyType
+import anytree
+
+from kitchen import (
+    ERROR,
+    PARSING_ERROR,
+    SUCCESS
+)
+
+from kitchen.helpers import lang_spec
+
+from kitchen.backend import (
+    dense_table as dt,
+    grammar_ir as gir
+)
+
+class ParseResult:
+    __slots__ = ("code", "root", "tokens", "error")
+
+    def __init__(self, code, root = None, tokens = None, error = "") -> None:
+        """Holds the outcome of one parse, which belongs to its caller alone.
+
+        Args:
+            code (int): Status code.
+            root (Node, optional): Root of the parse tree, or of the tree
+            built before parsing failed. Defaults to None.
+            tokens (list, optional): Token stream. Defaults to None.
+            error (str, optional): Why parsing failed. Defaults to "".
+        """
+        self.code = code
+        self.root = root
+        self.tokens = tokens
+        self.error = error
+
+class GrammarSnapshot:
+    def __init__(self, cfg) -> None:
+        """Copies the results of an analysed LL(1) CFG into a snapshot which
+           cannot be modified. The parse table is copied once for the
+           snapshot, and every parse only reads it, so any number of
+           threads may parse with one snapshot at the same time. Later
+           changes to the CFG, such as a reload, do not reach it.
+
+        Args:
+            cfg (ContextFreeGrammar): CFG, which is analysed.
+
+        Raises:
+            ValueError: If the CFG is unhealthy or not LL(1).
+        """
+        health = cfg.get_health()
+        if not health.is_healthy():
+            raise ValueError(health.errors()[0])
+        # the worklist engine handles left-recursive and deep CFGs
+        cfg.calculate_follow_set_worklist()
+        cfg.materialise_sets()
+        if cfg.find_ll1_conflicts() != []:
+            raise ValueError("The CFG is not LL(1), as its parse table has " +
+                "conflicts.")
+
+        # copies of the arrays, as a reloaded CFG patches the table it holds
+        arrays = {name: array.copy() for name, array in
+            cfg.parsetable.get_dense().arrays().items()}
+        for array in arrays.values():
+            array.flags.writeable = False
+        table = dt.DenseTable.from_arrays(cfg.ir, arrays)
+
+        ir = cfg.ir
+        frozen = {
+            "ir": ir,
+            "table": table,
+            "start_symbol": cfg.start_symbol,
+            "start": ir.ids[cfg.start_symbol],
+            "end": ir.ids[gir.END_MARKER],
+            "loops": frozenset(ir.ids[nt] for nt in getattr(cfg, "loops",
+                ())),
+            "first_set": MappingProxyType({nt: tuple(items) for nt, items in
+                cfg.first_set.items()}),
+            "follow_set": MappingProxyType({nt: tuple(items) for nt, items
+                in cfg.follow_set.items()}),
+            # the body of each production, without epsilon
+            "bodies": tuple(tuple(s for s in rhs if s != ir.epsilon) for _,
+                rhs in ir.productions)
+        }
+        for name, value in frozen.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError("GrammarSnapshot is immutable")
+
+    def __delattr__(self, name) -> None:
+        raise AttributeError("GrammarSnapshot is immutable")
+
+    def tokenise(self, inp, spec = None) -> list:
+        """Obtains the token stream of an input without printing anything,
+           so that threads do not interleave their messages.
+
+        Args:
+            inp (str): Input string.
+            spec (Specification, optional): Language specification. Defaults
+            to None, in which case each word of the input is a token.
+
+        Returns:
+            list: Token stream, or None if a word matches no token.
+        """
+        words = list(filter(None, inp.strip().split(" ")))
+        if spec is None:
+            return words
+        tokens = []
+        for word in words:
+            matched = spec._match(word)
+            if matched == ERROR:
+                return None
+            tokens.append(lang_spec.Token(matched, word))
+        return tokens
+
+    def parse(self, inp, spec = None) -> ParseResult:
+        """LL(1) Parser: Generates a parse tree. The stack, tokens and tree
+           are local to the call, and the items of EBNF operators are given
+           to the node holding them, as by ParserLL1.
+
+        Args:
+            inp (str): Input string.
+            spec (Specification, optional): Language specification. Defaults
+            to None.
+
+        Returns:
+            ParseResult: Status code, tree and tokens of this parse.
+        """
+        ir = self.ir
+        tokens = self.tokenise(inp, spec)
+        if tokens is None:
+            return ParseResult(PARSING_ERROR, error="Not all tokens from " +
+                "the input stream were matched.")
+        types = [ir.ids.get(getattr(t, "type", t)) for t in tokens]
+        types.append(self.end)
+
+        # (symbol, node the symbol's node is given to)
+        stack = [(self.start, None)]
+        root = None
+        position = 0
+        while stack != []:
+            s, parent = stack.pop()
+            t = types[position]
+            name = ir.symbols[s]
+            if ir.kinds[s] != gir.NONTERMINAL:
+                if s != t:
+                    if t == self.end:
+                        return ParseResult(PARSING_ERROR, root, tokens,
+                            "Unexpected end of input.")
+                    found = ir.symbols[t] if t is not None else \
+                        getattr(tokens[position], "type", tokens[position])
+                    return ParseResult(PARSING_ERROR, root, tokens,
+                        "Unexpected token [" + found + "]")
+                anytree.Node(name, id=name, parent=parent,
+                    token=tokens[position])
+                position = position + 1
+                continue
+
+            try:
+                cell = self.table.lookup_ids(s, t)
+            except KeyError:
+                cell = dt.ERROR_CELL
+            if cell == dt.ERROR_CELL:
+                found = ir.symbols[t] if t is not None else \
+                    getattr(tokens[position], "type", tokens[position])
+                return ParseResult(PARSING_ERROR, root, tokens,
+                    "ParseTable[" + name + ", " + found + "] is empty.")
+            body = self.bodies[cell]
+
+            if s not in self.loops:
+                parent = anytree.Node(name, id=name, parent=parent,
+                    token=None)
+                if root is None:
+                    root = parent
+                if body == ():
+                    anytree.Node(gir.EPSILON_SYMBOL, parent=parent,
+                        id=gir.EPSILON_SYMBOL, token=None)
+            for symbol in reversed(body):
+                stack.append((symbol, parent))
+
+        if types[position] != self.end:
+            found = getattr(tokens[position], "type", tokens[position])
+            return ParseResult(PARSING_ERROR, root, tokens,
+                "Unexpected token [" + found + "]")
+        return ParseResult(SUCCESS, root, tokens)
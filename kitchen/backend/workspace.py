@@ -0,0 +1,79 @@
+""" Holds many named grammars in one session of the application. """
+# kitchen/backend/workspace.py
+
+from kitchen import (
+    SUCCESS,
+    WORKSPACE_NAME_ERROR
+)
+
+from kitchen.helpers import (
+    config,
+    lang_spec
+)
+
+from kitchen.backend import cache
+
+class Workspace:
+    def __init__(self, entries = None) -> None:
+        """Initialises the workspace. Grammars are loaded the first time
+           they are selected, and then kept with their analysis and parser,
+           so that switching back to a grammar is immediate.
+
+        Args:
+            entries (dict, optional): {name: (CFG path, spec path or None)}.
+            Defaults to None, which reads the workspace file.
+        """
+        self.entries = config.read_workspace() if entries is None \
+            else entries
+        self.loaded = {}
+        self.current = None
+
+    def names(self) -> list:
+        """Obtains the names of the grammars in the workspace.
+
+        Returns:
+            list: Grammar names.
+        """
+        return list(self.entries.keys())
+
+    def load(self, name: str) -> tuple:
+        """Obtains a named grammar and its specification, loading them if
+           this has not yet been done.
+
+        Args:
+            name (str): Name of the grammar.
+
+        Returns:
+            tuple: ContextFreeGrammar and Specification (or None).
+        """
+        if name not in self.loaded:
+            cfg_path, spec_path = self.entries[name]
+            cfg = cache.load_cfg(cfg_path)
+            spec = None
+            if spec_path != None and spec_path.exists():
+                spec = lang_spec.Specification(spec_path, cfg)
+            self.loaded[name] = (cfg, spec)
+        return self.loaded[name]
+
+    def select(self, name: str) -> int:
+        """Makes a named grammar the current one.
+
+        Args:
+            name (str): Name of the grammar.
+
+        Returns:
+            int: Status code.
+        """
+        if name not in self.entries:
+            return WORKSPACE_NAME_ERROR
+        self.load(name)
+        self.current = name
+        return SUCCESS
+
+    def get(self) -> tuple:
+        """Obtains the current grammar and its specification.
+
+        Returns:
+            tuple: ContextFreeGrammar and Specification (or None).
+        """
+        return self.load(self.current)
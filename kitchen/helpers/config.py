@@ -19,6 +19,7 @@ from kitchen import (
         CFG_WRITE_ERROR,
         FILE_LOADING_DIR_ERROR,
         FILE_LOADING_EXISTS_ERROR,
+        WORKSPACE_NAME_ERROR,
         ERRORS
     )
 
@@ -27,6 +28,9 @@ from kitchen.helpers import sounds, display
 OUTPUT_CONFIG = None
 THEME = DARK
 
+# seconds a render may be predicted to take before it is refused
+RENDER_BUDGET = 1800
+
 (
     FOLLOW_SET,
     FIRST_SET,
@@ -38,6 +42,7 @@ THEME = DARK
 
 CONFIG_DIR_PATH = Path(typer.get_app_dir(__app_name__))
 CONFIG_FILE_PATH = CONFIG_DIR_PATH / "config.ini"
+WORKSPACE_FILE_PATH = CONFIG_DIR_PATH / "workspace.ini"
 
 def init_config_file() -> int:
     """Initialises the configuration file directory and file. 
@@ -122,6 +127,83 @@ def create_paths(cfg_path: str, spec_path = None) -> int:
         return CFG_WRITE_ERROR
     return SUCCESS
 
+def read_workspace() -> dict:
+    """Reads the named grammars of the workspace.
+
+    Returns:
+        dict: {name: (CFG path, spec path or None)}, in the order they 
+        were added.
+    """
+    config_parser = configparser.ConfigParser()
+    config_parser.read(WORKSPACE_FILE_PATH)
+    entries = {}
+    for name in config_parser.sections():
+        spec_path = config_parser[name].get("spec_path", "")
+        entries[name] = (Path(config_parser[name]["cfg_path"]), 
+            Path(spec_path) if spec_path != "" else None)
+    return entries
+
+def add_to_workspace(name: str, cfg_path: str, spec_path = None) -> int:
+    """Adds a named grammar to the workspace, replacing any grammar of the
+       same name. The configuration file is left as it is.
+
+    Args:
+        name (str): Name of the grammar.
+        cfg_path (str): Path to the CFG file.
+        spec_path (str, optional): Path to the spec file. Defaults to None.
+
+    Returns:
+        int: Status code.
+    """
+    paths = [Path(cfg_path)]
+    if spec_path != None:
+        paths.append(Path(spec_path))
+    for path in paths:
+        path_error = validate_path([path])
+        if path_error:
+            return path_error
+
+    config_parser = configparser.ConfigParser()
+    config_parser.read(WORKSPACE_FILE_PATH)
+    config_parser[name] = {
+        "cfg_path": str(Path(cfg_path).resolve()),
+        "spec_path": str(Path(spec_path).resolve()) if spec_path != None 
+            else ""
+    }
+    return _write_workspace(config_parser)
+
+def remove_from_workspace(name: str) -> int:
+    """Removes a named grammar from the workspace.
+
+    Args:
+        name (str): Name of the grammar.
+
+    Returns:
+        int: Status code.
+    """
+    config_parser = configparser.ConfigParser()
+    config_parser.read(WORKSPACE_FILE_PATH)
+    if not config_parser.remove_section(name):
+        return WORKSPACE_NAME_ERROR
+    return _write_workspace(config_parser)
+
+def _write_workspace(config_parser) -> int:
+    """Writes the workspace file.
+
+    Args:
+        config_parser (ConfigParser): Workspace entries.
+
+    Returns:
+        int: Status code.
+    """
+    try:
+        CONFIG_DIR_PATH.mkdir(parents=True, exist_ok=True)
+        with WORKSPACE_FILE_PATH.open("w") as file:
+            config_parser.write(file)
+    except OSError:
+        return CFG_WRITE_ERROR
+    return SUCCESS
+
 def init_config() -> None:
     """Initialises the default configuration settings.
     """    
@@ -348,6 +430,33 @@ def _set_narration(inp: str) -> None:
     except:
         return False   
 
+def _set_budget(inp: str) -> bool:
+    """Edits the longest predicted render time which is allowed to start.
+
+    Args:
+        inp (str): User input.
+
+    Returns:
+        bool: Success status.
+    """
+    global RENDER_BUDGET
+    try:
+        b_index = inp.index("-b")
+        budget = inp[b_index + 1]
+    except:
+        return False
+    try:
+        seconds = float(budget)
+    except ValueError:
+        seconds = 0
+    if seconds <= 0:
+        display.fail_secho("\t Options: \\c -b <seconds>")
+        return False
+    RENDER_BUDGET = seconds
+    display.success_secho("Success: set 'budget' to '" + budget + 
+    "' seconds\n")
+    return True
+
 def _adjust_settings(inp: str) -> None:
     """Handles all adjustments to the settings.
 
@@ -358,7 +467,8 @@ def _adjust_settings(inp: str) -> None:
     pcode = _set_preview(inp)
     ncode = _set_narration(inp)
     tcode = _set_theme(inp)
-    if not (qcode or pcode or ncode or tcode):
+    bcode = _set_budget(inp)
+    if not (qcode or pcode or ncode or tcode or bcode):
         display.fail_secho("Invalid configuration.\n")
     return
 
@@ -86,7 +86,7 @@ def show_config_opts():
     """    
     opts_str = ("Options:\n\tQuality: \t \\c -q high | med | low\n\t" +
                 "Preview:\t \\c -p y | n\n\tAnimation Theme: \\c -t dark | light\n\t" +
-                "Narration:\t \\c -n y | n")
+                "Narration:\t \\c -n y | n\n\tRender Budget:\t \\c -b <seconds>")
     info_secho(opts_str)
 
 def show_tokens(tokens):
@@ -124,6 +124,8 @@ def pretty_print_config_settings(output_config, narr):
     structure_secho("\tPreview: " + str(output_config["preview"]))
     structure_secho("\tAnimation Theme: " + config.get_theme_name())
     structure_secho("\tNarration: " + str(narr_setting))
+    structure_secho("\tRender Budget: " + format(config.RENDER_BUDGET, "g") +
+        " seconds")
 
 def print_set(set, name=""):
     """Prints the First or Follow Set in the correct format.
@@ -139,6 +141,49 @@ def print_set(set, name=""):
         [name])
     structure_secho(df.transpose().to_markdown())
 
+def print_benchmark(rows, curves):
+    """Prints the times of a benchmark, and how each stage scales.
+
+    Args:
+        rows (list): Sizes and times of each generated grammar.
+        curves (dict): Fitted exponent of each stage.
+    """
+    df = pd.DataFrame(data=rows)
+    # sizes are whole numbers, and times are in seconds
+    formats = [".5f" if c in curves else "g" for c in df.columns]
+    structure_secho(df.to_markdown(index=False, floatfmt=formats))
+    for stage, k in curves.items():
+        if k is None:
+            info_secho(stage + ": not enough sizes to fit")
+        else:
+            info_secho(stage + ": O(n^" + format(k, ".2f") + ")")
+
+def print_cost(report):
+    """Prints the predicted size of the analysis and cost of each scene.
+
+    Args:
+        report (dict): Prediction, as obtained from `cost.estimate`.
+    """
+    table = report["table"]
+    structure_secho("Parse table: " + str(table["rows"]) + " x " +
+        str(table["columns"]) + " (" + str(table["cells"]) + " cells, " +
+        str(table["entries"]) + " entries)")
+    if report["nodes"] is not None:
+        structure_secho("Parse tree: " + str(report["nodes"]) + " nodes")
+    elif "parsing" in report["scenes"]:
+        info_secho("The input is rejected, so its parse tree is unknown.")
+
+    rows = []
+    for name, scene in report["scenes"].items():
+        row = {"scene": name, "animations": "-" if scene["animations"] is
+            None else str(scene["animations"])}
+        for quality, seconds in scene["seconds"].items():
+            row[quality] = "-" if seconds is None else format(seconds, ".0f")
+        rows.append(row)
+    df = pd.DataFrame(data=rows)
+    structure_secho(df.to_markdown(index=False))
+    info_secho("Render times are in seconds.")
+
 def print_welcome():
     """Helper function to print the welcome screen.
     """    
@@ -154,6 +199,9 @@ def print_menu(help = False):
             ("Configure animation settings", "\\config", "\\c"), 
             ("Start the tutorial", "\\tutorial", "\\tut"), 
             ("Display Context-Free Grammar", "\\show cfg", "\\cfg"), 
+            ("Reload the CFG file", "\\reload", "\\r"), 
+            ("List the grammars of the workspace", "\\grammars", "\\gs"), 
+            ("Switch to a grammar of the workspace", "\\use <name>", ""), 
             ("Display Language Specification", "\\show spec", "\\spec")]
 
     dsl = [("Open DSL tool", "\\dsl tool", "\\dsl")]
@@ -163,7 +211,9 @@ def print_menu(help = False):
             ("Display Parse Table", "\\show parsetable", "\\pt"),
             ("Display LL(1) Parse Tree", "\\ll1 <input>", "<input>"),
             ("Export LL(1) Parse Tree as .png", "\\tree <input>", ""),
-            ("Display Symbol Table", "\\sem <input>", "")]
+            ("Display LALR(1) Parse Tree", "\\lalr <input>", ""),
+            ("Display Symbol Table", "\\sem <input>", ""),
+            ("Predict the cost of the animations", "\\cost [<input>]", "")]
     
     anims = [("Visualise Parsing Table calculation", "\\vis parsetable", "\\vpt"), 
              ("Visualise First Set calculation", "\\vis first", "\\vfs"), 
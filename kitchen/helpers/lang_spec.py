@@ -64,13 +64,70 @@ class Specification:
             spec_path (str): Path to spec file.
             cfg (ContextFreeGrammar): Loaded CFG.
         """        
+        issues = self._load(spec_path, spec_path.read_text(), cfg)
+        for problem in self.problems:
+            display.fail_secho(problem)
+        if issues != []:
+            display.structure_secho("Warning: [" + ", ".join(issues) + "] defined " +
+            "in the language specificiation\nwithout appearing in the CFG.")
+
+        # report for errors
+        undefined = self.find_undefined()
+        for key in undefined:
+            display.fail_secho("Error: " + key + " is not defined in the " +
+            "specficiation, but is used in the CFG.")
+
+        if undefined != []:
+            display.fail_secho("Please fix your language specification.")
+            raise typer.Exit()
+
+    @classmethod
+    def from_contents(cls, spec_contents, cfg, spec_path = None):
+        """Creates a Specification from the contents of a specification,
+           without a file and without reporting anything.
+
+        Args:
+            spec_contents (str): Contents of the specification.
+            cfg (ContextFreeGrammar): Loaded CFG.
+            spec_path (Path, optional): Path it was read from. Defaults to
+            None.
+
+        Raises:
+            ValueError: If a line cannot be read, or a terminal of the CFG
+            has no token.
+
+        Returns:
+            Specification: Specification object.
+        """
+        spec = cls.__new__(cls)
+        spec._load(spec_path, spec_contents, cfg)
+        problems = spec.problems + ["Error: " + key + " is not defined in " +
+            "the specficiation, but is used in the CFG." for key in
+            spec.find_undefined()]
+        if problems != []:
+            raise ValueError("\n".join(problems))
+        return spec
+
+    def _load(self, spec_path, spec_contents, cfg) -> list:
+        """Reads the contents of a specification into this object.
+
+        Args:
+            spec_path (Path): Path to spec file, or None.
+            spec_contents (str): Contents of the spec file.
+            cfg (ContextFreeGrammar): Loaded CFG.
+
+        Returns:
+            list: Tokens which do not appear in the CFG.
+        """
         # store token/ regex sequences 
         self.path = spec_path
-        self.spec_contents = spec_path.read_text()
+        self.spec_contents = spec_contents
         self.token_spec = {}
         self.cfg = cfg
         self.reserved_words = []
         self.has_definition = {}
+        # lines which could not be read
+        self.problems = []
 
         for t in self.cfg.terminals:
             self.has_definition[t] = False
@@ -78,22 +135,52 @@ class Specification:
                 self.has_definition[t] = True
 
         # associate spec regex with token types
-        issues = self.read_to_spec()
-        if issues != []:
-            display.structure_secho("Warning: [" + ", ".join(issues) + "] defined " +
-            "in the language specificiation\nwithout appearing in the CFG.")
+        return self.read_to_spec()
 
-        # report for errors
-        failed = False
-        for key in self.has_definition.keys():
-            if self.has_definition[key] == False:
-                display.fail_secho("Error: " + key + " is not defined in the " +
-                "specficiation, but is used in the CFG.")
-                failed = True
-
-        if failed:
-            display.fail_secho("Please fix your language specification.")
-            raise typer.Exit()
+    def find_undefined(self) -> list:
+        """Finds the terminals of the CFG which have no token.
+
+        Returns:
+            list: Terminals without a definition.
+        """
+        return [key for key, defined in self.has_definition.items() if
+            not defined]
+
+    @classmethod
+    def from_data(cls, data, cfg):
+        """Creates a Specification from data which was read before, without
+           reading or checking the specification file again.
+
+        Args:
+            data (dict): Specification data, as obtained from `to_data`.
+            cfg (ContextFreeGrammar): Loaded CFG.
+
+        Returns:
+            Specification: Specification object.
+        """
+        spec = cls.__new__(cls)
+        spec.path = Path(data["path"])
+        spec.spec_contents = data["contents"]
+        spec.token_spec = dict(data["token_spec"])
+        spec.reserved_words = list(data["reserved_words"])
+        spec.has_definition = dict(data["has_definition"])
+        spec.cfg = cfg
+        spec.problems = []
+        # compiles the token patterns before the first input arrives
+        for regex in spec.token_spec.values():
+            re.compile(regex)
+        return spec
+
+    def to_data(self) -> dict:
+        """Obtains the data needed to recreate this Specification.
+
+        Returns:
+            dict: Specification data.
+        """
+        return {"path": str(self.path), "contents": self.spec_contents,
+            "token_spec": self.token_spec, 
+            "reserved_words": self.reserved_words,
+            "has_definition": self.has_definition}
 
     def read_to_spec(self) -> None:
         """Reads the contents of the language specification file to the 
@@ -138,7 +225,7 @@ class Specification:
         try:
             self.reserved_words.append(cleaned_specs[2])
         except:
-            display.fail_secho("Some error with reserved words occurred.")
+            self.problems.append("Some error with reserved words occurred.")
 
     def _process_regex_spec(self, line: str) -> str:
         """Processes the regex specifications inside the file.
@@ -158,7 +245,7 @@ class Specification:
             else: 
                 return t_found
         except:
-            display.fail_secho("Some error with regex processing occurred.")
+            self.problems.append("Some error with regex processing occurred.")
         return ""
 
     def show_contents(self) -> None:
@@ -0,0 +1,79 @@
+""" Holds the manim objects which visualisations of a CFG make use of. """
+# kitchen/manim/m_cfg.py
+
+from typing import Dict
+import manim as m
+
+from kitchen import CFG_FILE_ERROR
+
+from kitchen.helpers import error
+
+def populate_manim_cfg(ir) -> Dict:
+    """Returns an equivalent cfg in manim where each production has its
+       associated set of MObjects.
+
+    Args:
+        ir (GrammarIR): Compiled CFG.
+
+    Raises:
+        typer.Abort: If Left Recursion is detected, the app session is
+                     terminated.
+
+    Returns:
+        Dictionary: A dictionary of the Mobjects which a non-terminal leads to.
+    """
+    manim_cfg = {}
+    try:
+        for nt in ir.nonterminals:
+            # append the text of the leading NT
+            key = ir.symbols[nt]
+            manim_cfg[key] = [m.Text(key, weight=m.BOLD)]
+
+            # make a list of sub-productions which are led to by this NT
+            tmp_item = []
+            for pid in ir.lead_to[nt]:
+                tmp_split_list = []
+                for sid in ir.rhs(pid):
+                    # gets manim equivalent of this text
+                    if sid == ir.epsilon:
+                        tmp_split_list.append(
+                            m.Text("ε", weight=m.BOLD, slant=m.ITALIC))
+                    else:
+                        tmp_split_list.append(
+                            m.Text(ir.symbols[sid], weight=m.BOLD,
+                            slant=m.ITALIC))
+                tmp_item.append(tmp_split_list)
+
+            # append this list of manim productions to the manim cfg dictionary
+            manim_cfg[key].append(tmp_item)
+        return manim_cfg
+    except:
+        error.ERR_left_recursion_detected()
+        return CFG_FILE_ERROR
+
+class ManimCFG:
+    def __init__(self, ir) -> None:
+        """Creates the visualisation state of a CFG. This is only built when
+           a scene asks the ContextFreeGrammar for it.
+
+        Args:
+            ir (GrammarIR): Compiled CFG.
+        """
+        self.manim_cfg = populate_manim_cfg(ir)
+
+        # structures for first set
+        self.manim_firstset_contents = {}
+        self.manim_firstset_lead = {}
+
+        # structures for follow set
+        self.manim_followset_contents = {}
+        self.manim_followset_lead = {}
+
+        for nt in ir.names(ir.nonterminals):
+            self.manim_firstset_contents[nt] = m.VGroup()
+            self.manim_followset_contents[nt] = m.VGroup()
+            self.manim_followset_lead[nt] = None
+
+        # terminals have follow sets too, except for $
+        for t in ir.names(ir.terminals[1:]):
+            self.manim_followset_contents[t] = m.VGroup()
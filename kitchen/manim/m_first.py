@@ -2,16 +2,14 @@
 # kitchen/manim/m_first.py
 
 import manim as m
-import re
 
 from kitchen import (
     CFG_SCALE_HEIGHT, 
-    CFG_SCALE_WIDTH, 
-    RE_PRODUCTION, 
-    RE_TERMINAL, 
+    CFG_SCALE_WIDTH
 )
 
 from kitchen.helpers import sounds, config, display, error
+from kitchen.backend import grammar_ir as gir
 from kitchen.manim import m_general as mg
 
 class MFirstSet(m.Scene):
@@ -66,10 +64,10 @@ class MFirstSet(m.Scene):
         """Clears first set structures at the end of the animation.
         """        
         self.cfg.vis_has_epsilon = False
-        self.cfg.manim_firstset_lead = {}
+        self.cfg.vis.manim_firstset_lead = {}
         for key in self.cfg.first_set.keys():
             self.cfg.first_set[key] = []
-            self.cfg.manim_firstset_contents[key] = m.VGroup()
+            self.cfg.vis.manim_firstset_contents[key] = m.VGroup()
         sounds.clear_narrs()
 
     def vis_first_set(self, keys, guide, start, production, pstack):
@@ -107,33 +105,33 @@ class MFirstSet(m.Scene):
 
         sounds.narrate("Let's get the first set of non-terminal " + production\
             , self)
-        self.cfg.manim_firstset_lead[production] = m.Tex("First(" + 
+        self.cfg.vis.manim_firstset_lead[production] = m.Tex("First(" + 
         production + "):", color = config.get_opp_col()).align_to(cfg_line, m.UP)
 
-        if self.cfg.manim_firstset_lead[production].height > \
+        if self.cfg.vis.manim_firstset_lead[production].height > \
                 1.5*cfg_line.height:
-                self.cfg.manim_firstset_lead[production].scale_to_fit_height\
+                self.cfg.vis.manim_firstset_lead[production].scale_to_fit_height\
                     (1.5*cfg_line.height)
 
-        self.cfg.manim_firstset_contents[production].next_to\
-            (self.cfg.manim_firstset_lead[production], m.RIGHT)
+        self.cfg.vis.manim_firstset_contents[production].next_to\
+            (self.cfg.vis.manim_firstset_lead[production], m.RIGHT)
 
-        self.play(m.FadeIn(self.cfg.manim_firstset_lead[production]))
+        self.play(m.FadeIn(self.cfg.vis.manim_firstset_lead[production]))
 
         # if production does not have a first set
         try:
             # loop through values which a production leads to
-            for i, p in enumerate(self.cfg.cfg_dict[production], start=0):
+            for i, pid in enumerate(self.cfg.ir.productions_of(production), 
+                start=0):
+                rhs = self.cfg.ir.rhs(pid)
 
                 # if a production is/ starts with a non-terminal
-                if p in self.cfg.cfg_dict or p[0].isupper():
+                if self.cfg.ir.kinds[rhs[0]] == gir.NONTERMINAL:
 
                     # find all the productions which are led by a non-terminal
-                    p_nt = list(
-                        filter(None, re.findall(RE_PRODUCTION, p)))
+                    p_nt = self.cfg.ir.names(rhs)
 
-                    for j, item in enumerate(p_nt, start=0):
-                        current_item = item.strip()
+                    for j, current_item in enumerate(p_nt, start=0):
 
                         if j > 1:
                             prev_element = self.manim_prod_dict[production]\
@@ -142,7 +140,7 @@ class MFirstSet(m.Scene):
                         # if a terminal is encountered after the list
                         # fade in new terminal and corresponding element of 
                         # the cfg
-                        if re.match(RE_TERMINAL, current_item):
+                        if self.cfg.ir.kinds[rhs[j]] != gir.NONTERMINAL:
 
                             for ps in pstack:
                                 if current_item not in self.firstset[ps]:
@@ -156,12 +154,12 @@ class MFirstSet(m.Scene):
                                         new_element.scale_to_fit_height\
                                             (1.5*cfg_line.height)
 
-                                    self.manim_firstset_contents[ps].add(
+                                    self.cfg.vis.manim_firstset_contents[ps].add(
                                         new_element)
-                                    self.manim_firstset_contents[ps]\
+                                    self.cfg.vis.manim_firstset_contents[ps]\
                                         .arrange_in_grid\
                                         (rows = 1, buff = 0.5).next_to\
-                                    (self.cfg.manim_firstset_lead[ps], m.RIGHT)
+                                    (self.cfg.vis.manim_firstset_lead[ps], m.RIGHT)
 
                                     # fade in new terminal and corresponding 
                                     # element of the cfg
@@ -236,8 +234,7 @@ class MFirstSet(m.Scene):
 
                 else:
                     # if a production starts with a terminal
-                    first_terminal = list(
-                        filter(None, re.findall(RE_TERMINAL, p)))
+                    first_terminal = self.cfg.ir.names(rhs[:1])
 
                     terminal_to_write = ""
 
@@ -269,11 +266,11 @@ class MFirstSet(m.Scene):
                             if new_element.height > 1.5*cfg_line.height:
                                         new_element.scale_to_fit_height\
                                             (1.5*cfg_line.height)
-                            self.cfg.manim_firstset_contents[ps].add(
+                            self.cfg.vis.manim_firstset_contents[ps].add(
                                 new_element)
-                            self.cfg.manim_firstset_contents[ps]\
+                            self.cfg.vis.manim_firstset_contents[ps]\
                                 .arrange_in_grid(rows=1, buff = 0.5).next_to\
-                                    (self.cfg.manim_firstset_lead[ps], m.RIGHT)
+                                    (self.cfg.vis.manim_firstset_lead[ps], m.RIGHT)
                         else:
                             mg.display_msg(self, ["Note: Since First("+ps+") "+
                                 "may lead to ", "the same production via more "+
@@ -323,7 +320,7 @@ class MFirstSet(m.Scene):
                                     since it can lead to epsilon.")
 
                         # reset other colours to white
-                        self.cfg.manim_firstset_contents[ps].fade_to(
+                        self.cfg.vis.manim_firstset_contents[ps].fade_to(
                             color=config.get_opp_col(), alpha=1)
 
                         # reset all cfg lines to white except the one we are 
@@ -2,14 +2,10 @@
 # kitchen/manim/m_follow.py
 
 import manim as m
-import re
 
 from kitchen import (
         CFG_SCALE_HEIGHT, 
-        CFG_SCALE_WIDTH, 
-        RE_PRODUCTION, 
-        RE_TERMINAL, 
-        RE_NONTERMINAL
+        CFG_SCALE_WIDTH
 )
 
 from kitchen.helpers import sounds, config, display
@@ -90,17 +86,17 @@ class MFollowSet(m.Scene):
                 is_start_symbol = False
 
             # inspect each element in the production
-            for i, p in enumerate(self.cfg.cfg_dict[production]):
+            for i, pid in enumerate(self.cfg.ir.productions_of(production)):
 
-                # split up the productions which are contained within this list
-                pps = list(filter(None, re.findall(RE_PRODUCTION, p)))
+                # the symbols of this production
+                pps = self.cfg.ir.names(self.cfg.ir.rhs(pid))
 
                 for index, item in enumerate(pps, start=0):
                     # highlight the element we are inspecting
                     cfg_element = self.manim_prod_dict[production][i][index]
 
                     # highlight CFG items as we inspect them
-                    if re.match(RE_TERMINAL, item):
+                    if not self.cfg.ir.is_nonterminal(item):
 
                         # observe that the follow of a standalone terminal may
                         # be ε
@@ -166,7 +162,7 @@ class MFollowSet(m.Scene):
                         next_item = pps[index + 1]
                         # if an item is directly followed by a terminal, it 
                         # is appended to its follow set
-                        if re.match(RE_TERMINAL, next_item):
+                        if not self.cfg.ir.is_nonterminal(next_item):
                             if next_item not in self.cfg.follow_set[item]:
                                 self.cfg.follow_set[item].append(next_item)
                                 self._add_to_follow_vis(
@@ -184,7 +180,7 @@ class MFollowSet(m.Scene):
                                 [production][i][index + 1]
 
                             # highlights the next element we are looking at
-                            if re.match(RE_TERMINAL, next_item):
+                            if not self.cfg.ir.is_nonterminal(next_item):
                                 self.play(
                                     m.Circumscribe(
                                         next_cfg_element, color=m.TEAL, 
@@ -239,28 +235,43 @@ class MFollowSet(m.Scene):
                                              " might not actually appear \
                                                 after " + item)
                                     else:
-                                        self.cfg.follow_set[item].append(next_item)
-                                        self._add_to_follow_vis(
-                                            item, next_item, keys,
-                                            [r'\varepsilon \subseteq First ('+
-                                            next_item+r'),', r'so '+next_item+
-                                            r'may not', r'actually appear after '
-                                            +item], script = "Epsilon is in \
-                                            the First Set of " + item + " so \
-                                            the non-terminal "+next_item + 
-                                            " might not actually appear after " 
-                                            + item)
+                                        # the rest of the production follows
+                                        # item instead
+                                        rest, rest_nullable = self.cfg.\
+                                            first_of_rest(pps, index + 2)
+                                        for r in rest:
+                                            if r not in self.cfg.follow_set\
+                                                [item]:
+                                                self.cfg.follow_set[item]\
+                                                    .append(r)
+                                                self._add_to_follow_vis(
+                                                item, r, keys,
+                                                [r'\varepsilon \subseteq First ('+
+                                                next_item+r'),', r'so '+next_item+
+                                                r'may not', r'actually appear after '
+                                                +item], script = "Epsilon is in \
+                                                the First Set of " + next_item + 
+                                                " so the non-terminal "+next_item + 
+                                                " might not actually appear after " 
+                                                + item)
+                                        if rest_nullable and production not \
+                                            in self.cfg.follow_set[item]:
+                                            self.cfg.follow_set[item].append\
+                                                (production)
+                                            self._add_to_follow_vis(
+                                            item, production, keys, 
+                                            [r'Follow (' + item +
+                                             r') \subseteq Follow (' + 
+                                             production + r')'])
 
         # starts cleaning the follow set
-        is_cleaned = []
-        is_cleaned = self.cfg.get_reset_cleaned_set()
-        self.cfg.clean_follow_set(self.cfg.start_symbol, [], is_cleaned)
+        self.cfg.resolve_follow_set()
         sounds.narrate("Time to simplify the sets.", self)
         self.wait()
 
         # transforms current follow sets to cleaned versions
         for key in reversed(self.cfg.follow_set.keys()):
-            if not re.match(RE_TERMINAL, key):
+            if self.cfg.ir.is_nonterminal(key):
                 new_fs_group = m.VGroup()
                 has_eos = False
 
@@ -275,14 +286,14 @@ class MFollowSet(m.Scene):
                 if has_eos:
                     new_fs_group.add(m.Tex(mg.to_tex("$"), color = m.BLUE_D))
                 new_fs_group.arrange_in_grid(rows=1, buff=0.5).next_to(
-                    self.cfg.manim_followset_lead[key], m.RIGHT)
+                    self.cfg.vis.manim_followset_lead[key], m.RIGHT)
                 new_fs_group.scale_to_fit_height(\
-                    self.cfg.manim_followset_lead[key].height)
+                    self.cfg.vis.manim_followset_lead[key].height)
 
                 # transforms to new contents
                 self.play(
                     m.Transform(
-                        self.cfg.manim_followset_contents[key], new_fs_group),
+                        self.cfg.vis.manim_followset_contents[key], new_fs_group),
                 )
 
         # shows success
@@ -310,12 +321,12 @@ class MFollowSet(m.Scene):
         """        
         new_element = None
 
-        if not re.match(RE_TERMINAL, production) and item != production:
+        if self.cfg.ir.is_nonterminal(production) and item != production:
             # display adding to the non-terminal followsets
             self._prepare_follow_set_line(production, keys)
 
             # check if item to be added is a non-terminal
-            if re.match(RE_NONTERMINAL, item):
+            if self.cfg.ir.is_nonterminal(item):
                 # non terminal
                 new_element = m.Tex(
                     r'Follow(', mg.to_tex(item), ')', color=m.BLUE_D).\
@@ -327,18 +338,18 @@ class MFollowSet(m.Scene):
                 new_element = m.Tex(
                     element, color=m.TEAL).scale(0.8)
                     
-            if new_element.height > self.cfg.manim_followset_lead\
+            if new_element.height > self.cfg.vis.manim_followset_lead\
                     [production].height:
                     new_element.scale_to_fit_height\
-                (self.cfg.manim_followset_lead[production].height)
+                (self.cfg.vis.manim_followset_lead[production].height)
 
             # add to the content group
-            self.cfg.manim_followset_contents[production].add(
+            self.cfg.vis.manim_followset_contents[production].add(
                 new_element)
-            self.cfg.manim_followset_contents[production].\
+            self.cfg.vis.manim_followset_contents[production].\
                 arrange_in_grid(rows=1, buff=0.5)
-            self.cfg.manim_followset_contents[production].next_to(
-                self.cfg.manim_followset_lead[production], m.RIGHT)
+            self.cfg.vis.manim_followset_contents[production].next_to(
+                self.cfg.vis.manim_followset_lead[production], m.RIGHT)
 
         # Play the addition of the item to the followset and message, if given
             if msg != []:
@@ -363,7 +374,7 @@ class MFollowSet(m.Scene):
             keys (VGroup): CFG Mobject group.
         """        
         # only prepares a follow set for non-terminals
-        if not re.match(RE_TERMINAL, production):
+        if self.cfg.ir.is_nonterminal(production):
             # creates anims buffer
             anims = []
 
@@ -373,26 +384,26 @@ class MFollowSet(m.Scene):
             anims.append(m.FadeToColor(cfg_line, config.get_opp_col()))
 
             # adds the follow set titles to the canvas
-            if self.cfg.manim_followset_lead[production] == None:
-                self.cfg.manim_followset_lead[production] = \
+            if self.cfg.vis.manim_followset_lead[production] == None:
+                self.cfg.vis.manim_followset_lead[production] = \
                     m.Tex("Follow(" + production + "):", 
                     color = config.get_opp_col())
                     
-                if self.cfg.manim_followset_lead[production].height > \
+                if self.cfg.vis.manim_followset_lead[production].height > \
                     1.5*cfg_line.height:
-                    self.cfg.manim_followset_lead[production].scale_to_fit_height\
+                    self.cfg.vis.manim_followset_lead[production].scale_to_fit_height\
                         (1.5*cfg_line.height)
-                self.cfg.manim_followset_lead[production].align_to(cfg_line, \
+                self.cfg.vis.manim_followset_lead[production].align_to(cfg_line, \
                     m.UP)      
 
                 # prepares content group
-                self.cfg.manim_followset_contents[production].next_to(
-                    self.cfg.manim_followset_lead[production], m.RIGHT)
-                self.cfg.manim_followset_contents[production].arrange(m.RIGHT)
+                self.cfg.vis.manim_followset_contents[production].next_to(
+                    self.cfg.vis.manim_followset_lead[production], m.RIGHT)
+                self.cfg.vis.manim_followset_contents[production].arrange(m.RIGHT)
 
                 # shows the new follow area
                 anims.append(
-                    m.FadeIn(self.cfg.manim_followset_lead[production]),
+                    m.FadeIn(self.cfg.vis.manim_followset_lead[production]),
                 )
 
             # animates the cfg line being highlighted
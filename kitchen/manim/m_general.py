@@ -192,7 +192,7 @@ def get_manim_cfg_group(self):
     Returns:
         VGroup: VGroup Mobject containing elements.
     """        
-    manim_cfg = self.cfg.manim_cfg
+    manim_cfg = self.cfg.vis.manim_cfg
 
     keys = m.VGroup()
 
@@ -9,8 +9,6 @@ import anytree
 from kitchen import ( 
     CFG_SCALE_WIDTH,
     RE_TERMINAL, 
-    RE_NONTERMINAL, 
-    RE_PRODUCTION, 
     SUCCESS,
     ERROR
 )
@@ -412,7 +410,7 @@ class MParseTree(m.Scene):
 
         # look for any epsilons that came before and add.
         for node in self.root.descendants:
-            if re.match(RE_NONTERMINAL, node.id):
+            if self.cfg.ir.is_nonterminal(node.id):
                 if len(node.children) == 0 and "#" in \
                 self.cfg.first_set[node.id]:    
                     v_id = node.id + "_#"
@@ -564,7 +562,7 @@ class MParseTree(m.Scene):
         while self.s.stack != []:
             # check if the stack is empty before the parsing is complete
             if self.tokens == []:
-                if re.match(RE_TERMINAL, self.s.stack[-1]):
+                if not self.cfg.ir.is_nonterminal(self.s.stack[-1]):
                     error.ERR_parsing_error(self.root, "Expected " + 
                     self.s.stack[-1]+".")
                     error.ERR_manim_parsing_error(self,  ["Expected `" 
@@ -593,7 +591,7 @@ class MParseTree(m.Scene):
                 next = self.tokens[0]
 
             # draw initial node if top is start symbol
-            if re.match(RE_TERMINAL, top) or top == "$":
+            if self.cfg.ir.is_terminal(top):
 
                 if top == next:
                     anims = []
@@ -646,7 +644,7 @@ class MParseTree(m.Scene):
                         " so this input is not valid." )
                     return
 
-            elif re.match(RE_NONTERMINAL, top):
+            elif self.cfg.ir.is_nonterminal(top):
                 mg.display_msg(self, ["We must find the entry at ",\
                         "ParseTable["+top+"]["+next+"]"], script = "Let's " +
                             "consider the parse table entry at non-terminal " +
@@ -660,7 +658,8 @@ class MParseTree(m.Scene):
                         self._call_ptable_error(top, next)
                         return
 
-                    prods = pt_entry.split("->")
+                    lhs, ps = self.cfg.ir.split_entry(pt_entry)
+                    body = pt_entry.split("->")[1]
 
                     if self.parents != []:
                         replaced_parent = self.parents[-1]
@@ -679,8 +678,7 @@ class MParseTree(m.Scene):
                     self.s.pop(r'\text{Replacing }' + top + r'...')
                     
                     #  copy the cfg_line rather than manipulate it directly
-                    cfg_line = self.manim_production_groups[prods[0].strip(
-                    )][:]
+                    cfg_line = self.manim_production_groups[lhs][:]
                     cfg_line.next_to(self.s.mstack, m.DOWN).shift(
                         0.8*m.DOWN).scale(0.8)
                     
@@ -697,17 +695,13 @@ class MParseTree(m.Scene):
                         if to_be_appended.parent == None:
                             to_be_appended.parent = to_be_appended.tmp_parent
 
-                    # add sequence of productions to the stack
-                    ps = list(filter(None, re.findall(
-                        RE_PRODUCTION, prods[1])))
-                    
                     nodes_to_append = []
                     stack_to_append = []
 
-                    mg.display_msg(self, [prods[0].strip() + " is a "+
+                    mg.display_msg(self, [lhs + " is a "+
                         "non-terminal,", "so we can replace it with", 
-                        "its sub-productions: ",  prods[1]], 
-                        script="Let's replace " + prods[0].strip() + 
+                        "its sub-productions: ",  body], 
+                        script="Let's replace " + lhs + 
                         " with its sub productions")
 
                     # this is the direction we push to the stack
@@ -734,7 +728,7 @@ class MParseTree(m.Scene):
                                 self.id_count = self.id_count + 1
                           
                             new_node = anytree.Node(
-                                p, id=p, parent = None, tmp_p=prods[0].strip(),
+                                p, id=p, parent = None, tmp_p=lhs,
                                 vertex_id = v_id,
                                 parent_id = replaced_parent.vertex_id,
                                 tmp_parent = replaced_parent, token = None)
@@ -25,7 +25,6 @@ from kitchen.manim import (
 
 from kitchen import (
         CFG_SCALE_HEIGHT, 
-        RE_NONTERMINAL, 
         CFG_SCALE_WIDTH, 
         RE_TERMINAL,
         ERROR
@@ -162,7 +161,7 @@ class MSemanticAnalyser(m.Scene):
 
         # look for any epsilons that came before and add.
         for node in self.root.descendants:
-            if re.match(RE_NONTERMINAL, node.id):
+            if self.cfg.ir.is_nonterminal(node.id):
                 if len(node.children) == 0 and "#" in \
                 self.cfg.first_set[node.id]:    
                     v_id = node.id + "_#"
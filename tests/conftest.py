@@ -0,0 +1,15 @@
+# tests/conftest.py
+import pytest
+from kitchen.backend import cache
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Keeps the analyses cached by each test in a temporary directory, so
+       that tests never read or fill the cache of the user running them.
+
+    Args:
+        tmp_path (Path): Temporary directory
+        monkeypatch (MonkeyPatch): Patches the cache directory
+    """
+    monkeypatch.setattr(cache, "CACHE_DIR_PATH", tmp_path / "cache")
+    monkeypatch.delenv(cache.NO_CACHE_ENV, raising=False)
@@ -0,0 +1,131 @@
+# tests/test_api.py
+import pytest
+from pathlib import Path
+from kitchen import (
+    api,
+    ERROR,
+    HEALTH_ERROR,
+    PARSING_ERROR,
+    SUCCESS
+)
+from kitchen.helpers import config
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+@pytest.fixture
+def no_config(tmp_path, monkeypatch):
+    """Points the config file at a path which does not exist.
+
+    Args:
+        tmp_path (Path): Temporary directory
+        monkeypatch (MonkeyPatch): Patches the config file path
+    """
+    monkeypatch.setattr(config, "CONFIG_FILE_PATH", tmp_path / "config.ini")
+
+def test_api_parse(sample_path, no_config, capsys):
+    """Tests loading, analysing and parsing without a config file or any
+       output.
+
+    Args:
+        sample_path (str): Path to samples directory
+        no_config (None): Config file which does not exist
+        capsys (CaptureFixture): Captures the output
+    """
+    grammar = api.load_grammar(Path(sample_path + "cfg_12.txt"))
+    analysis = api.analyse(grammar)
+    assert analysis.is_ll1
+    assert analysis.first_set["S"] == ["a"]
+    assert sorted(analysis.follow_set["B"]) == ["d", "h"]
+    assert analysis.table["B"]["h"] == "B -> #"
+
+    result = api.parse(grammar, "a b d h")
+    assert result.code == SUCCESS
+    assert [n.id for n in result.root.children] == ["a", "B", "D", "h"]
+    result = api.parse(grammar, "a h h")
+    assert result.code == PARSING_ERROR
+    assert result.error == "Unexpected token [h]"
+    assert capsys.readouterr().out == ""
+
+def test_api_spec(sample_path, no_config, capsys):
+    """Tests tokenising and parsing with a language specification.
+
+    Args:
+        sample_path (str): Path to samples directory
+        no_config (None): Config file which does not exist
+        capsys (CaptureFixture): Captures the output
+    """
+    spec = "Tokens:\nT identifier [a-z]+\nT value [0-9]+\nT = =\n---\n"
+    grammar = api.load_grammar(Path(sample_path + "cfg_id_language.txt"),
+        spec)
+    tokens = api.tokenize(grammar, "x = 3 y = x")
+    assert [t.type for t in tokens] == ["identifier", "=", "value",
+        "identifier", "=", "identifier"]
+    assert api.parse(grammar, "x = 3 y = x").code == SUCCESS
+    with pytest.raises(api.TokenError):
+        api.tokenize(grammar, "x = ?")
+    with pytest.raises(api.GrammarError):
+        api.load_grammar(Path(sample_path + "cfg_id_language.txt"),
+            "Tokens:\nT identifier [a-z]+\n---\n")
+    assert capsys.readouterr().out == ""
+
+""" Test the problems which are returned rather than printed """
+@pytest.mark.parametrize("contents, code", [
+    ("S -> A b\n", HEALTH_ERROR),
+    ("S -> a S | a\n", ERROR),
+    ("S -> begin STMT* end\nSTMT -> id semi\n", SUCCESS),
+])
+
+def test_api_analysis(contents, code, capsys):
+    """Tests the analysis of CFGs given as contents.
+
+    Args:
+        contents (str): Contents of the CFG
+        code (int): Expected status code
+        capsys (CaptureFixture): Captures the output
+    """
+    grammar = api.load_grammar(contents)
+    analysis = api.analyse(grammar)
+    assert analysis.code == code
+    assert (analysis.errors != []) == (code == HEALTH_ERROR)
+    assert (analysis.conflicts != []) == (code == ERROR)
+    if code != SUCCESS:
+        with pytest.raises(api.GrammarError):
+            api.parse(grammar, "a")
+    assert capsys.readouterr().out == ""
+
+def test_api_left_recursion(capsys):
+    """Tests that a left-recursive CFG is analysed, and is not LL(1).
+
+    Args:
+        capsys (CaptureFixture): Captures the output
+    """
+    analysis = api.analyse(api.load_grammar("E -> E + T | T\nT -> id\n"))
+    assert not analysis.is_ll1
+    assert analysis.first_set["E"] == ["id"]
+    assert sorted(analysis.follow_set["E"]) == ["$", "+"]
+    assert analysis.conflicts == [("E", "id", ["E -> E + T", "E -> T"])]
+    assert capsys.readouterr().out == ""
+
+def test_api_deep():
+    """Tests that a chain of many non-terminals is analysed without
+       running out of recursion.
+    """
+    depth = 1500
+    contents = "".join("N" + "A" * i + " -> N" + "A" * (i + 1) + "\n" for i
+        in range(depth)) + "N" + "A" * depth + " -> id\n"
+    analysis = api.analyse(api.load_grammar(contents))
+    assert analysis.is_ll1
+    assert analysis.first_set["N"] == ["id"]
+    assert api.parse(api.load_grammar(contents), "id").code == SUCCESS
+
+def test_api_format_errors():
+    """Tests that contents which are not productions are refused.
+    """
+    with pytest.raises(api.GrammarError):
+        api.load_grammar("s -> a\n")
+    with pytest.raises(api.GrammarError):
+        api.load_grammar("S a\n")
+    with pytest.raises(api.GrammarError):
+        api.load_grammar("")
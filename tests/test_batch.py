@@ -0,0 +1,49 @@
+# tests/test_batch.py
+from typer.testing import CliRunner
+import json
+import pytest
+import shutil
+from pathlib import Path
+from kitchen import app
+
+runner = CliRunner()
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+""" Test that a directory of CFGs is analysed in a single command """
+@pytest.mark.parametrize("jobs", [
+    ("1"),
+    ("2"),
+])
+
+def test_analyse_dir(sample_path, tmp_path, jobs):
+    """Tests the results file written by analyze-dir.
+
+    Args:
+        sample_path (str): Path to samples directory
+        tmp_path (Path): Temporary directory
+        jobs (str): Number of worker processes
+    """
+    grammars = tmp_path / "grammars"
+    grammars.mkdir()
+    for sample_cfg in ["cfg.txt", "cfg_2.txt", "cfg_id_language.txt"]:
+        shutil.copy(sample_path + sample_cfg, grammars / sample_cfg)
+    (grammars / "broken.txt").write_text("s -> a\n")
+
+    output = tmp_path / "results.json"
+    result = runner.invoke(app.app, ["analyze-dir", str(grammars), "-o",
+        str(output), "-j", jobs])
+    assert "Analysed 4 CFG(s): 2 LL(1), 1 with conflicts, 1 failed." in \
+        result.stdout
+
+    results = {Path(r["file"]).name: r for r in json.loads(
+        output.read_text())}
+    assert results["broken.txt"]["status"] == "error"
+    assert results["cfg.txt"]["ll1"]
+    assert results["cfg_id_language.txt"]["parse_table"]["STATEMENT"] \
+        ["identifier"] == "STATEMENT -> identifier = FACTOR"
+    assert not results["cfg_2.txt"]["ll1"]
+    assert len(results["cfg_2.txt"]["conflicts"]) == 4
+    assert results["cfg_2.txt"]["follow_set"]["B"] == ["$", "a", "g", "h"]
@@ -0,0 +1,120 @@
+# tests/test_bundle.py
+from typer.testing import CliRunner
+import pytest
+from pathlib import Path
+from kitchen import app
+from kitchen.backend import (
+    bundle,
+    context_free_grammar as cfg
+)
+
+runner = CliRunner()
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+@pytest.fixture
+def ll1_out_path():
+    return "./samples/expected_ll1/"
+
+""" Test that a bundle holds the same analysis as the CFG file """
+@pytest.mark.parametrize("sample_cfg, compress", [
+    ("cfg.txt", False),
+    ("cfg_6.txt", False),
+    ("cfg_id_language.txt", False),
+    ("cfg_6.txt", True),
+    ("cfg_12.txt", True),
+])
+
+def test_bundle_round_trip(sample_path, tmp_path, sample_cfg, compress):
+    """Tests that a loaded bundle has the sets and parse table of the CFG.
+
+    Args:
+        sample_path (str): Path to samples directory
+        tmp_path (Path): Temporary directory
+        sample_cfg (str): Name of CFG file
+        compress (bool): Compresses the parse table
+    """
+    compiled, _, conflicts = bundle.compile_cfg(sample_path + sample_cfg,
+        compress=compress)
+    assert conflicts == []
+    output = bundle.write_bundle(compiled, None, tmp_path / "cfg.kbundle")
+
+    loaded, spec = bundle.load_bundle(output)
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + sample_cfg))
+    grammar.find_ll1_conflicts()
+    assert spec is None
+    assert loaded.first_set == compiled.first_set
+    assert loaded.follow_set == compiled.follow_set
+    assert loaded.parsetable.pt_dict == grammar.parsetable.pt_dict
+
+""" Test that test-ll1 parses from a bundle """
+@pytest.mark.parametrize("sample_cfg, input_str", [
+    ("cfg.txt", "c"),
+    ("cfg_bla_simple_2.txt", "identifier a identifier"),
+    ("cfg_id_language.txt", "identifier = value identifier = value"),
+])
+
+def test_bundle_ll1(sample_path, ll1_out_path, tmp_path, sample_cfg,
+    input_str):
+    """Tests that parsing with a bundle matches the expected output.
+
+    Args:
+        sample_path (str): Path to samples directory
+        ll1_out_path (str): Path to expected outputs directory
+        tmp_path (Path): Temporary directory
+        sample_cfg (str): Name of CFG file
+        input_str (str): Input to be parsed
+    """
+    output = str(tmp_path / "cfg.kbundle")
+    result = runner.invoke(app.app, ["compile", sample_path + sample_cfg,
+        "-o", output])
+    assert "Bundle written to" in result.stdout
+
+    result = runner.invoke(app.app, ["test-ll1", "-b", output, "-i",
+        input_str])
+    expected = Path(ll1_out_path + sample_cfg).read_text()
+    assert expected in result.stdout
+
+def test_bundle_spec(sample_path, tmp_path):
+    """Tests that the token patterns of a spec are kept in the bundle.
+
+    Args:
+        sample_path (str): Path to samples directory
+        tmp_path (Path): Temporary directory
+    """
+    compiled, spec, _ = bundle.compile_cfg(sample_path +
+        "cfg_id_language.txt", "./samples/test_spec.txt")
+    output = bundle.write_bundle(compiled, spec, tmp_path / "cfg.kbundle")
+    _, loaded = bundle.load_bundle(output)
+    assert loaded.token_spec == spec.token_spec
+    assert loaded.reserved_words == spec.reserved_words
+    assert loaded.has_definition == spec.has_definition
+
+def test_bundle_rejected(sample_path, tmp_path):
+    """Tests that CFGs with conflicts and other files are rejected.
+
+    Args:
+        sample_path (str): Path to samples directory
+        tmp_path (Path): Temporary directory
+    """
+    output = tmp_path / "cfg.kbundle"
+    result = runner.invoke(app.app, ["compile", sample_path + "cfg_2.txt",
+        "-o", str(output)])
+    assert "not LL(1)" in result.stdout
+    assert not output.exists()
+
+    cfg_path = tmp_path / "cfg_garbled.txt"
+    cfg_path.write_text("S a b\n")
+    result = runner.invoke(app.app, ["compile", str(cfg_path), "-o",
+        str(output)])
+    assert "CFG Error at line 0.  Expected a non-terminal, -> and its " + \
+        "productions." in result.stdout
+    assert result.exit_code == 1
+    with pytest.raises(ValueError, match="CFG Error at line 0"):
+        bundle.compile_cfg(cfg_path)
+
+    output.write_bytes(b"not a bundle")
+    with pytest.raises(ValueError):
+        bundle.load_bundle(output)
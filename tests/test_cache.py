@@ -0,0 +1,81 @@
+# tests/test_cache.py
+import pytest
+from pathlib import Path
+from kitchen.backend import (
+    cache,
+    context_free_grammar as cfg
+)
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR_PATH", tmp_path / "cache")
+    return tmp_path / "cache"
+
+""" Test that cached analyses are reloaded as they were stored """
+@pytest.mark.parametrize("sample_cfg", [
+    ("cfg.txt"),
+    ("cfg_bla_simple_2.txt"),
+    ("cfg_id_language.txt"),
+])
+
+def test_cache_roundtrip(sample_path, sample_cfg, cache_dir):
+    """Tests that a stored analysis is loaded without recalculation.
+
+    Args:
+        sample_path (str): Path to samples directory
+        sample_cfg (str): Name of CFG file
+        cache_dir (Path): Temporary cache directory
+    """    
+    path = Path(sample_path + sample_cfg)
+    grammar = cache.load_cfg(path)
+    assert not grammar.first_set_calculated
+
+    grammar.reset_first_set()
+    grammar.reset_follow_set()
+    grammar.setup_parsetable()
+    grammar.calculate_parsetable()
+    cache.save_cfg(grammar)
+
+    loaded = cache.load_cfg(path)
+    assert loaded.first_set_calculated and loaded.follow_set_calculated
+    assert loaded.first_set == grammar.first_set
+    assert loaded.follow_set == grammar.follow_set
+    assert loaded.parsetable.pt_dict == grammar.parsetable.pt_dict
+
+def test_cache_eviction(sample_path, cache_dir):
+    """Tests that the least recently used entries are evicted first.
+
+    Args:
+        sample_path (str): Path to samples directory
+        cache_dir (Path): Temporary cache directory
+    """    
+    for sample_cfg in ["cfg.txt", "cfg_2.txt", "cfg_3.txt"]:
+        grammar = cfg.ContextFreeGrammar(Path(sample_path + sample_cfg))
+        grammar.reset_first_set()
+        cache.save_cfg(grammar)
+    entries = sorted(cache_dir.glob("*.pkl"), key=lambda e: e.stat().st_mtime)
+    assert len(entries) == 3
+
+    newest = entries[-1]
+    cache.evict(newest.stat().st_size)
+    assert list(cache_dir.glob("*.pkl")) == [newest]
+
+def test_cache_disabled(sample_path, cache_dir, monkeypatch):
+    """Tests that nothing is stored or loaded while the cache is off.
+
+    Args:
+        sample_path (str): Path to samples directory
+        cache_dir (Path): Temporary cache directory
+        monkeypatch (MonkeyPatch): Sets the environment variable
+    """
+    monkeypatch.setenv(cache.NO_CACHE_ENV, "1")
+    path = Path(sample_path + "cfg.txt")
+    grammar = cache.load_cfg(path)
+    grammar.reset_first_set()
+    cache.save_cfg(grammar)
+    assert not cache_dir.exists()
+    assert not cache.load_cfg(path).first_set_calculated
@@ -0,0 +1,62 @@
+# tests/test_conflicts.py
+from typer.testing import CliRunner
+import pytest
+from pathlib import Path
+from kitchen import app
+from kitchen.backend import context_free_grammar as cfg
+
+runner = CliRunner()
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+""" Test that every LL(1) conflict is reported in a single run """
+@pytest.mark.parametrize("sample_cfg, expected", [
+    ("cfg.txt", ["No LL(1) conflicts found."]),
+    ("cfg_id_language.txt", ["No LL(1) conflicts found."]),
+    ("cfg_2.txt", ["4 LL(1) conflict(s) found:",
+        "[S, h]: S -> A C B | S -> C b b",
+        "[S, g]: S -> A C B | S -> B a",
+        "[B, g]: B -> g | B -> #",
+        "[C, h]: C -> h | C -> #"]),
+    ("cfg_9_LR.txt", ["4 LL(1) conflict(s) found:",
+        "[E, (]: E -> E + T | E -> T",
+        "[T, id]: T -> T * F | T -> F"]),
+])
+
+def test_conflicts(sample_path, sample_cfg, expected):
+    """Tests the LL(1) conflict report.
+
+    Args:
+        sample_path (str): Path to samples directory
+        sample_cfg (str): Name of CFG file
+        expected (list): Lines expected in the report
+    """    
+    runner.invoke(app.app, ["init-tests",  "-cfg", sample_path + sample_cfg])
+    result = runner.invoke(app.app, ["conflicts"])
+    for line in expected:
+        assert line in result.stdout
+
+""" Test that the cells reached through a follow set hold real productions """
+@pytest.mark.parametrize("sample_cfg", [
+    ("cfg_2.txt"),
+    ("cfg_4.txt"),
+])
+
+def test_conflicts_real_productions(sample_path, sample_cfg):
+    """Tests that each filled cell, and each production of a conflict, is a
+       production of the CFG.
+
+    Args:
+        sample_path (str): Path to samples directory
+        sample_cfg (str): Name of CFG file
+    """
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + sample_cfg))
+    conflicts = grammar.find_ll1_conflicts()
+    productions = set(grammar.ir.prod_strings)
+    for row in grammar.parsetable.pt_dict.values():
+        assert {e for e in row.values() if e != "Error"} <= productions
+    for _, _, prods in conflicts:
+        assert set(prods) <= productions
+        assert len(set(prods)) == len(prods)
@@ -0,0 +1,214 @@
+# tests/test_cost.py
+from typer.testing import CliRunner
+import pytest
+from pathlib import Path
+from kitchen import app, BUDGET_ERROR, SUCCESS
+from kitchen.backend import (
+    cli_helper,
+    context_free_grammar as cfg,
+    cost,
+    memo
+)
+from kitchen.helpers import config
+
+runner = CliRunner()
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+@pytest.fixture
+def calibration(tmp_path, monkeypatch):
+    """Keeps measured runs in a temporary calibration file.
+
+    Args:
+        tmp_path (Path): Temporary directory
+        monkeypatch (MonkeyPatch): Patches the calibration file path
+
+    Returns:
+        Path: Calibration file
+    """
+    path = tmp_path / "calibration.ini"
+    monkeypatch.setattr(cost, "CALIBRATION_FILE_PATH", path)
+    return path
+
+def load_cfg(sample_path) -> cfg.ContextFreeGrammar:
+    """Loads and analyses "S -> a B D h", where B and D are nullable.
+
+    Args:
+        sample_path (str): Path to samples directory
+
+    Returns:
+        ContextFreeGrammar: Analysed CFG
+    """
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + "cfg_12.txt"))
+    memo.analyse(grammar)
+    return grammar
+
+def test_cost_features(sample_path):
+    """Tests the counts which each scene's animations are predicted from.
+
+    Args:
+        sample_path (str): Path to samples directory
+    """
+    features = cost.measure(load_cfg(sample_path), "a b d h")
+    assert features == {"nonterminals": 3, "terminals": 5, "productions": 5,
+        "symbols": 8, "walk": 5, "first_entries": 3, "epsilon_entries": 3,
+        "expansions": 3, "pushed": 6, "matches": 4, "nodes": 7}
+    features = cost.measure(load_cfg(sample_path), "a h h")
+    assert features["nodes"] is None
+
+""" Test the animations predicted for each scene, before calibration """
+@pytest.mark.parametrize("scene, animations", [
+    (config.FIRST_SET, 53),
+    (config.FOLLOW_SET, 72),
+    (config.PARSETABLE, 47),
+    (config.LL1_PARSING, 87),
+    (config.TYPE_CHECK, 48),
+])
+
+def test_cost_animations(sample_path, calibration, scene, animations):
+    """Tests the prior of each scene, and that narration adds to it.
+
+    Args:
+        sample_path (str): Path to samples directory
+        calibration (Path): Calibration file
+        scene (int): Scene code
+        animations (int): Expected number of animations
+    """
+    features = cost.measure(load_cfg(sample_path), "a b d h")
+    model = cost.CostModel()
+    assert model.animations(scene, features, narration=False) == animations
+    assert model.animations(scene, features) == round(animations *
+        cost.NARRATION_FACTOR)
+    assert model.render_seconds(scene, features, "low_quality", False) == \
+        animations * cost.DEFAULT_SECONDS["low_quality"]
+
+def test_cost_calibration(sample_path, calibration):
+    """Tests that measured runs scale the animations and set the seconds
+       per animation.
+
+    Args:
+        sample_path (str): Path to samples directory
+        calibration (Path): Calibration file
+    """
+    features = cost.measure(load_cfg(sample_path))
+    model = cost.CostModel()
+    assert model.record(config.PARSETABLE, "high_quality", 47, 94, 47.0) == \
+        SUCCESS
+    assert model.record(config.PARSETABLE, "high_quality", 53, 106, 53.0) == \
+        SUCCESS
+
+    model = cost.CostModel()
+    assert model.scale(config.PARSETABLE) == 2.0
+    assert model.seconds("high_quality") == 0.5
+    assert model.seconds("low_quality") == cost.DEFAULT_SECONDS["low_quality"]
+    assert model.animations(config.PARSETABLE, features, False) == 94
+    assert model.animations(config.PARSETABLE, features, False,
+        calibrated=False) == 47
+    assert model.render_seconds(config.PARSETABLE, features, "high_quality",
+        False) == 47.0
+
+def test_cost_budget(sample_path, calibration, monkeypatch):
+    """Tests that the REPL warns about long renders and refuses those over
+       the budget, and that renders are measured.
+
+    Args:
+        sample_path (str): Path to samples directory
+        calibration (Path): Calibration file
+        monkeypatch (MonkeyPatch): Patches the budget
+    """
+    grammar = load_cfg(sample_path)
+    config.init_config()
+    config.OUTPUT_CONFIG["quality"] = "low_quality"
+    monkeypatch.setattr(config, "RENDER_BUDGET", 1800)
+    assert cli_helper._check_budget(config.PARSETABLE, grammar) == (SUCCESS,
+        61)
+    assert cli_helper._check_budget(config.LL1_PARSING, grammar,
+        inp="a h h") == (SUCCESS, None)
+
+    monkeypatch.setattr(config, "RENDER_BUDGET", 10)
+    code, _ = cli_helper._check_budget(config.PARSETABLE, grammar)
+    assert code == BUDGET_ERROR
+
+    class Scene:
+        class renderer:
+            num_plays = 122
+
+        def render(self):
+            pass
+
+    cli_helper._render(Scene(), config.PARSETABLE, 61)
+    assert cost.CostModel().scale(config.PARSETABLE) == 2.0
+
+def test_cost_command(sample_path):
+    """Tests that the cost command reports the table and tree, and fails
+       when a scene is over the budget.
+
+    Args:
+        sample_path (str): Path to samples directory
+    """
+    runner.invoke(app.app, ["init-tests",  "-cfg", sample_path + "cfg_12.txt"])
+    result = runner.invoke(app.app, ["cost", "-i", "a b d h"])
+    assert "Parse table: 3 x 5 (15 cells, 6 entries)" in result.stdout
+    assert "Parse tree: 7 nodes" in result.stdout
+    assert result.exit_code == 0
+
+    result = runner.invoke(app.app, ["cost", "-b", "1", "-q", "low"])
+    assert "Over the budget of 1 seconds: first, follow, parsetable" in \
+        result.stdout
+    assert result.exit_code == 1
+
+""" Test that the input of a CFG which is not LL(1) is never parsed """
+@pytest.mark.parametrize("contents", [
+    None,
+    "S -> a S | a\n",
+])
+
+def test_cost_not_ll1(sample_path, tmp_path, calibration, contents):
+    """Tests that the input features of a left-recursive or ambiguous CFG
+       are unknown, rather than parsed with a table which has conflicts.
+
+    Args:
+        sample_path (str): Path to samples directory
+        tmp_path (Path): Temporary directory
+        calibration (Path): Calibration file
+        contents (str): Contents of the CFG, or None for cfg_9_LR
+    """
+    if contents is None:
+        cfg_path = Path(sample_path + "cfg_9_LR.txt")
+        inp = "id + id"
+    else:
+        cfg_path = tmp_path / "cfg_ambiguous.txt"
+        cfg_path.write_text(contents)
+        inp = "a a"
+
+    # the parse table has not been built
+    grammar = cfg.ContextFreeGrammar(cfg_path)
+    memo.analyse(grammar, memo.FOLLOW)
+    assert cost.measure(grammar, inp)["nodes"] is None
+
+    memo.analyse(grammar)
+    assert cost.measure(grammar, inp)["expansions"] is None
+    config.init_config()
+    assert cli_helper._check_budget(config.LL1_PARSING, grammar,
+        inp=inp) == (SUCCESS, None)
+
+    runner.invoke(app.app, ["init-tests",  "-cfg", str(cfg_path)])
+    result = runner.invoke(app.app, ["cost", "-i", inp])
+    assert "The input is rejected" in result.stdout
+    assert result.exit_code == 0
+
+def test_cost_ll1_command(sample_path, calibration, monkeypatch):
+    """Tests that '\\ll1 \\v <input>' checks the budget of its scene.
+
+    Args:
+        sample_path (str): Path to samples directory
+        calibration (Path): Calibration file
+        monkeypatch (MonkeyPatch): Patches the budget
+    """
+    grammar = load_cfg(sample_path)
+    config.init_config()
+    monkeypatch.setattr(config, "RENDER_BUDGET", 1)
+    assert cli_helper._init_parsing_ll1_via_cmd("\\ll1 \\v a b d h", grammar,
+        None) == BUDGET_ERROR
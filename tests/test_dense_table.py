@@ -0,0 +1,72 @@
+# tests/test_dense_table.py
+from typer.testing import CliRunner
+import pytest
+from pathlib import Path
+from kitchen import app
+from kitchen.backend import context_free_grammar as cfg
+
+runner = CliRunner()
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+@pytest.fixture
+def pt_out_path():
+    return "./samples/expected_pt/"
+
+""" Test that the dense table matches the expected parse tables """
+@pytest.mark.parametrize("sample_cfg, option", [
+    ("cfg.txt", "-d"),
+    ("cfg_1.txt", "-d"),
+    ("cfg_6.txt", "-d"),
+    ("cfg_8.txt", "-d"),
+    ("cfg_id_language.txt", "-d"),
+    ("cfg.txt", "-c"),
+    ("cfg_6.txt", "-c"),
+    ("cfg_12.txt", "-c"),
+    ("cfg_bla_simple_2.txt", "-c"),
+])
+
+def test_dense_pt(sample_path, pt_out_path, sample_cfg, option):
+    """Tests that the dense table, printed as a parse table, matches the
+       expected output.
+
+    Args:
+        sample_path (str): Path to samples directory
+        pt_out_path (str): Path to expected outputs directory
+        sample_cfg (str): Name of CFG file
+        option (str): Dense (-d) or compressed (-c) table
+    """
+    runner.invoke(app.app, ["init-tests",  "-cfg", sample_path + sample_cfg])
+    result = runner.invoke(app.app, ["test-pt", option])
+    expected = Path(pt_out_path + sample_cfg).read_text()
+    assert expected in result.stdout
+
+""" Test that conflicting tables are stored in the same way """
+@pytest.mark.parametrize("sample_cfg", [
+    ("cfg_2.txt"),
+    ("cfg_9_LR.txt"),
+    ("cfg_bla.txt"),
+])
+
+def test_dense_conflicts(sample_path, sample_cfg):
+    """Tests that the dense table holds the same cells and conflicts as
+       the parse table, and that merging rows and columns shrinks it.
+
+    Args:
+        sample_path (str): Path to samples directory
+        sample_cfg (str): Name of CFG file
+    """
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + sample_cfg))
+    conflicts = grammar.find_ll1_conflicts()
+    for compress in [False, True]:
+        dense = grammar.parsetable.get_dense(compress)
+        assert dense.to_dict() == grammar.parsetable.pt_dict
+        assert dense.get_conflicts() == conflicts
+
+    dense = grammar.parsetable.get_dense()
+    assert dense.table.shape[0] <= len(grammar.ir.nonterminals)
+    assert dense.table.shape[1] <= len(grammar.ir.terminals)
+    with pytest.raises(KeyError):
+        dense.lookup(grammar.start_symbol, "missing")
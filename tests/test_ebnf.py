@@ -0,0 +1,126 @@
+# tests/test_ebnf.py
+import anytree
+import pytest
+from kitchen import SUCCESS
+from kitchen.backend import (
+    context_free_grammar as cfg,
+    parser as p
+)
+
+PROGRAM_CFG = "PROGRAM -> begin STMT* end\nSTMT -> id = EXPR semi\n" + \
+    "EXPR -> id ARGS?\nARGS -> lp id+ rp\n"
+
+def write_cfg(tmp_path, contents) -> cfg.ContextFreeGrammar:
+    """Loads a CFG written to a temporary file.
+
+    Args:
+        tmp_path (Path): Temporary directory
+        contents (str): Contents of the CFG file
+
+    Returns:
+        ContextFreeGrammar: Loaded CFG
+    """
+    cfg_path = tmp_path / "cfg_ebnf.txt"
+    cfg_path.write_text(contents)
+    return cfg.ContextFreeGrammar(cfg_path)
+
+def render(root) -> str:
+    """Renders a parse tree as in the testing output.
+
+    Args:
+        root (Node): Root of the parse tree
+
+    Returns:
+        str: Rendered tree
+    """
+    return anytree.RenderTree(root, style=anytree.AsciiStyle()).by_attr("id")
+
+def test_ebnf_prods():
+    """Tests that EBNF operators are compiled to shared helpers, and that
+       operators on their own are still terminals.
+    """
+    loops = set()
+    prods = cfg.get_prods(PROGRAM_CFG + "E -> E + T | T*\nT -> STMT*\n" +
+        "TREP -> a\n", loops)
+    assert prods == [
+        ["PROGRAM", ["begin STMTREP end"]],
+        ["STMT", ["id = EXPR semi"]],
+        ["EXPR", ["id ARGSOPT"]],
+        ["ARGS", ["lp id IDREP rp"]],
+        ["E", ["E + T", "TREPX"]],
+        ["T", ["STMTREP"]],
+        ["TREP", ["a"]],
+        ["STMTREP", ["STMT STMTREP", "#"]],
+        ["ARGSOPT", ["ARGS", "#"]],
+        ["IDREP", ["id IDREP", "#"]],
+        ["TREPX", ["T TREPX", "#"]]]
+    assert loops == {"STMTREP", "ARGSOPT", "IDREP", "TREPX"}
+
+    # bodies without operators are kept as they were written
+    assert cfg.get_prods("S -> a  b | c*\n") == [["S", ["a  b", "CREP"]],
+        ["CREP", ["c CREP", "#"]]]
+
+""" Test that loop states give the same trees as the LALR(1) parser """
+@pytest.mark.parametrize("inp", [
+    "begin end",
+    "begin id = id semi end",
+    "begin id = id lp id rp semi id = id lp id id id rp semi end",
+])
+
+def test_ebnf_trees(tmp_path, inp):
+    """Tests that the items of each operator belong to the node holding it.
+
+    Args:
+        tmp_path (Path): Temporary directory
+        inp (str): Input string
+    """
+    grammar = write_cfg(tmp_path, PROGRAM_CFG)
+    assert grammar.find_ll1_conflicts() == []
+    ll1 = p.ParserLL1(inp, grammar)
+    assert ll1.parse_ll1(grammar.start_symbol, inp, semantic=True) == SUCCESS
+    lalr = p.ParserLALR(inp, grammar)
+    assert lalr.parse_lalr(semantic=True) == SUCCESS
+    assert render(ll1.root) == render(lalr.root)
+    assert not any(n.id in grammar.loops for n in ll1.root.descendants)
+
+""" Test operators at the end of productions, which the input ends in """
+@pytest.mark.parametrize("inp", [
+    "x",
+    "x y",
+    "x y y x",
+    "x x y",
+    "x y b b",
+])
+
+def test_ebnf_trailing(tmp_path, inp):
+    """Tests that the loops left on the stack when the input runs out are
+       finished, as the LALR(1) parser finishes them.
+
+    Args:
+        tmp_path (Path): Temporary directory
+        inp (str): Input string
+    """
+    grammar = write_cfg(tmp_path, "S -> A+ B*\nA -> x Y?\nY -> y+\nB -> b\n")
+    assert grammar.find_ll1_conflicts() == []
+    ll1 = p.ParserLL1(inp, grammar)
+    assert ll1.parse_ll1(grammar.start_symbol, inp, semantic=True) == SUCCESS
+    lalr = p.ParserLALR(inp, grammar)
+    assert lalr.parse_lalr(semantic=True) == SUCCESS
+    assert render(ll1.root) == render(lalr.root)
+    assert ll1.parse_ll1(grammar.start_symbol, "y", semantic=True) != SUCCESS
+
+def test_ebnf_long_list(tmp_path):
+    """Tests that a long list is parsed without nesting or growing the stack.
+
+    Args:
+        tmp_path (Path): Temporary directory
+    """
+    grammar = write_cfg(tmp_path, PROGRAM_CFG)
+    grammar.find_ll1_conflicts()
+    inp = "begin " + "id = id semi " * 2000 + "end"
+    ll1 = p.ParserLL1(inp, grammar)
+    assert ll1.parse_ll1(grammar.start_symbol, inp, semantic=True) == SUCCESS
+    assert ll1.root.height == 3
+    assert len(ll1.root.children) == 2002
+    assert ll1.parse_ll1(grammar.start_symbol, "begin id = id end",
+        semantic=True) != SUCCESS
@@ -0,0 +1,88 @@
+# tests/test_first_worklist.py
+from typer.testing import CliRunner
+import ast
+import pytest
+from kitchen import app
+
+runner = CliRunner()
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+""" Test that the worklist engine agrees with the recursive walker """
+@pytest.mark.parametrize("sample_cfg", [
+    ("cfg.txt"),
+    ("cfg_0.txt"),
+    ("cfg_1.txt"),
+    ("cfg_2.txt"),
+    ("cfg_3.txt"),
+    ("cfg_4.txt"),
+    ("cfg_5.txt"),
+    ("cfg_6.txt"),
+    ("cfg_7.txt"),
+    ("cfg_8.txt"),
+    ("cfg_9.txt"),
+    ("cfg_10.txt"),
+])
+
+def test_fs_engines_match(sample_path, sample_cfg):
+    """Tests that both first set engines find the same sets.
+
+    Args:
+        sample_path (str): Path to samples directory
+        sample_cfg (str): Name of CFG file
+    """    
+    runner.invoke(app.app, ["init-tests",  "-cfg", sample_path + sample_cfg])
+    result = runner.invoke(app.app, ["compare-fs"])
+    assert "First sets match." in result.stdout
+
+""" Test that left recursion does not affect the worklist engine """
+@pytest.mark.parametrize("sample_cfg, expected", [
+    ("cfg_9_LR.txt", "{'E': ['(', 'id'], 'T': ['(', 'id'], 'F': ['(', 'id']}"),
+    ("cfg_6_LR.txt", "{'S': ['a'], 'A': ['a'], 'B': ['b'], 'C': ['g']}"),
+])
+
+def test_fs_worklist_left_recursion(sample_path, sample_cfg, expected):
+    """Tests the worklist first set of left-recursive grammars.
+
+    Args:
+        sample_path (str): Path to samples directory
+        sample_cfg (str): Name of CFG file
+        expected (str): Expected first set
+    """    
+    runner.invoke(app.app, ["init-tests",  "-cfg", sample_path + sample_cfg])
+    result = runner.invoke(app.app, ["test-fs", "--worklist"])
+    assert expected in result.stdout
+
+""" Test that the bitset follow set engine agrees with the expected sets """
+@pytest.mark.parametrize("sample_cfg", [
+    ("cfg.txt"),
+    ("cfg_0.txt"),
+    ("cfg_1.txt"),
+    ("cfg_2.txt"),
+    ("cfg_3.txt"),
+    ("cfg_4.txt"),
+    ("cfg_5.txt"),
+    ("cfg_6.txt"),
+    ("cfg_7.txt"),
+    ("cfg_8.txt"),
+    ("cfg_9.txt"),
+    ("cfg_10.txt"),
+])
+
+def test_fw_worklist(sample_path, sample_cfg):
+    """Tests that the bitset follow sets hold the same symbols as the 
+       expected follow sets.
+
+    Args:
+        sample_path (str): Path to samples directory
+        sample_cfg (str): Name of CFG file
+    """    
+    runner.invoke(app.app, ["init-tests",  "-cfg", sample_path + sample_cfg])
+    result = runner.invoke(app.app, ["test-fw", "--worklist"])
+    with open("./samples/expected_fw/" + sample_cfg) as f:
+        expected = ast.literal_eval(f.read())
+    found = ast.literal_eval(result.stdout.strip().splitlines()[-1])
+    assert {k: set(v) for k, v in found.items()} == \
+        {k: set(v) for k, v in expected.items()}
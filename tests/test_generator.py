@@ -0,0 +1,57 @@
+# tests/test_generator.py
+import pytest
+from pathlib import Path
+from kitchen import SUCCESS
+from kitchen.backend import (
+    benchmark as bm,
+    context_free_grammar as cfg,
+    grammar_generator as gg,
+    parser as p
+)
+
+""" Test that generated grammars are LL(1) and accept generated sentences """
+@pytest.mark.parametrize("nonterminals, terminals, width, nullable, recursion", [
+    (1, 2, 1, 0.0, 0),
+    (5, 4, 3, 0.5, 1),
+    (20, 12, 5, 0.25, 2),
+    (40, 30, 6, 0.8, 4),
+])
+
+def test_generated_grammar(tmp_path, nonterminals, terminals, width,
+    nullable, recursion):
+    """Tests that a generated grammar has no LL(1) conflicts, and that the
+       LL(1) parser accepts the sentences generated from it.
+
+    Args:
+        tmp_path (Path): Temporary directory
+        nonterminals (int): Number of non-terminals
+        terminals (int): Number of terminals
+        width (int): Maximum length of a production
+        nullable (float): Chance of a non-terminal deriving epsilon
+        recursion (int): How far back a production may refer
+    """
+    for seed in range(5):
+        grammar = gg.generate_grammar(nonterminals, terminals, width,
+            nullable, recursion, seed=seed)
+        cfg_path = tmp_path / ("cfg_" + str(seed) + ".txt")
+        cfg_path.write_text(gg.to_text(grammar))
+
+        generated = cfg.ContextFreeGrammar(cfg_path)
+        assert len(generated.nonterminals) == nonterminals
+        assert generated.find_ll1_conflicts() == []
+
+        generated.reset_first_set()
+        tokens = gg.generate_sentence(grammar, 40, seed=seed)
+        parser = p.ParserLL1(" ".join(tokens), generated)
+        assert parser.parse_ll1(generated.start_symbol,
+            semantic=True) == SUCCESS
+
+def test_benchmark():
+    """Tests that every stage is timed, and that a curve is fitted to each.
+    """
+    rows = bm.run_benchmark([5, 10, 20], length=20, repeat=1)
+    assert [r["nonterminals"] for r in rows] == [5, 10, 20]
+    for row in rows:
+        for stage in bm.STAGES:
+            assert row[stage] >= 0
+    assert set(bm.scaling(rows).keys()) == set(bm.STAGES)
@@ -0,0 +1,33 @@
+# tests/test_headless.py
+import pickle
+import pytest
+from pathlib import Path
+from kitchen.backend import context_free_grammar as cfg
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+""" Test that analysing a CFG does not build its visualisation state """
+@pytest.mark.parametrize("sample_cfg", [
+    ("cfg.txt"),
+    ("cfg_2.txt"),
+    ("cfg_id_language.txt"),
+])
+
+def test_headless_cfg(sample_path, sample_cfg):
+    """Tests that the CFG is analysed without manim objects, and that it can
+       be pickled for use in a process pool.
+
+    Args:
+        sample_path (str): Path to samples directory
+        sample_cfg (str): Name of CFG file
+    """    
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + sample_cfg))
+    grammar.reset_first_set()
+    grammar.reset_follow_set()
+    assert grammar._vis is None
+
+    copy = pickle.loads(pickle.dumps(grammar))
+    assert copy.first_set == grammar.first_set
+    assert copy.follow_set == grammar.follow_set
@@ -0,0 +1,130 @@
+# tests/test_health.py
+from typer.testing import CliRunner
+import pytest
+from pathlib import Path
+from kitchen import app, HEALTH_ERROR
+from kitchen.backend import (
+    context_free_grammar as cfg,
+    grammar_ir as gir,
+    health,
+    memo
+)
+
+runner = CliRunner()
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+def write_cfg(tmp_path, contents) -> cfg.ContextFreeGrammar:
+    """Loads a CFG written to a temporary file.
+
+    Args:
+        tmp_path (Path): Temporary directory
+        contents (str): Contents of the CFG file
+
+    Returns:
+        ContextFreeGrammar: Loaded CFG
+    """
+    cfg_path = tmp_path / "cfg_health.txt"
+    cfg_path.write_text(contents)
+    return cfg.ContextFreeGrammar(cfg_path)
+
+""" Test the health reports of the sample CFGs """
+@pytest.mark.parametrize("sample_cfg, errors, warnings", [
+    ("cfg.txt", [], []),
+    ("cfg_6.txt", [], ["Unreachable non-terminals: C"]),
+    ("cfg_9_LR.txt", [], ["Direct left recursion: T -> T * F",
+        "Direct left recursion: E -> E + T"]),
+    ("cfg_bla_complex.txt", ["Cycle, as [PROGRAM] derives itself: " +
+        "PROGRAM -> PROGRAM"], ["Direct left recursion: PROGRAM -> PROGRAM",
+        "Direct left recursion: EXPRESSION -> EXPRESSION a TERM"]),
+])
+
+def test_health_samples(sample_path, sample_cfg, errors, warnings):
+    """Tests the errors and warnings reported for a sample CFG.
+
+    Args:
+        sample_path (str): Path to samples directory
+        sample_cfg (str): Name of CFG file
+        errors (list): Expected errors
+        warnings (list): Expected warnings
+    """
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + sample_cfg))
+    assert grammar.get_health().errors() == errors
+    assert grammar.get_health().warnings() == warnings
+
+""" Test that each problem is found along with the productions causing it """
+@pytest.mark.parametrize("contents, errors, warnings", [
+    ("S -> A s\nA -> B a | c\nB -> A b\n", [],
+        ["Indirect left recursion: A -> B a, B -> A b"]),
+    ("S -> N S x | y\nN -> #\n", [],
+        ["Direct left recursion: S -> N S x"]),
+    ("S -> A | a\nA -> S N\nN -> #\n",
+        ["Cycle, as [S] derives itself: S -> A, A -> S N"],
+        ["Indirect left recursion: S -> A, A -> S N"]),
+    ("S -> a B\nB -> C b\n",
+        ["Non-terminal [C] has no production, but is used in B -> C b"],
+        ["Unproductive non-terminals: S, B"]),
+    ("S -> a\nT -> U\nU -> U u\n", [],
+        ["Direct left recursion: U -> U u",
+        "Unproductive non-terminals: T, U"]),
+])
+
+def test_health_problems(tmp_path, contents, errors, warnings):
+    """Tests the diagnostics of small faulty CFGs.
+
+    Args:
+        tmp_path (Path): Temporary directory
+        contents (str): Contents of the CFG file
+        errors (list): Expected errors
+        warnings (list): Expected warnings
+    """
+    grammar = write_cfg(tmp_path, contents)
+    assert grammar.get_health().errors() == errors
+    assert grammar.get_health().warnings() == warnings
+    assert grammar.get_health().is_healthy() == (errors == [])
+
+def nt_name(i) -> str:
+    """Names the i-th non-terminal with upper case letters only.
+
+    Args:
+        i (int): Index of the non-terminal
+
+    Returns:
+        str: Name
+    """
+    return "".join(chr(65 + int(d)) for d in str(i))
+
+def test_health_deep():
+    """Tests that a long chain of non-terminals ending in left recursion is
+       checked without recursing through it.
+    """
+    n = 20000
+    prods = [["N" + nt_name(i), ["N" + nt_name(i + 1) + " a"]]
+        for i in range(n)]
+    prods.append(["N" + nt_name(n), ["N" + nt_name(0) + " b", "c"]])
+    report = health.Health(gir.GrammarIR(prods))
+    assert len(report.left_recursion) == 1
+    assert len(report.left_recursion[0]) == n + 1
+
+def test_health_fails_fast(tmp_path, monkeypatch):
+    """Tests that an unhealthy CFG is never given to the first set walker,
+       and that the CLI reports its problems.
+
+    Args:
+        tmp_path (Path): Temporary directory
+        monkeypatch (MonkeyPatch): Patches the first set walker
+    """
+    grammar = write_cfg(tmp_path, "S -> a B\nB -> C b\n")
+    monkeypatch.setattr(cfg.ContextFreeGrammar, "reset_first_set",
+        lambda self, calculate_again = True: pytest.fail("walker ran"))
+    assert memo.analyse(grammar) == HEALTH_ERROR
+
+    runner.invoke(app.app, ["init-tests",  "-cfg", str(grammar._cfg_path)])
+    result = runner.invoke(app.app, ["health"])
+    assert "Non-terminal [C] has no production" in result.stdout
+    assert result.exit_code == 1
+    result = runner.invoke(app.app, ["test-fs"])
+    assert "Non-terminal [C] has no production" in result.stdout
+    assert result.exit_code == 1
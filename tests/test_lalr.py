@@ -0,0 +1,99 @@
+# tests/test_lalr.py
+from typer.testing import CliRunner
+import pytest
+from pathlib import Path
+from kitchen import app, SUCCESS
+from kitchen.backend import (
+    cli_helper,
+    context_free_grammar as cfg,
+    parser as p
+)
+
+runner = CliRunner()
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+@pytest.fixture
+def ll1_out_path():
+    return "./samples/expected_ll1/"
+
+""" Test that LALR(1) parsing builds the same trees as LL(1) parsing """
+@pytest.mark.parametrize("sample_cfg, input_str", [
+    ("cfg.txt", "c"),
+    ("cfg_bla_simple_0.txt", "+ identifier"),
+    ("cfg_bla_simple_1.txt", "identifier +"),
+    ("cfg_bla_simple_2.txt", "identifier a identifier"),
+])
+
+def test_lalr(sample_path, ll1_out_path, sample_cfg, input_str):
+    """Tests that the LALR(1) parse tree matches the expected LL(1) tree.
+
+    Args:
+        sample_path (str): Path to samples directory
+        ll1_out_path (str): Path to expected outputs directory
+        sample_cfg (str): Name of CFG file
+        input_str (str): Input to be parsed
+    """
+    runner.invoke(app.app, ["init-tests",  "-cfg", sample_path + sample_cfg])
+    result = runner.invoke(app.app, ["test-lalr", "-i", input_str])
+    expected = Path(ll1_out_path + sample_cfg).read_text()
+    assert expected in result.stdout
+
+""" Test that CFGs which are not LL(1) are parsed """
+@pytest.mark.parametrize("sample_cfg, input_str, expected", [
+    ("cfg_9_LR.txt", "id + id * id", "E\n|-- E\n|   +-- T\n|       +-- F\n" +
+        "|           +-- id\n|-- +\n+-- T\n    |-- T\n"),
+    ("cfg_bla.txt", "identifier = ( binary a identifier )",
+        "        +-- TERM\n            +-- FACTOR\n                |-- (\n"),
+])
+
+def test_lalr_not_ll1(sample_path, sample_cfg, input_str, expected):
+    """Tests the parse trees of left-recursive CFGs.
+
+    Args:
+        sample_path (str): Path to samples directory
+        sample_cfg (str): Name of CFG file
+        input_str (str): Input to be parsed
+        expected (str): Part of the expected tree
+    """
+    runner.invoke(app.app, ["init-tests",  "-cfg", sample_path + sample_cfg])
+    result = runner.invoke(app.app, ["test-lalr", "-i", input_str])
+    assert "Success." in result.stdout
+    assert expected in result.stdout
+    assert "not LALR(1)" not in result.stdout
+
+def test_lalr_errors(sample_path):
+    """Tests that invalid input is rejected, and that conflicts of CFGs
+       which are not LALR(1) are reported.
+
+    Args:
+        sample_path (str): Path to samples directory
+    """
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + "cfg_9_LR.txt"))
+    parser = p.ParserLALR("id + + id", grammar)
+    assert parser.parse_lalr(semantic=True) != SUCCESS
+    assert parser.parse_lalr("id + id", semantic=True) == SUCCESS
+    assert [n.id for n in parser.root.leaves] == ["id", "+", "id"]
+
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + "cfg_2.txt"))
+    assert not grammar.get_lalr_table().is_lalr1()
+
+    # reduce/reduce conflicts name the productions of the CFG
+    grammar = cfg.ContextFreeGrammar.from_contents("S -> A | B\nA -> x\n" +
+        "B -> x\n")
+    assert [c[2:] for c in grammar.get_lalr_table().conflicts] == [
+        ("A -> x", "rejected B -> x")]
+
+def test_lalr_fallback(sample_path, capsys):
+    """Tests that the session parses a CFG which is not LL(1) with LALR(1).
+
+    Args:
+        sample_path (str): Path to samples directory
+        capsys (CaptureFixture): Captured output
+    """
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + "cfg_9_LR.txt"))
+    cli_helper.handle_input("( id ) * id", grammar, None)
+    assert "parsed with LALR(1)" in capsys.readouterr().out
+    assert grammar.parser_lalr.root.id == "E"
@@ -0,0 +1,78 @@
+# tests/test_matrix_sets.py
+from typer.testing import CliRunner
+import ast
+import pytest
+from pathlib import Path
+from kitchen import app
+from kitchen.backend import (
+    context_free_grammar as cfg,
+    grammar_generator as gg
+)
+
+runner = CliRunner()
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+""" Test that the matrix engine agrees with the expected sets """
+@pytest.mark.parametrize("sample_cfg, command, out_path", [
+    ("cfg.txt", "test-fs", "./samples/expected_fs/"),
+    ("cfg_2.txt", "test-fs", "./samples/expected_fs/"),
+    ("cfg_6.txt", "test-fs", "./samples/expected_fs/"),
+    ("cfg_3.txt", "test-fs", "./samples/expected_fs/"),
+    ("cfg_8.txt", "test-fs", "./samples/expected_fs/"),
+    ("cfg_10.txt", "test-fs", "./samples/expected_fs/"),
+    ("cfg.txt", "test-fw", "./samples/expected_fw/"),
+    ("cfg_2.txt", "test-fw", "./samples/expected_fw/"),
+    ("cfg_6.txt", "test-fw", "./samples/expected_fw/"),
+    ("cfg_7.txt", "test-fw", "./samples/expected_fw/"),
+    ("cfg_8.txt", "test-fw", "./samples/expected_fw/"),
+    ("cfg_10.txt", "test-fw", "./samples/expected_fw/"),
+])
+
+def test_sets_matrix(sample_path, sample_cfg, command, out_path):
+    """Tests that the matrix sets hold the same symbols as the expected
+       sets.
+
+    Args:
+        sample_path (str): Path to samples directory
+        sample_cfg (str): Name of CFG file
+        command (str): test-fs or test-fw
+        out_path (str): Path to expected outputs directory
+    """
+    runner.invoke(app.app, ["init-tests",  "-cfg", sample_path + sample_cfg])
+    result = runner.invoke(app.app, [command, "--matrix"])
+    expected = ast.literal_eval(Path(out_path + sample_cfg).read_text())
+    found = ast.literal_eval(result.stdout.strip().splitlines()[-1])
+    assert {k: set(v) for k, v in found.items()} == \
+        {k: set(v) for k, v in expected.items()}
+
+""" Test that the matrix engine agrees with the worklist engine """
+@pytest.mark.parametrize("seed, nullable_ratio, recursion", [
+    (0, 0.25, 2),
+    (1, 0.5, 10),
+    (2, 0.8, 40),
+])
+
+def test_matrix_matches_worklist(tmp_path, seed, nullable_ratio, recursion):
+    """Tests that both bitmask engines find the same sets for random CFGs.
+
+    Args:
+        tmp_path (Path): Temporary directory
+        seed (int): Seed of the grammar generator
+        nullable_ratio (float): Chance of a non-terminal deriving epsilon
+        recursion (int): How far back a production may refer
+    """
+    grammar = gg.generate_grammar(nonterminals=60, terminals=30,
+        nullable_ratio=nullable_ratio, recursion=recursion, seed=seed)
+    cfg_path = tmp_path / "cfg.txt"
+    cfg_path.write_text(gg.to_text(grammar))
+
+    grammar = cfg.ContextFreeGrammar(cfg_path)
+    grammar.calculate_follow_set_worklist()
+    worklist = (grammar.first_bits, grammar.first_prods,
+        grammar.follow_bits)
+    grammar.calculate_sets_matrix()
+    assert (grammar.first_bits, grammar.first_prods,
+        grammar.follow_bits) == worklist
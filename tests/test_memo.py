@@ -0,0 +1,113 @@
+# tests/test_memo.py
+import os
+import pytest
+import shutil
+from pathlib import Path
+from kitchen import SUCCESS, AMBIGUOUS_ERROR
+from kitchen.backend import (
+    context_free_grammar as cfg,
+    memo
+)
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+@pytest.fixture
+def calculations(monkeypatch):
+    """Counts the first set calculations, starting from an empty memo.
+    """
+    memo.clear()
+    counted = []
+    calculate = cfg.ContextFreeGrammar.calculate_first_set_worklist
+
+    def counting(self):
+        counted.append(self.cfg_contents)
+        calculate(self)
+
+    monkeypatch.setattr(cfg.ContextFreeGrammar, 
+        "calculate_first_set_worklist", counting)
+    yield counted
+    memo.clear()
+
+""" Test that each CFG is only analysed once per session """
+@pytest.mark.parametrize("sample_cfg, expected", [
+    ("cfg.txt", SUCCESS),
+    ("cfg_6.txt", SUCCESS),
+    ("cfg_7.txt", SUCCESS),
+    ("cfg_9_LR.txt", AMBIGUOUS_ERROR),
+])
+
+def test_memo_shared(sample_path, calculations, sample_cfg, expected):
+    """Tests that a second CFG with the same contents is served from the
+       memo, and that a visualisation does not lose the results.
+
+    Args:
+        sample_path (str): Path to samples directory
+        calculations (list): Contents of each CFG analysed
+        sample_cfg (str): Name of CFG file
+        expected (int): Status code of the parse table
+    """
+    first = cfg.ContextFreeGrammar(Path(sample_path + sample_cfg))
+    assert memo.analyse(first) == expected
+    second = cfg.ContextFreeGrammar(Path(sample_path + sample_cfg))
+    assert memo.analyse(second) == expected
+    assert len(calculations) == 1
+    assert second.first_set == first.first_set
+    assert second.follow_set == first.follow_set
+    assert second.parsetable is first.parsetable
+
+    # a visualisation empties the sets to calculate them step by step
+    memo.forget(second, memo.FIRST)
+    second.first_set["missing"] = []
+    assert memo.analyse(second) == expected
+    assert second.first_set == first.first_set
+    assert len(calculations) == 1
+
+def test_memo_edits(sample_path, calculations, tmp_path):
+    """Tests that an edit of the CFG file is detected by its mtime, and
+       that reverting it restores the earlier results from the memo.
+
+    Args:
+        sample_path (str): Path to samples directory
+        calculations (list): Contents of each CFG analysed
+        tmp_path (Path): Temporary directory
+    """
+    cfg_path = tmp_path / "cfg.txt"
+    shutil.copy(sample_path + "cfg_6.txt", cfg_path)
+    original = cfg_path.read_text()
+    grammar = cfg.ContextFreeGrammar(cfg_path)
+    memo.analyse(grammar)
+    table = grammar.parsetable
+
+    def edit(contents, mtime):
+        cfg_path.write_text(contents)
+        os.utime(cfg_path, (mtime, mtime))
+
+    edit(original.replace("C -> g", "C -> g | h"), 1)
+    assert memo.analyse(grammar, memo.FOLLOW) == SUCCESS
+    assert "h" in grammar.first_set["C"]
+    assert memo.analyse(grammar) == SUCCESS
+    assert grammar.parsetable.pt_dict["C"]["h"] == "C -> h"
+
+    edit(original, 2)
+    memo.analyse(grammar)
+    assert "h" not in grammar.first_set["C"]
+    assert grammar.parsetable is table
+    assert len(calculations) == 1
+
+def test_memo_conflicts(tmp_path):
+    """Tests that a left-recursive CFG gets the first sets of the worklist
+       engine, and a parse table along with its conflicts.
+
+    Args:
+        tmp_path (Path): Temporary directory
+    """
+    cfg_path = tmp_path / "cfg_lr.txt"
+    cfg_path.write_text("E -> E + T | T\nT -> id\n")
+    grammar = cfg.ContextFreeGrammar(cfg_path)
+    assert memo.analyse(grammar) == AMBIGUOUS_ERROR
+    assert grammar.first_set["E"] == ["id"]
+    assert grammar.parsetable.pt_dict["T"]["id"] == "T -> id"
+    assert grammar.parsetable.get_conflicts() == [("E", "id",
+        ["E -> E + T", "E -> T"])]
@@ -0,0 +1,146 @@
+# tests/test_normalise.py
+from typer.testing import CliRunner
+import anytree
+import pytest
+from pathlib import Path
+from kitchen import app, SUCCESS
+from kitchen.backend import (
+    context_free_grammar as cfg,
+    parser as p,
+    sentence_generator as sg
+)
+
+runner = CliRunner()
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+def render(root) -> str:
+    """Renders a parse tree as in the testing output.
+
+    Args:
+        root (Node): Root of the parse tree
+
+    Returns:
+        str: Rendered tree
+    """
+    return anytree.RenderTree(root, style=anytree.AsciiStyle()).by_attr("id")
+
+""" Test that normalised CFGs are LL(1) and fold back to the original trees """
+@pytest.mark.parametrize("contents", [
+    Path("./samples/example_cfgs/cfg_9_LR.txt").read_text(),
+    Path("./samples/example_cfgs/cfg_6_LR.txt").read_text(),
+    Path("./samples/example_cfgs/cfg_bla.txt").read_text(),
+    Path("./samples/example_cfgs/cfg_3.txt").read_text(),
+    "E -> E + T | E - T | T\nT -> id | id ( E ) | ( E )\n",
+    "E -> E + T | E + + T | T\nT -> id\n",
+    "S -> A\nA -> x y z | x y w | x | q\n",
+    "S -> S S a | b\n",
+    "S -> A s\nA -> B a | c\nB -> A b | d\n",
+])
+
+def test_normalise(tmp_path, contents):
+    """Tests that the normalised CFG has no LL(1) conflicts, and that its
+       folded parse trees match the LALR(1) trees of the original CFG.
+
+    Args:
+        tmp_path (Path): Temporary directory
+        contents (str): Contents of the CFG file
+    """
+    cfg_path = tmp_path / "cfg.txt"
+    cfg_path.write_text(contents)
+    grammar = cfg.ContextFreeGrammar(cfg_path)
+    normalised = grammar.normalise()
+    assert normalised._cfg_path == tmp_path / "cfg_normalised.txt"
+    assert normalised.find_ll1_conflicts() == []
+
+    generator = sg.SentenceGenerator(grammar.ir, 1, 25, seed=0)
+    for sentence in generator.sentences(30):
+        lalr = p.ParserLALR(sentence, grammar)
+        assert lalr.parse_lalr(semantic=True) == SUCCESS
+        derivation = p.ParserLL1(sentence, normalised).derive()
+        tree = normalised.folding.fold(derivation, sentence.split())
+        assert render(tree) == render(lalr.root)
+
+def test_normalise_output(sample_path, tmp_path):
+    """Tests the rewritten CFG, and that invalid input is rejected.
+
+    Args:
+        sample_path (str): Path to samples directory
+        tmp_path (Path): Temporary directory
+    """
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + "cfg_9_LR.txt"))
+    # the left-recursive table has conflicts, so it derives nothing
+    grammar.find_ll1_conflicts()
+    assert p.ParserLL1("id + id", grammar).derive() is None
+    normalised = grammar.normalise(tmp_path / "out.txt")
+    assert (tmp_path / "out.txt").read_text() == "E -> T ETAIL\n\n" + \
+        "ETAIL -> + T ETAIL | #\n\nT -> F TTAIL\n\n" + \
+        "TTAIL -> * F TTAIL | #\n\nF -> ( E ) | id\n"
+    assert normalised.rewrites == [
+        "Eliminated the left recursion of T with TTAIL",
+        "Eliminated the left recursion of E with ETAIL"]
+    normalised.find_ll1_conflicts()
+    assert p.ParserLL1("id + * id", normalised).derive() is None
+    assert p.ParserLL1("id +", normalised).derive() is None
+
+    # indirect left recursion is substituted away
+    cfg_path = tmp_path / "cfg_indirect.txt"
+    cfg_path.write_text("S -> A s\nA -> B a | c\nB -> A b | d\n")
+    normalised = cfg.ContextFreeGrammar(cfg_path).normalise()
+    assert normalised.get_health().left_recursion == []
+    assert normalised.rewrites[-1] == "Removed B, which is no longer used"
+
+    grammar = cfg.ContextFreeGrammar(Path(sample_path +
+        "cfg_bla_complex.txt"))
+    with pytest.raises(ValueError):
+        grammar.normalise(tmp_path / "out.txt")
+
+def test_normalise_command(sample_path, tmp_path):
+    """Tests that the normalise command shows the tree of the original CFG.
+
+    Args:
+        sample_path (str): Path to samples directory
+        tmp_path (Path): Temporary directory
+    """
+    inp = "identifier = ( binary a identifier )"
+    runner.invoke(app.app, ["init-tests",  "-cfg", sample_path + "cfg_bla.txt"])
+    expected = runner.invoke(app.app, ["test-lalr", "-i", inp]).stdout
+    result = runner.invoke(app.app, ["normalise", "-o",
+        str(tmp_path / "out.txt"), "-i", inp])
+    assert "Eliminated the left recursion of TERM with TERMTAIL" in \
+        result.stdout
+    assert "The normalised CFG is LL(1)." in result.stdout
+    assert result.stdout.endswith(expected)
+
+def test_normalise_long_list(tmp_path):
+    """Tests that a long left-recursive list is folded without recursion,
+       into the tree the LALR(1) parser builds.
+
+    Args:
+        tmp_path (Path): Temporary directory
+    """
+    cfg_path = tmp_path / "cfg_list.txt"
+    cfg_path.write_text("L -> L , id | id\n")
+    grammar = cfg.ContextFreeGrammar(cfg_path)
+    normalised = grammar.normalise(tmp_path / "out.txt")
+    normalised.find_ll1_conflicts()
+    inp = " , ".join(["id"] * 2000)
+    derivation = p.ParserLL1(inp, normalised).derive()
+    tree = normalised.folding.fold(derivation, inp.split())
+    lalr = p.ParserLALR(inp, grammar)
+    assert lalr.parse_lalr(semantic=True) == SUCCESS
+
+    # the trees are walked with a stack, as they are 2000 nodes deep
+    walks = []
+    for root in [tree, lalr.root]:
+        walk = []
+        stack = [root]
+        while stack != []:
+            node = stack.pop()
+            walk.append(node.id)
+            stack.extend(reversed(node.children))
+        walks.append(walk)
+    assert walks[0] == walks[1]
+    assert len(walks[0]) == 3 * 2000 - 1
@@ -0,0 +1,61 @@
+# tests/test_prune.py
+from typer.testing import CliRunner
+import pytest
+from pathlib import Path
+from kitchen import app
+from kitchen.backend import context_free_grammar as cfg
+
+runner = CliRunner()
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+""" Test that useless non-terminals are reported """
+@pytest.mark.parametrize("sample_cfg, expected", [
+    ("cfg.txt", "No useless non-terminals found."),
+    ("cfg_2.txt", "No useless non-terminals found."),
+    ("cfg_6.txt", "Removed unreachable non-terminals: C"),
+])
+
+def test_prune(sample_path, sample_cfg, expected):
+    """Tests the report of the prune command.
+
+    Args:
+        sample_path (str): Path to samples directory
+        sample_cfg (str): Name of CFG file
+        expected (str): Line expected in the report
+    """
+    runner.invoke(app.app, ["init-tests",  "-cfg", sample_path + sample_cfg])
+    result = runner.invoke(app.app, ["prune"])
+    assert expected in result.stdout
+
+def test_pruned_grammar(tmp_path):
+    """Tests that useless non-terminals, and the productions which use them,
+       are left out of the analysis.
+
+    Args:
+        tmp_path (Path): Temporary directory
+    """
+    cfg_path = tmp_path / "cfg_useless.txt"
+    cfg_path.write_text("S -> A b | X\nA -> a A | c | B d\nB -> B e\n" +
+        "C -> g\nX -> Y\n")
+
+    grammar = cfg.ContextFreeGrammar(cfg_path, prune = True)
+    assert grammar.unproductive == ["B", "X", "Y"]
+    assert grammar.unreachable == ["C"]
+    assert grammar.nonterminals == ["S", "A"]
+    assert grammar.cfg_dict == {"S": ["A b"], "A": ["a A", "c"]}
+
+    grammar.reset_first_set()
+    grammar.reset_follow_set()
+    grammar.setup_parsetable()
+    grammar.calculate_parsetable()
+    assert sorted(grammar.parsetable.pt_dict.keys()) == ["A", "S"]
+    assert sorted(grammar.parsetable.pt_dict["S"].keys()) == \
+        ["$", "a", "b", "c"]
+
+    # the CFG is only pruned when asked to
+    grammar = cfg.ContextFreeGrammar(cfg_path)
+    assert grammar.unproductive == [] and grammar.unreachable == []
+    assert len(grammar.nonterminals) == 5
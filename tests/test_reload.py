@@ -0,0 +1,92 @@
+# tests/test_reload.py
+import os
+import pytest
+from pathlib import Path
+from kitchen.backend import (
+    cli_helper,
+    context_free_grammar as cfg
+)
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+""" Test that reloading an edited CFG only recalculates what it affects """
+@pytest.mark.parametrize("sample_cfg, line, edit, expected", [
+    ("cfg_2.txt", 3, "C -> h | c", {"C"}),
+    ("cfg_2.txt", 2, "B -> g | f | #", {"B"}),
+    ("cfg_3.txt", 0, "S -> a B | d", {"S"}),
+])
+
+def test_reload(sample_path, sample_cfg, line, edit, expected, tmp_path):
+    """Tests that a reloaded CFG matches one analysed from scratch.
+
+    Args:
+        sample_path (str): Path to samples directory
+        sample_cfg (str): Name of CFG file
+        line (int): Line of the CFG to edit
+        edit (str): Replacement production
+        expected (set): Non-terminals expected to change
+        tmp_path (Path): Temporary directory
+    """    
+    path = tmp_path / sample_cfg
+    lines = Path(sample_path + sample_cfg).read_text().splitlines()
+    path.write_text("\n".join(lines))
+
+    grammar = cfg.ContextFreeGrammar(path)
+    grammar.reset_first_set()
+    grammar.reset_follow_set()
+
+    lines[line] = edit
+    path.write_text("\n".join(lines))
+    changed, _, _, _ = grammar.reload()
+    assert changed == expected
+
+    fresh = cfg.ContextFreeGrammar(path)
+    fresh.calculate_follow_set_worklist()
+    fresh.materialise_sets()
+    for key in fresh.first_set.keys():
+        assert set(grammar.first_set[key]) == set(fresh.first_set[key])
+        assert set(grammar.follow_set[key]) == set(fresh.follow_set[key])
+
+def test_reload_malformed(sample_path, tmp_path, capsys):
+    """Tests that a half-edited CFG file is reported on the next input, and
+       that the previous analysis is kept.
+
+    Args:
+        sample_path (str): Path to samples directory
+        tmp_path (Path): Temporary directory
+        capsys (CaptureFixture): Captures the output
+    """
+    path = tmp_path / "cfg_12.txt"
+    path.write_text(Path(sample_path + "cfg_12.txt").read_text())
+    grammar = cfg.ContextFreeGrammar(path)
+    grammar.reset_first_set()
+    first_set = grammar.first_set
+
+    path.write_text("S -> a B D h\nB b\n")
+    os.utime(path, (grammar._mtime + 1, grammar._mtime + 1))
+    with pytest.raises(ValueError, match="CFG Error at line 1"):
+        grammar.reload()
+    assert grammar.first_set == first_set
+    assert not grammar.has_changed()
+
+    os.utime(path, (grammar._mtime + 1, grammar._mtime + 1))
+    cli_helper.handle_input("\\fs", grammar, None)
+    out = capsys.readouterr().out
+    assert "CFG Error at line 1" in out
+    assert "The previous CFG is still loaded." in out
+    assert grammar.first_set == first_set
+
+def test_reload_without_file(capsys):
+    """Tests that a CFG which was not loaded from a file is not reloaded.
+
+    Args:
+        capsys (CaptureFixture): Captures the output
+    """
+    grammar = cfg.ContextFreeGrammar.from_contents("S -> a S | b\n")
+    with pytest.raises(ValueError):
+        grammar.reload()
+    cli_helper.handle_input("\\reload", grammar, None)
+    assert "nothing to reload" in capsys.readouterr().out
+    assert grammar.prods == [["S", ["a S", "b"]]]
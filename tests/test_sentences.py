@@ -0,0 +1,113 @@
+# tests/test_sentences.py
+from typer.testing import CliRunner
+import random
+import re
+import pytest
+from pathlib import Path
+from kitchen import app, SUCCESS
+from kitchen.backend import (
+    context_free_grammar as cfg,
+    parser as p,
+    sentence_generator as sg
+)
+from kitchen.helpers import lang_spec
+
+runner = CliRunner()
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+""" Test that generated sentences are accepted by the parsers """
+@pytest.mark.parametrize("sample_cfg", [
+    "cfg.txt",
+    "cfg_6.txt",
+    "cfg_9.txt",
+    "cfg_9_LR.txt",
+    "cfg_bla.txt",
+    "cfg_id_language.txt",
+])
+
+def test_sentences_valid(sample_path, sample_cfg):
+    """Tests that every generated sentence is parsed successfully.
+
+    Args:
+        sample_path (str): Path to samples directory
+        sample_cfg (str): Name of CFG file
+    """
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + sample_cfg))
+    generator = sg.SentenceGenerator(grammar.ir, 1, 30, seed=0)
+    parser = p.ParserLALR("", grammar)
+    for sentence in generator.sentences(50):
+        if sentence != "":
+            assert parser.parse_lalr(sentence, semantic=True) == SUCCESS
+
+def test_sentences_shape(sample_path):
+    """Tests that sentences keep to the target lengths and depth, and that
+       a seed makes them reproducible.
+
+    Args:
+        sample_path (str): Path to samples directory
+    """
+    grammar = cfg.ContextFreeGrammar(Path(sample_path +
+        "cfg_id_language.txt"))
+    generator = sg.SentenceGenerator(grammar.ir, 9, 15, seed=1)
+    sentences = list(generator.sentences(100))
+    assert all(9 <= len(s.split()) <= 15 for s in sentences)
+    again = sg.SentenceGenerator(grammar.ir, 9, 15, seed=1)
+    assert list(again.sentences(100)) == sentences
+
+    # past the depth limit, only the shallowest productions are chosen
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + "cfg_9.txt"))
+    generator = sg.SentenceGenerator(grammar.ir, 200, 200, max_depth=0)
+    assert list(generator.sentences(3)) == ["id"] * 3
+
+def test_sentences_mutated(sample_path):
+    """Tests that near-valid sentences are produced, some of which are
+       rejected by the parser.
+
+    Args:
+        sample_path (str): Path to samples directory
+    """
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + "cfg_9.txt"))
+    generator = sg.SentenceGenerator(grammar.ir, 5, 20, mutate=1.0, seed=2)
+    parser = p.ParserLALR("", grammar)
+    results = [parser.parse_lalr(s, semantic=True) for s in
+        generator.sentences(50)]
+    assert results.count(SUCCESS) < 50
+
+def test_sentences_lexemes(sample_path):
+    """Tests that lexemes are read back by the spec as their terminals.
+
+    Args:
+        sample_path (str): Path to samples directory
+    """
+    grammar = cfg.ContextFreeGrammar(Path(sample_path +
+        "cfg_id_language.txt"))
+    spec = lang_spec.Specification(Path("./samples/test_spec.txt"), grammar)
+    generator = sg.SentenceGenerator(grammar.ir, 5, 20, spec=spec, seed=3)
+    for t, pool in generator.lexemes.items():
+        assert all(spec._match(l) == grammar.ir.symbols[t] for l in pool)
+    assert "=" in next(generator.sentences(1)).split()
+
+    for pattern in ["[a-z][A-Z]*", "([a-z]|[0-9])+", "\\=", "a{2,3}b?"]:
+        rng = random.Random(4)
+        for _ in range(20):
+            assert re.fullmatch(pattern, sg.sample_regex(pattern, rng))
+
+def test_generate(sample_path, tmp_path):
+    """Tests that the generate command writes one sentence per line.
+
+    Args:
+        sample_path (str): Path to samples directory
+        tmp_path (Path): Temporary directory
+    """
+    runner.invoke(app.app, ["init-tests",  "-cfg", sample_path + "cfg_9.txt"])
+    output = tmp_path / "sentences.txt"
+    result = runner.invoke(app.app, ["generate", "-n", "25", "-o",
+        str(output), "--seed", "5"])
+    assert "25 sentence(s) written" in result.stdout
+    assert len(output.read_text().splitlines()) == 25
+
+    result = runner.invoke(app.app, ["generate", "-n", "3", "--seed", "5"])
+    assert result.stdout.splitlines() == output.read_text().splitlines()[:3]
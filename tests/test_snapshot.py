@@ -0,0 +1,132 @@
+# tests/test_snapshot.py
+from concurrent.futures import ThreadPoolExecutor
+import anytree
+import pytest
+from pathlib import Path
+from kitchen import PARSING_ERROR, SUCCESS
+from kitchen.backend import (
+    context_free_grammar as cfg,
+    parser as p,
+    snapshot
+)
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+PROGRAM_CFG = "PROGRAM -> begin STMT* end\nSTMT -> id = EXPR semi\n" + \
+    "EXPR -> id ARGS?\nARGS -> lp id+ rp\n"
+
+def render(root) -> str:
+    """Renders a parse tree as in the testing output.
+
+    Args:
+        root (Node): Root of the parse tree
+
+    Returns:
+        str: Rendered tree
+    """
+    return anytree.RenderTree(root, style=anytree.AsciiStyle()).by_attr("id")
+
+def test_snapshot_immutable(sample_path):
+    """Tests that a snapshot and its table cannot be modified.
+
+    Args:
+        sample_path (str): Path to samples directory
+    """
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + "cfg_12.txt"))
+    frozen = snapshot.GrammarSnapshot(grammar)
+    with pytest.raises(AttributeError):
+        frozen.loops = set()
+    with pytest.raises(AttributeError):
+        del frozen.table
+    with pytest.raises(TypeError):
+        frozen.first_set["S"] = ()
+    with pytest.raises(ValueError):
+        frozen.table.table[0, 0] = 0
+
+""" Test that the snapshot gives the same trees as the LALR(1) parser """
+@pytest.mark.parametrize("inp", [
+    "begin end",
+    "begin id = id semi end",
+    "begin id = id lp id rp semi id = id lp id id id rp semi end",
+])
+
+def test_snapshot_trees(tmp_path, inp):
+    """Tests the trees of a CFG with EBNF operators.
+
+    Args:
+        tmp_path (Path): Temporary directory
+        inp (str): Input string
+    """
+    cfg_path = tmp_path / "cfg_ebnf.txt"
+    cfg_path.write_text(PROGRAM_CFG)
+    grammar = cfg.ContextFreeGrammar(cfg_path)
+    result = snapshot.GrammarSnapshot(grammar).parse(inp)
+    assert result.code == SUCCESS
+    lalr = p.ParserLALR(inp, grammar)
+    assert lalr.parse_lalr(semantic=True) == SUCCESS
+    assert render(result.root) == render(lalr.root)
+
+""" Test the errors of rejected inputs """
+@pytest.mark.parametrize("inp, error", [
+    ("a h h", "Unexpected token [h]"),
+    ("a b", "ParseTable[D, $] is empty."),
+    ("x", "ParseTable[S, x] is empty."),
+])
+
+def test_snapshot_rejected(sample_path, inp, error):
+    """Tests that a rejected input reports why.
+
+    Args:
+        sample_path (str): Path to samples directory
+        inp (str): Input string
+        error (str): Expected error
+    """
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + "cfg_12.txt"))
+    result = snapshot.GrammarSnapshot(grammar).parse(inp)
+    assert result.code == PARSING_ERROR
+    assert result.error == error
+
+def test_snapshot_mismatch(tmp_path):
+    """Tests that a terminal which is not matched reports the token found.
+
+    Args:
+        tmp_path (Path): Temporary directory
+    """
+    cfg_path = tmp_path / "cfg_ab.txt"
+    cfg_path.write_text("S -> a b\n")
+    frozen = snapshot.GrammarSnapshot(cfg.ContextFreeGrammar(cfg_path))
+    assert frozen.parse("a a").error == "Unexpected token [a]"
+    assert frozen.parse("a c").error == "Unexpected token [c]"
+    assert frozen.parse("a").error == "Unexpected end of input."
+
+def test_snapshot_concurrent(tmp_path):
+    """Tests that parses running at the same time on one snapshot give the
+       same results as running them one after another.
+
+    Args:
+        tmp_path (Path): Temporary directory
+    """
+    cfg_path = tmp_path / "cfg_ebnf.txt"
+    cfg_path.write_text(PROGRAM_CFG)
+    frozen = snapshot.GrammarSnapshot(cfg.ContextFreeGrammar(cfg_path))
+    inputs = ["begin " + "id = id lp id rp semi " * n + "end" for n in
+        range(40)] + ["begin id = semi end"] * 10
+    expected = [(r.code, render(r.root)) for r in map(frozen.parse, inputs)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(frozen.parse, inputs))
+    assert [(r.code, render(r.root)) for r in results] == expected
+
+def test_snapshot_not_ll1(sample_path):
+    """Tests that a CFG with conflicts cannot be frozen.
+
+    Args:
+        sample_path (str): Path to samples directory
+    """
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + "cfg_2.txt"))
+    with pytest.raises(ValueError):
+        snapshot.GrammarSnapshot(grammar)
+    grammar = cfg.ContextFreeGrammar(Path(sample_path + "cfg_9_LR.txt"))
+    with pytest.raises(ValueError):
+        snapshot.GrammarSnapshot(grammar)
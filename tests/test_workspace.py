@@ -0,0 +1,82 @@
+# tests/test_workspace.py
+from typer.testing import CliRunner
+import pytest
+from pathlib import Path
+from kitchen import app, SUCCESS
+from kitchen.helpers import config
+from kitchen.backend import (
+    cli_helper,
+    workspace as wsp
+)
+
+runner = CliRunner()
+
+@pytest.fixture
+def sample_path():
+    return "./samples/example_cfgs/"
+
+@pytest.fixture
+def workspace_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "WORKSPACE_FILE_PATH",
+        tmp_path / "workspace.ini")
+    return tmp_path / "workspace.ini"
+
+""" Test that named grammars are analysed without re-running init """
+@pytest.mark.parametrize("name, sample_cfg, expected", [
+    ("simple", "cfg.txt", "No LL(1) conflicts found."),
+    ("nullable", "cfg_2.txt", "4 LL(1) conflict(s) found:"),
+    ("ids", "cfg_id_language.txt", "No LL(1) conflicts found."),
+])
+
+def test_workspace_grammar(sample_path, workspace_file, name, sample_cfg,
+    expected):
+    """Tests that --grammar selects a named grammar of the workspace, and
+       that the configuration file is left as it was.
+
+    Args:
+        sample_path (str): Path to samples directory
+        workspace_file (Path): Temporary workspace file
+        name (str): Name of the grammar
+        sample_cfg (str): Name of CFG file
+        expected (str): Line expected in the report
+    """
+    runner.invoke(app.app, ["init-tests",  "-cfg", sample_path + "cfg_6.txt"])
+    before = config.CONFIG_FILE_PATH.read_text()
+
+    result = runner.invoke(app.app, ["workspace", "add", name, "-cfg",
+        sample_path + sample_cfg])
+    assert result.exit_code == 0
+    result = runner.invoke(app.app, ["-g", name, "conflicts"])
+    assert expected in result.stdout
+    assert config.CONFIG_FILE_PATH.read_text() == before
+
+    result = runner.invoke(app.app, ["-g", "missing", "conflicts"])
+    assert result.exit_code == 1
+
+def test_workspace_switching(sample_path, workspace_file):
+    """Tests that each grammar keeps its own analysis when switching.
+
+    Args:
+        sample_path (str): Path to samples directory
+        workspace_file (Path): Temporary workspace file
+    """
+    config.add_to_workspace("a", sample_path + "cfg.txt")
+    config.add_to_workspace("b", sample_path + "cfg_id_language.txt")
+    ws = wsp.Workspace()
+    assert ws.names() == ["a", "b"]
+
+    ws.select("a")
+    cfg_a, _ = ws.get()
+    cli_helper.handle_input("\\use b", cfg_a, None, ws)
+    assert ws.current == "b"
+    cfg_b, _ = ws.get()
+    cli_helper._prepare_to_parse(cfg_b)
+    assert cfg_b.parsetable_calculated and not cfg_a.parsetable_calculated
+
+    cli_helper.handle_input("\\use a", cfg_b, None, ws)
+    assert ws.get()[0] is cfg_a
+    cli_helper.handle_input("\\use b", cfg_a, None, ws)
+    assert ws.get()[0] is cfg_b and cfg_b.parsetable_calculated
+
+    assert config.remove_from_workspace("a") == SUCCESS
+    assert wsp.Workspace().names() == ["b"]